@@ -12,6 +12,8 @@ from app.schemas.documents import (
 )
 from app.core.config import settings
 from app.core.llm import GroqChatModel
+from app.core.routing import task_model
+from app.database.analysis_cache import get_analysis_cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +23,14 @@ class AmendmentSuggesterAgent:
     def __init__(self):
         """Initialize the amendment suggester agent."""
         self.llm = GroqChatModel(
-            model_name="llama3-70b-8192",
+            model_name=task_model("amendment"),
             temperature=0.2,  # Slightly higher for creative suggestions
             max_tokens=8192,
             top_p=0.9
         )
+        
+        # Suggestions for clause, risk and policy text already seen
+        self.cache = get_analysis_cache()
     
     def suggest_amendments(
         self,
@@ -79,6 +84,25 @@ class AmendmentSuggesterAgent:
                     if risk_assessment.risk_level == RiskLevel.LOW:
                         continue
                     
+                    # Unchanged clauses with an unchanged assessment reuse their suggestion
+                    key = None
+                    if self.cache is not None:
+                        key = self.cache.make_key(
+                            self.llm.model_name,
+                            self.llm.temperature,
+                            clause.clause_type.value,
+                            clause.text,
+                            risk_assessment.risk_level.value,
+                            risk_assessment.risk_factors,
+                            policy_text
+                        )
+                        cached = self.cache.get("amendment", key)
+                        if cached is not None:
+                            if cached["amendment"]:
+                                cached["amendment"]["clause_id"] = clause.clause_id
+                                amendments.append(AmendmentSuggestion(**cached["amendment"]))
+                            continue
+                    
                     # Create messages for LLM
                     messages = [
                         {
@@ -105,13 +129,7 @@ class AmendmentSuggesterAgent:
                     ]
                     
                     # Get response from LLM
-                    completion = self.llm.client.chat.completions.create(
-                        model=self.llm.model_name,
-                        messages=messages,
-                        temperature=self.llm.temperature,
-                        max_tokens=self.llm.max_tokens,
-                        top_p=self.llm.top_p
-                    )
+                    completion = self.llm.complete(messages)
                     
                     # Parse response
                     content = completion.choices[0].message.content
@@ -132,8 +150,9 @@ class AmendmentSuggesterAgent:
                             except:
                                 priority = 3
                     
+                    amendment = None
                     if suggested_text and reason:
-                        amendments.append(AmendmentSuggestion(
+                        amendment = AmendmentSuggestion(
                             clause_id=clause.clause_id,
                             clause_type=clause.clause_type,
                             original_text=clause.text,
@@ -144,7 +163,13 @@ class AmendmentSuggesterAgent:
                                 "risk_level": risk_assessment.risk_level,
                                 "risk_score": risk_assessment.risk_score
                             }
-                        ))
+                        )
+                        amendments.append(amendment)
+                    
+                    if key is not None:
+                        self.cache.put("amendment", key, {
+                            "amendment": amendment.model_dump(mode="json") if amendment else None
+                        })
                 
                 except Exception as e:
                     logger.error(f"Error suggesting amendment for clause {clause.clause_id}: {str(e)}")
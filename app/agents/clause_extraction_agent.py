@@ -8,7 +8,10 @@ from langchain_core.prompts import ChatPromptTemplate
 
 from app.core.config import settings
 from app.schemas.documents import ExtractedClause, ClauseType
+from app.core.clause_types import determine_clause_type
 from app.core.llm import GroqChatModel
+from app.core.routing import escalation_model, refinement_needs_escalation, task_model
+from app.database.analysis_cache import get_analysis_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,12 +35,21 @@ class ClauseExtractionAgent:
     def __init__(self):
         """Initialize the clause extraction agent."""
         self.llm = GroqChatModel(
-            model_name="llama3-70b-8192",  # Explicitly set the model name
+            model_name=task_model("clause_refinement"),
             temperature=0.0,
             max_tokens=8192,
             top_p=0.9
         )
         
+        # Doubtful refinements from a small model are asked again of the large one
+        escalation = escalation_model("clause_refinement")
+        self.escalation_llm = GroqChatModel(
+            model_name=escalation,
+            temperature=0.0,
+            max_tokens=8192,
+            top_p=0.9
+        ) if escalation else None
+        
         # Load spaCy model if available, otherwise use regex-only approach
         try:
             self.nlp = spacy.load("en_core_web_lg")
@@ -46,6 +58,9 @@ class ClauseExtractionAgent:
         except Exception as e:
             logger.warning(f"Could not load spaCy model: {str(e)}. Using regex-only approach.")
             self.use_spacy = False
+        
+        # Refinements of clause text already seen, e.g. in an earlier version
+        self.cache = get_analysis_cache()
     
     def extract_clauses(self, document_text: str) -> List[ExtractedClause]:
         """Extract legal clauses from document text.
@@ -188,31 +203,7 @@ class ClauseExtractionAgent:
         Returns:
             Clause type or None if undetermined
         """
-        text_lower = text.lower()
-        
-        # Simple keyword matching
-        if any(kw in text_lower for kw in ["terminat", "cancel", "end of agreement"]):
-            return ClauseType.TERMINATION
-        elif any(kw in text_lower for kw in ["jurisdict", "venue", "forum", "court"]):
-            return ClauseType.JURISDICTION
-        elif any(kw in text_lower for kw in ["payment", "fee", "compensat", "invoice"]):
-            return ClauseType.PAYMENT_TERMS
-        elif any(kw in text_lower for kw in ["confidential", "disclos", "secret"]):
-            return ClauseType.CONFIDENTIALITY
-        elif any(kw in text_lower for kw in ["intellectual", "patent", "copyright", "trademark"]):
-            return ClauseType.INTELLECTUAL_PROPERTY
-        elif any(kw in text_lower for kw in ["liab", "warrant", "disclaimer"]):
-            return ClauseType.LIABILITY
-        elif any(kw in text_lower for kw in ["indemnif", "hold harmless"]):
-            return ClauseType.INDEMNIFICATION
-        elif any(kw in text_lower for kw in ["force majeure", "act of god", "unforeseen"]):
-            return ClauseType.FORCE_MAJEURE
-        elif any(kw in text_lower for kw in ["assign", "transfer", "delegat"]):
-            return ClauseType.ASSIGNMENT
-        elif any(kw in text_lower for kw in ["govern", "applicable law", "choice of law"]):
-            return ClauseType.GOVERNING_LAW
-        
-        return None
+        return determine_clause_type(text)
     
     def _refine_clauses_with_llm(self, potential_clauses: List[Dict[str, Any]]) -> List[ExtractedClause]:
         """Refine and validate clauses using LLM.
@@ -269,6 +260,13 @@ class ClauseExtractionAgent:
         Returns:
             Refined clause text or None if invalid
         """
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(self.llm.model_name, self.llm.temperature, clause_type.value, text)
+            cached = self.cache.get("clause", key)
+            if cached is not None:
+                return cached["text"]
+        
         try:
             # Create system and user messages
             messages = [
@@ -285,24 +283,35 @@ class ClauseExtractionAgent:
                 }
             ]
             
-            # Get response from LLM directly
-            completion = self.llm.client.chat.completions.create(
-                model=self.llm.model_name,
-                messages=messages,
-                temperature=self.llm.temperature,
-                max_tokens=self.llm.max_tokens,
-                top_p=self.llm.top_p
-            )
-            
-            refined_text = completion.choices[0].message.content.strip()
-            
-            # Check if LLM considers this a valid clause
-            if refined_text == "NOT_VALID":
-                return None
+            refined_text = self._ask_refinement(self.llm, messages)
+            if self.escalation_llm is not None and refinement_needs_escalation(text, refined_text):
+                logger.info(f"Escalating {clause_type.value} clause refinement to {self.escalation_llm.model_name}")
+                refined_text = self._ask_refinement(self.escalation_llm, messages)
             
+            if key is not None:
+                self.cache.put("clause", key, {"text": refined_text})
             return refined_text
             
         except Exception as e:
             logger.error(f"Error refining clause with LLM: {str(e)}")
             # Return original text as fallback
-            return text 
\ No newline at end of file
+            return text
+    
+    @staticmethod
+    def _ask_refinement(llm: GroqChatModel, messages: List[Dict[str, str]]) -> Optional[str]:
+        """Ask a model to refine a clause.
+        
+        Args:
+            llm: Model to ask
+            messages: Refinement messages
+            
+        Returns:
+            Refined clause text or None if the model considers it invalid
+        """
+        completion = llm.complete(messages)
+        refined_text = completion.choices[0].message.content.strip()
+        
+        # Check if LLM considers this a valid clause
+        if refined_text == "NOT_VALID":
+            return None
+        return refined_text
\ No newline at end of file
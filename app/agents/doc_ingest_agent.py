@@ -1,15 +1,24 @@
 import os
+import time
 import uuid
 import logging
-import fitz  # PyMuPDF
+from datetime import datetime
 from pathlib import Path
+from concurrent.futures import as_completed
 from typing import Dict, List, Optional, Any, Tuple
-from pypdf import PdfReader
 from langchain_core.documents import Document
 
 from app.core.config import settings
+from app.core.extraction import extract_text_and_metadata, get_process_pool
+from app.core.storage import file_sha256, store_file
+from app.database.catalog import DocumentCatalog
+from app.database.chunking import diff_chunks, reassemble_chunks
+from app.database.policy_dependencies import PolicyDependencyStore
+from app.database.policy_index import PolicyTopicIndex
+from app.database.sharding import create_vector_store
+from app.database.text_store import DocumentTextStore
 from app.database.vector_store import VectorStore
-from app.schemas.documents import ContractMetadata, DocumentType
+from app.schemas.documents import BatchIngestReport, ContractMetadata, DocumentType
 
 logger = logging.getLogger(__name__)
 
@@ -18,39 +27,354 @@ class DocIngestAgent:
     
     def __init__(self):
         """Initialize the document ingestion agent."""
-        self.contract_store = VectorStore("contracts")
+        self.contract_store = create_vector_store("contracts")
         self.policy_store = VectorStore("policies")
+        self.catalog = DocumentCatalog()
+        self.text_store = DocumentTextStore()
+        self.policy_dependencies = PolicyDependencyStore()
+        self.policy_index = PolicyTopicIndex() if settings.POLICY_TOPIC_INDEX_ENABLED else None
+        if self.policy_index is not None and self.policy_index.count() == 0:
+            self._backfill_policy_index()
+    
+    def _backfill_policy_index(self):
+        """Index the clause types of policies ingested before the topic index existed."""
+        try:
+            for record in self.catalog.list_documents(self._collection_for(DocumentType.POLICY)):
+                chunks = self.policy_store.get_document_chunks(record["document_id"])
+                if chunks:
+                    self.policy_index.add(record["document_id"], chunks)
+        except Exception as e:
+            logger.error(f"Error backfilling policy topic index: {str(e)}")
     
     def ingest_document(
         self, 
         file_path: str, 
         document_type: DocumentType,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        force: bool = False,
+        previous_version_id: Optional[str] = None
     ) -> Tuple[str, ContractMetadata]:
         """Process and ingest a document.
         
+        Byte-identical files that were already ingested into the same
+        collection are not re-extracted or re-embedded; the existing document
+        ID and metadata are returned from the catalog instead.
+        
+        A document ingested as a new version of another (e.g. a returned
+        redline) gets its own ID, linked to the previous version in the
+        catalog. Its chunks are compared with the previous version's: only
+        new or edited chunks miss the embedding cache, the previous
+        version's chunks are removed from the vector store, and the diff is
+        recorded under ``version_diff`` in the metadata. Clause, risk and
+        amendment results are cached by clause text, so re-analysis only
+        calls the LLM for clauses the edit touched.
+        
         Args:
             file_path: Path to the document file
             document_type: Type of document
             metadata: Optional metadata for the document
+            force: Re-ingest even if the content hash is already catalogued
+            previous_version_id: ID of the document this is a new version of
             
         Returns:
             Document ID and metadata
         """
         logger.info(f"Ingesting document: {file_path}")
         
+        collection = self._collection_for(document_type)
+        content_hash = file_sha256(file_path)
+        
+        previous = None
+        if previous_version_id:
+            previous = self.catalog.get(previous_version_id)
+            if not previous or previous["collection"] != collection:
+                raise ValueError(f"Previous version {previous_version_id} not found in {collection}")
+        
+        # Return the existing document for repeated uploads
+        if not force:
+            existing = self.catalog.find_by_hash(content_hash, collection)
+            if existing:
+                logger.info(f"Document already ingested as {existing['document_id']}, skipping")
+                return existing["document_id"], self._metadata_from_record(existing)
+        
         # Generate a unique document ID
         document_id = str(uuid.uuid4())
         
         # Extract text from document
         text, doc_metadata = self._extract_text_and_metadata(file_path)
         
+        version = 1
+        if previous:
+            version = (previous["version"] or 1) + 1
+            metadata = dict(metadata or {}, previous_version_id=previous["document_id"], version=version)
+        
+        # Build metadata and chunks
+        contract_metadata, doc_metadata, full_text, chunks = self._prepare_chunks(
+            file_path=file_path,
+            document_type=document_type,
+            document_id=document_id,
+            text=text,
+            doc_metadata=doc_metadata,
+            metadata=metadata
+        )
+        
+        # Diff before writing, while the previous version's chunks are still stored
+        if previous:
+            doc_metadata["version_diff"] = self._diff_versions(document_type, previous["document_id"], document_id, chunks)
+        
+        # Store in the appropriate vector store
+        self._store_for(document_type).add_documents(chunks)
+        
+        # Record the content hash so repeated uploads can be skipped
+        self._register(
+            document_id,
+            content_hash,
+            file_path,
+            contract_metadata,
+            doc_metadata,
+            full_text,
+            chunks,
+            previous_version_id=previous["document_id"] if previous else None,
+            version=version
+        )
+        
+        # Searches should only see the latest version; its text stays available
+        if previous:
+            self._store_for(document_type).delete_document(previous["document_id"])
+            self.policy_dependencies.delete_contract(previous["document_id"])
+            if self.policy_index is not None:
+                self.policy_index.delete_document(previous["document_id"])
+        
+        # A new policy may change what clauses retrieve
+        if document_type == DocumentType.POLICY:
+            self.policy_dependencies.bump_corpus_version()
+        
+        logger.info(f"Document ingested: {document_id}")
+        return document_id, contract_metadata
+    
+    def _diff_versions(
+        self,
+        document_type: DocumentType,
+        previous_id: str,
+        document_id: str,
+        chunks: List[Document]
+    ) -> Dict[str, Any]:
+        """Compare a new version's chunks with the previous version's.
+        
+        Args:
+            document_type: Type of the document
+            previous_id: ID of the previous version
+            document_id: ID of the new version
+            chunks: Chunks of the new version
+            
+        Returns:
+            Counts of changed and removed chunks and the sections they fall in
+        """
+        previous_chunks = self._store_for(document_type).get_document_chunks(previous_id)
+        
+        # The document ID is part of the header chunk; don't count it as an edit
+        changed, removed = diff_chunks(
+            [chunk.page_content.replace(previous_id, "") for chunk in previous_chunks],
+            [chunk.page_content.replace(document_id, "") for chunk in chunks]
+        )
+        sections = {chunks[index].metadata.get("section") for index in changed}
+        sections |= {previous_chunks[index].metadata.get("section") for index in removed}
+        
+        diff = {
+            "previous_version_id": previous_id,
+            "chunks": len(chunks),
+            "changed_chunks": len(changed),
+            "removed_chunks": len(removed),
+            "changed_sections": sorted(section for section in sections if section),
+        }
+        logger.info(
+            f"Version diff against {previous_id}: {diff['changed_chunks']} of {diff['chunks']} chunks changed, "
+            f"{diff['removed_chunks']} removed"
+        )
+        return diff
+    
+    def get_versions(self, document_id: str) -> List[Dict[str, Any]]:
+        """Get the versions of a document, first to latest.
+        
+        Args:
+            document_id: ID of any version of the document
+            
+        Returns:
+            Document ID, version number, filename, creation time and diff of each version
+        """
+        return [
+            {
+                "document_id": record["document_id"],
+                "version": record["version"] or 1,
+                "previous_version_id": record["previous_version_id"],
+                "filename": record["filename"],
+                "created_at": record["created_at"],
+                "version_diff": record["metadata"].get("version_diff"),
+            }
+            for record in self.catalog.get_versions(document_id)
+        ]
+    
+    def ingest_batch(
+        self,
+        file_paths: List[Path],
+        document_type: DocumentType,
+        force: bool = False,
+        batch_size: Optional[int] = None
+    ) -> BatchIngestReport:
+        """Ingest many documents with pipelined extraction and batched writes.
+        
+        Files are hashed and checked against the catalog first. The remaining
+        files are extracted concurrently in the shared process pool and
+        chunked as results arrive. Chunks from many documents are written to
+        the vector store together once ``batch_size`` chunks are buffered.
+        
+        Args:
+            file_paths: Documents to ingest
+            document_type: Type of all documents in the batch
+            force: Re-ingest even if the content hash is already catalogued
+            batch_size: Chunks per vector store write (defaults to INGEST_BATCH_SIZE)
+            
+        Returns:
+            Batch ingestion report
+        """
+        start_time = time.perf_counter()
+        batch_size = batch_size or settings.INGEST_BATCH_SIZE
+        collection = self._collection_for(document_type)
+        store_dir = settings.POLICIES_DIR if document_type == DocumentType.POLICY else settings.CONTRACTS_DIR
+        report = BatchIngestReport(total_files=len(file_paths))
+        
+        # Step 1: Hash files and skip content that is already ingested
+        pending = {}
+        for path in file_paths:
+            try:
+                content_hash = file_sha256(str(path))
+            except Exception as e:
+                report.failed += 1
+                report.errors.append(f"{path}: {str(e)}")
+                continue
+            
+            existing = None if force else self.catalog.find_by_hash(content_hash, collection)
+            if existing:
+                report.skipped += 1
+                report.document_ids.append(existing["document_id"])
+            elif content_hash in pending:
+                report.skipped += 1
+            else:
+                pending[content_hash] = Path(path)
+        
+        logger.info(f"Batch ingest: {len(pending)} new of {len(file_paths)} files")
+        
+        # Step 2: Extract in worker processes, chunking results as they finish
+        pool = get_process_pool()
+        futures = {
+            pool.submit(extract_text_and_metadata, str(path), False): (content_hash, path)
+            for content_hash, path in pending.items()
+        }
+        
+        buffered_docs = []
+        buffered_chunks = []
+        for future in as_completed(futures):
+            content_hash, path = futures[future]
+            try:
+                text, doc_metadata = future.result()
+                stored_path = store_file(path, store_dir, content_hash)
+                document_id = str(uuid.uuid4())
+                contract_metadata, doc_metadata, full_text, chunks = self._prepare_chunks(
+                    file_path=str(stored_path),
+                    document_type=document_type,
+                    document_id=document_id,
+                    text=text,
+                    doc_metadata=doc_metadata,
+                    metadata={"filename": path.name}
+                )
+            except Exception as e:
+                logger.error(f"Error preparing {path}: {str(e)}")
+                report.failed += 1
+                report.errors.append(f"{path}: {str(e)}")
+                continue
+            
+            buffered_docs.append((document_id, content_hash, stored_path, contract_metadata, doc_metadata, full_text, chunks))
+            buffered_chunks.extend(chunks)
+            
+            # Step 3: Write to the vector store in large batches
+            if len(buffered_chunks) >= batch_size:
+                self._flush_batch(document_type, buffered_docs, buffered_chunks, report)
+                buffered_docs, buffered_chunks = [], []
+        
+        if buffered_docs:
+            self._flush_batch(document_type, buffered_docs, buffered_chunks, report)
+        
+        report.elapsed_seconds = round(time.perf_counter() - start_time, 3)
+        if report.elapsed_seconds > 0:
+            report.docs_per_second = round(report.ingested / report.elapsed_seconds, 2)
+            report.chunks_per_second = round(report.chunks / report.elapsed_seconds, 2)
+        
+        logger.info(
+            f"Batch ingest finished: {report.ingested} ingested, {report.skipped} skipped, "
+            f"{report.failed} failed in {report.elapsed_seconds}s ({report.docs_per_second} docs/sec)"
+        )
+        return report
+    
+    def _flush_batch(
+        self,
+        document_type: DocumentType,
+        documents: List[Tuple[str, str, Path, ContractMetadata, Dict[str, Any], str, List[Document]]],
+        chunks: List[Document],
+        report: BatchIngestReport
+    ):
+        """Write buffered chunks in one call and catalog their documents.
+        
+        Args:
+            document_type: Type of the buffered documents
+            documents: Buffered document records
+            chunks: Chunks of all buffered documents
+            report: Report to update
+        """
+        try:
+            self._store_for(document_type).add_documents(chunks)
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(chunks)} chunks: {str(e)}")
+            report.failed += len(documents)
+            report.errors.append(f"Batch write failed: {str(e)}")
+            return
+        
+        for document_id, content_hash, stored_path, contract_metadata, doc_metadata, full_text, doc_chunks in documents:
+            self._register(document_id, content_hash, str(stored_path), contract_metadata, doc_metadata, full_text, doc_chunks)
+            report.document_ids.append(document_id)
+        report.ingested += len(documents)
+        report.chunks += len(chunks)
+        
+        if document_type == DocumentType.POLICY:
+            self.policy_dependencies.bump_corpus_version()
+    
+    def _prepare_chunks(
+        self,
+        file_path: str,
+        document_type: DocumentType,
+        document_id: str,
+        text: str,
+        doc_metadata: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ContractMetadata, Dict[str, Any], str, List[Document]]:
+        """Build document metadata and chunks from extracted text.
+        
+        Args:
+            file_path: Path to the document file
+            document_type: Type of document
+            document_id: Document ID
+            text: Extracted text
+            doc_metadata: Metadata from extraction
+            metadata: Optional metadata for the document
+            
+        Returns:
+            Document metadata, chunk metadata, the text that was chunked and chunks
+        """
         # Combine with provided metadata
         if metadata:
             doc_metadata.update(metadata)
         
-        # Create document metadata
-        filename = Path(file_path).name
+        # Create document metadata, preferring the original upload name
+        filename = doc_metadata.get("filename") or Path(file_path).name
         contract_metadata = ContractMetadata(
             title=doc_metadata.get("title", filename),
             document_type=document_type,
@@ -69,129 +393,98 @@ class DocIngestAgent:
             "file_id": document_id,  # Store both for compatibility
             "title": contract_metadata.title,
             "document_type": document_type.value,
-            "filename": filename
+            "filename": filename,
+            "ingested_at": time.time()
         })
         
-        # Chunk and embed document
+        # Chunk document
         chunks = VectorStore.chunk_document(
             text=full_text,
             metadata=doc_metadata
         )
+        return contract_metadata, doc_metadata, full_text, chunks
+    
+    def _register(
+        self,
+        document_id: str,
+        content_hash: str,
+        file_path: str,
+        contract_metadata: ContractMetadata,
+        doc_metadata: Dict[str, Any],
+        text: str,
+        chunks: List[Document],
+        previous_version_id: Optional[str] = None,
+        version: int = 1
+    ):
+        """Record an ingested document in the catalog and store its text."""
+        collection = self._collection_for(contract_metadata.document_type)
+        self.text_store.put(document_id, text, chunks)
         
-        # Store in the appropriate vector store
-        if document_type == DocumentType.POLICY:
-            self.policy_store.add_documents(chunks)
-        else:
-            self.contract_store.add_documents(chunks)
+        # A forced re-ingest replaces the catalog entry; drop the old chunks too
+        previous = self.catalog.find_by_hash(content_hash, collection)
+        if previous and previous["document_id"] != document_id:
+            self._store_for(contract_metadata.document_type).delete_document(previous["document_id"])
+            self.text_store.delete(previous["document_id"])
+            if self.policy_index is not None:
+                self.policy_index.delete_document(previous["document_id"])
         
-        logger.info(f"Document ingested: {document_id}")
-        return document_id, contract_metadata
-    
-    def _extract_text_and_metadata(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
-        """Extract text and metadata from a document.
+        # Policies are indexed by the clause types they cover
+        if self.policy_index is not None and contract_metadata.document_type == DocumentType.POLICY:
+            self.policy_index.add(document_id, chunks)
         
-        Args:
-            file_path: Path to the document file
-            
-        Returns:
-            Extracted text and metadata
-        """
-        file_ext = Path(file_path).suffix.lower()
-        
-        if file_ext == ".pdf":
-            return self._extract_from_pdf(file_path)
-        elif file_ext in [".docx", ".doc"]:
-            raise NotImplementedError("Word document extraction not yet implemented")
-        elif file_ext in [".txt", ".md"]:
-            return self._extract_from_text(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {file_ext}")
+        self.catalog.register(
+            document_id=document_id,
+            content_hash=content_hash,
+            collection=collection,
+            document_type=contract_metadata.document_type.value,
+            filename=contract_metadata.filename,
+            title=contract_metadata.title,
+            file_path=str(file_path),
+            chunk_count=len(chunks),
+            metadata=doc_metadata,
+            previous_version_id=previous_version_id,
+            version=version
+        )
+    
+    def _store_for(self, document_type: DocumentType) -> VectorStore:
+        """Get the vector store for a document type."""
+        return self.policy_store if document_type == DocumentType.POLICY else self.contract_store
+    
+    @staticmethod
+    def _collection_for(document_type: DocumentType) -> str:
+        """Get the vector store collection name for a document type."""
+        return "policies" if document_type == DocumentType.POLICY else "contracts"
     
-    def _extract_from_pdf(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
-        """Extract text and metadata from a PDF file.
+    @staticmethod
+    def _metadata_from_record(record: Dict[str, Any]) -> ContractMetadata:
+        """Rebuild document metadata from a catalog record.
         
         Args:
-            file_path: Path to the PDF file
+            record: Catalog record
             
         Returns:
-            Extracted text and metadata
+            Document metadata
         """
-        metadata = {}
-        full_text = ""
-        
-        try:
-            # Extract with PyMuPDF (fitz)
-            with fitz.open(file_path) as doc:
-                metadata = {
-                    "page_count": len(doc),
-                    "title": doc.metadata.get("title", ""),
-                    "author": doc.metadata.get("author", ""),
-                    "subject": doc.metadata.get("subject", ""),
-                    "keywords": doc.metadata.get("keywords", ""),
-                    "creator": doc.metadata.get("creator", ""),
-                    "producer": doc.metadata.get("producer", ""),
-                }
-                
-                # Extract text from each page
-                for page_num, page in enumerate(doc):
-                    text = page.get_text()
-                    full_text += f"\n\n--- Page {page_num + 1} ---\n\n{text}"
-        
-        except Exception as e:
-            logger.error(f"Error extracting with PyMuPDF: {str(e)}")
-            
-            # Fallback to pypdf
-            try:
-                with open(file_path, "rb") as f:
-                    reader = PdfReader(f)
-                    metadata = {
-                        "page_count": len(reader.pages),
-                    }
-                    
-                    if reader.metadata:
-                        metadata.update({
-                            "title": reader.metadata.get("/Title", ""),
-                            "author": reader.metadata.get("/Author", ""),
-                            "subject": reader.metadata.get("/Subject", ""),
-                            "keywords": reader.metadata.get("/Keywords", ""),
-                            "creator": reader.metadata.get("/Creator", ""),
-                            "producer": reader.metadata.get("/Producer", ""),
-                        })
-                    
-                    # Extract text from each page
-                    for page_num, page in enumerate(reader.pages):
-                        text = page.extract_text()
-                        full_text += f"\n\n--- Page {page_num + 1} ---\n\n{text}"
-            
-            except Exception as e2:
-                logger.error(f"Error extracting with pypdf: {str(e2)}")
-                raise ValueError(f"Could not extract text from PDF: {str(e2)}")
-        
-        return full_text, metadata
+        return ContractMetadata(
+            title=record["title"] or record["filename"],
+            document_type=DocumentType(record["document_type"]),
+            parties=record["metadata"].get("parties", []),
+            document_id=record["document_id"],
+            filename=record["filename"],
+            upload_date=datetime.fromtimestamp(record["created_at"]),
+            additional_metadata=record["metadata"]
+        )
     
-    def _extract_from_text(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
-        """Extract text from a plain text file.
+    def _extract_text_and_metadata(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract text and metadata from a document.
         
         Args:
-            file_path: Path to the text file
+            file_path: Path to the document file
             
         Returns:
             Extracted text and metadata
         """
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
-            
-            metadata = {
-                "line_count": text.count("\n") + 1,
-                "char_count": len(text),
-            }
-            
-            return text, metadata
-        
-        except Exception as e:
-            logger.error(f"Error extracting from text file: {str(e)}")
-            raise ValueError(f"Could not extract text from file: {str(e)}")
+        return extract_text_and_metadata(file_path)
     
     def get_document_by_id(self, document_id: str, k: int = 10) -> List[Document]:
         """Retrieve a document by ID.
@@ -204,9 +497,31 @@ class DocIngestAgent:
             Document chunks
         """
         # Try both stores
-        docs = self.contract_store.get_document_by_id(document_id)
+        docs = self.contract_store.get_document_chunks(document_id)
         
         if not docs:
-            docs = self.policy_store.get_document_by_id(document_id)
+            docs = self.policy_store.get_document_chunks(document_id)
+        
+        return docs[:k] if k else docs
+    
+    def get_document_text(self, document_id: str) -> Optional[str]:
+        """Get a document's full text.
+        
+        The text stored at ingest is returned as is. Documents ingested
+        before the text store existed are rebuilt from their chunks in
+        chunk order, with the overlap between neighbours removed.
+        
+        Args:
+            document_id: Document ID
+            
+        Returns:
+            Document text, or None if the document is unknown
+        """
+        text = self.text_store.get(document_id)
+        if text is not None:
+            return text
         
-        return docs 
\ No newline at end of file
+        chunks = self.get_document_by_id(document_id, k=0)
+        if not chunks:
+            return None
+        return reassemble_chunks(chunks, settings.CHUNK_OVERLAP) 
\ No newline at end of file
@@ -1,13 +1,17 @@
 import logging
-from typing import List
+import threading
+from typing import Any, Dict, List, Optional
 from langchain_core.documents import Document
 from langchain.prompts import ChatPromptTemplate
 from datetime import datetime
 
-from app.schemas.documents import PolicyCheckResult, ExtractedClause
+from app.schemas.documents import ClauseType, PolicyCheckResult, ExtractedClause
 from app.core.config import settings
+from app.database.policy_dependencies import PolicyDependencyStore
+from app.database.policy_index import PolicyTopicIndex
 from app.database.vector_store import VectorStore
 from app.core.llm import GroqChatModel
+from app.core.routing import task_model
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +21,7 @@ class PolicyCheckAgent:
     def __init__(self):
         """Initialize the policy check agent."""
         self.llm = GroqChatModel(
-            model_name=settings.LLM_MODEL,
+            model_name=task_model("policy_check"),
             temperature=0.0
         )
         
@@ -33,6 +37,16 @@ class PolicyCheckAgent:
         
         # Initialize vector store for policies
         self.policy_store = VectorStore("policies")
+        
+        # Policy chunks each analyzed clause depends on
+        self.dependencies = PolicyDependencyStore()
+        self._refresh_lock = threading.Lock()
+        
+        # Policy chunks per clause type, reloaded when the policy corpus changes
+        self.policy_index = PolicyTopicIndex() if settings.POLICY_TOPIC_INDEX_ENABLED else None
+        self._topics: Dict[str, List[Document]] = {}
+        self._topics_version: Optional[int] = None
+        self._topics_lock = threading.Lock()
     
     def check_policies(self, contract: Document, policies: List[Document]) -> PolicyCheckResult:
         """Check a contract against policy guidelines.
@@ -119,24 +133,173 @@ class PolicyCheckAgent:
                 metadata={"error": str(e)}
             )
 
-    def check_clause_against_policies(self, clause: ExtractedClause) -> List[Document]:
+    def check_clause_against_policies(
+        self,
+        clause: ExtractedClause,
+        contract_id: Optional[str] = None
+    ) -> List[Document]:
         """Check a clause against relevant policy documents.
         
         Args:
             clause: The clause to check
+            contract_id: Contract the clause belongs to; when given, the
+                retrieved policy chunks are recorded as the clause's dependencies
             
         Returns:
             List of relevant policy documents
         """
         try:
-            # Get relevant policies using semantic search
-            relevant_policies = self.policy_store.similarity_search(
-                clause.text,
-                k=3  # Get top 3 most relevant policies
-            )
+            corpus_version = self.dependencies.corpus_version()
+            
+            # Get relevant policies for the clause type, else by fused keyword and semantic search
+            relevant_policies = self._retrieve(clause.text, clause.clause_type)
+            
+            if contract_id:
+                self.dependencies.record(
+                    contract_id,
+                    clause.clause_type.value,
+                    clause.text,
+                    self.policy_chunk_ids(relevant_policies),
+                    corpus_version
+                )
             
             return relevant_policies
             
         except Exception as e:
             logger.error(f"Error checking clause against policies: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    def _retrieve(self, clause_text: str, clause_type: Optional[ClauseType] = None) -> List[Document]:
+        """Retrieve the policy chunks relevant to a clause.
+        
+        Typed clauses get the policy chunks indexed under their clause type
+        at ingest; untyped clauses, and types no policy covers, fall back to
+        hybrid search.
+        
+        Args:
+            clause_text: Clause text
+            clause_type: Clause type, if known
+            
+        Returns:
+            Relevant policy chunks
+        """
+        if clause_type and clause_type != ClauseType.OTHER:
+            topic_policies = self.topic_policies(clause_type)
+            if topic_policies:
+                return topic_policies
+        return self.policy_store.hybrid_search(clause_text, k=settings.POLICY_RETRIEVAL_K)
+    
+    def topic_policies(self, clause_type: ClauseType) -> List[Document]:
+        """Get the policy chunks indexed under a clause type.
+        
+        Args:
+            clause_type: Clause type
+            
+        Returns:
+            Policy chunks, best first; empty if none or the index is disabled
+        """
+        if self.policy_index is None:
+            return []
+        
+        corpus_version = self.dependencies.corpus_version()
+        if corpus_version != self._topics_version:
+            with self._topics_lock:
+                if corpus_version != self._topics_version:
+                    self._topics = self.policy_index.load()
+                    self._topics_version = corpus_version
+        return self._topics.get(clause_type.value, [])
+    
+    @staticmethod
+    def policy_chunk_ids(policies: List[Document]) -> List[str]:
+        """Chunk IDs of retrieved policy chunks."""
+        return [
+            f"{policy.metadata.get('document_id')}:{policy.metadata.get('chunk_index', 0)}"
+            for policy in policies
+        ]
+    
+    def refresh_dependencies(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Find the clauses affected by a policy change.
+        
+        Retrieval is repeated for every clause recorded against an older
+        policy corpus version. Clauses that retrieve the same policy chunks
+        are brought up to the current version; the rest are marked stale.
+        Only retrieval runs here, no LLM calls.
+        
+        Args:
+            limit: Maximum number of clauses to check in this call
+            
+        Returns:
+            Corpus version and the number of clauses checked and marked stale
+        """
+        corpus_version = self.dependencies.corpus_version()
+        checked = 0
+        stale = 0
+        for record in self.dependencies.outdated(limit):
+            policy_references = self._retrieve(record["clause_text"], ClauseType(record["clause_type"]))
+            policy_chunk_ids = sorted(self.policy_chunk_ids(policy_references))
+            if policy_chunk_ids == record["policy_chunk_ids"]:
+                self.dependencies.mark_current(record["contract_id"], record["clause_key"], corpus_version)
+            else:
+                self.dependencies.mark_stale(record["contract_id"], record["clause_key"])
+                stale += 1
+            checked += 1
+        
+        logger.info(f"Policy corpus v{corpus_version}: {stale} of {checked} checked clauses need re-analysis")
+        return {"corpus_version": corpus_version, "checked": checked, "stale": stale}
+    
+    def reanalyze_stale(self, risk_assessment_agent: Any, contract_id: Optional[str] = None) -> int:
+        """Re-assess the risk of stale clauses against their new policy set.
+        
+        New assessments land in the analysis cache, so the next analysis of
+        the contract picks them up without calling the LLM again.
+        
+        Args:
+            risk_assessment_agent: Agent that assesses clause risk
+            contract_id: Only re-analyze clauses of this contract
+            
+        Returns:
+            Number of clauses re-analyzed
+        """
+        reanalyzed = 0
+        for record in self.dependencies.stale(contract_id):
+            clause = ExtractedClause(
+                clause_id=record["clause_key"],
+                clause_type=ClauseType(record["clause_type"]),
+                text=record["clause_text"],
+                start_index=0,
+                end_index=len(record["clause_text"])
+            )
+            corpus_version = self.dependencies.corpus_version()
+            policy_references = self._retrieve(clause.text, clause.clause_type)
+            risk_assessment_agent.assess_clause_risk(clause=clause, policy_references=policy_references)
+            self.dependencies.record(
+                record["contract_id"],
+                record["clause_type"],
+                clause.text,
+                self.policy_chunk_ids(policy_references),
+                corpus_version
+            )
+            reanalyzed += 1
+        return reanalyzed
+    
+    def update_after_policy_change(self, risk_assessment_agent: Any) -> Dict[str, Any]:
+        """Re-analyze only the clauses whose policy set a policy change altered.
+        
+        Runs refresh_dependencies and then reanalyze_stale. Concurrent calls
+        are serialized, so a burst of policy uploads re-analyzes each
+        affected clause once.
+        
+        Args:
+            risk_assessment_agent: Agent that assesses clause risk
+            
+        Returns:
+            Corpus version and the number of clauses checked, marked stale and re-analyzed
+        """
+        with self._refresh_lock:
+            try:
+                result = self.refresh_dependencies()
+                result["reanalyzed"] = self.reanalyze_stale(risk_assessment_agent)
+                return result
+            except Exception as e:
+                logger.error(f"Error re-analyzing clauses after policy change: {str(e)}")
+                return {"error": str(e)} 
\ No newline at end of file
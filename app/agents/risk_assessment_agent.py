@@ -1,11 +1,13 @@
 import logging
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from langchain_core.documents import Document
 from langchain.prompts import ChatPromptTemplate
 
 from app.schemas.documents import ClauseRiskAssessment, ClauseType, RiskLevel, ExtractedClause
 from app.core.config import settings
 from app.core.llm import GroqChatModel
+from app.core.routing import escalation_model, task_model
+from app.database.analysis_cache import get_analysis_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +17,21 @@ class RiskAssessmentAgent:
     def __init__(self):
         """Initialize the risk assessment agent."""
         self.llm = GroqChatModel(
-            model_name="llama3-70b-8192",
+            model_name=task_model("risk_assessment"),
             temperature=0.0,
             max_tokens=8192,
             top_p=0.9
         )
         
+        # Answers without a risk level are asked again of the escalation model
+        escalation = escalation_model("risk_assessment")
+        self.escalation_llm = GroqChatModel(
+            model_name=escalation,
+            temperature=0.0,
+            max_tokens=8192,
+            top_p=0.9
+        ) if escalation else None
+        
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", "You are a legal risk assessment expert. Your task is to analyze contract clauses "
                       "and identify potential risks based on policy guidelines.\n\n"
@@ -51,6 +62,9 @@ class RiskAssessmentAgent:
                     "3. Specific risk factors\n"
                     "4. Recommendations for improvement")
         ])
+        
+        # Assessments of clause and policy text already seen
+        self.cache = get_analysis_cache()
     
     def assess_clause_risk(
         self,
@@ -79,6 +93,17 @@ class RiskAssessmentAgent:
             
             policy_text = "\n\n".join(policy_texts) if policy_texts else "No policy references available"
             
+            # Unchanged clauses judged against unchanged policies reuse their assessment
+            key = None
+            if self.cache is not None:
+                key = self.cache.make_key(
+                    self.llm.model_name, self.llm.temperature, clause.clause_type.value, clause.text, policy_text
+                )
+                cached = self.cache.get("risk", key)
+                if cached is not None:
+                    cached["clause_id"] = clause.clause_id
+                    return ClauseRiskAssessment(**cached)
+            
             # Create messages for the LLM
             messages = [
                 {
@@ -109,52 +134,26 @@ class RiskAssessmentAgent:
             ]
             
             # Get response from LLM
-            completion = self.llm.client.chat.completions.create(
-                model=self.llm.model_name,
-                messages=messages,
-                temperature=self.llm.temperature,
-                max_tokens=self.llm.max_tokens,
-                top_p=self.llm.top_p
-            )
-            
-            # Parse response
-            content = completion.choices[0].message.content
-            sections = content.split("\n\n")
-            
-            risk_level = RiskLevel.MEDIUM  # Default
-            risk_score = 0.5  # Default
-            risk_factors = []
-            recommendations = []
-            reasons = []
-            
-            for section in sections:
-                if section.startswith("Risk Level:"):
-                    level_text = section.split(":")[1].strip().lower()
-                    if level_text in ["low", "medium", "high"]:
-                        risk_level = RiskLevel(level_text)
-                elif section.startswith("Risk Score:"):
-                    try:
-                        score_text = section.split(":")[1].strip()
-                        risk_score = float(score_text)
-                    except:
-                        risk_score = 0.5
-                elif section.startswith("Risk Factors:"):
-                    risk_factors = [f.strip() for f in section.split("\n")[1:] if f.strip()]
-                elif section.startswith("Recommendations:"):
-                    recommendations = [r.strip() for r in section.split("\n")[1:] if r.strip()]
-                elif section.startswith("Reasons:"):
-                    reasons = [r.strip() for r in section.split("\n")[1:] if r.strip()]
+            completion = self.llm.complete(messages)
+            parsed = self._parse_assessment(completion.choices[0].message.content)
+            if parsed["risk_level"] is None and self.escalation_llm is not None:
+                logger.info(f"Escalating {clause.clause_type.value} risk assessment to {self.escalation_llm.model_name}")
+                completion = self.escalation_llm.complete(messages)
+                parsed = self._parse_assessment(completion.choices[0].message.content)
             
-            return ClauseRiskAssessment(
+            assessment = ClauseRiskAssessment(
                 clause_id=clause.clause_id,
                 clause_type=clause.clause_type,
-                risk_level=risk_level,
-                risk_score=risk_score,
-                risk_factors=risk_factors or ["No specific risk factors identified"],
-                recommendations=recommendations or ["No specific recommendations"],
-                reasons=reasons or ["Risk assessment based on general analysis"],
+                risk_level=parsed["risk_level"] or RiskLevel.MEDIUM,
+                risk_score=parsed["risk_score"],
+                risk_factors=parsed["risk_factors"] or ["No specific risk factors identified"],
+                recommendations=parsed["recommendations"] or ["No specific recommendations"],
+                reasons=parsed["reasons"] or ["Risk assessment based on general analysis"],
                 policy_references=[p.metadata.get("document_id", "unknown") for p in policy_references if isinstance(p, Document)]
             )
+            if key is not None:
+                self.cache.put("risk", key, assessment.model_dump(mode="json"))
+            return assessment
             
         except Exception as e:
             logger.error(f"Error in clause risk assessment: {str(e)}")
@@ -169,6 +168,51 @@ class RiskAssessmentAgent:
                 policy_references=[]
             )
     
+    @staticmethod
+    def _parse_assessment(content: str) -> Dict[str, Any]:
+        """Parse a risk assessment response.
+        
+        Args:
+            content: Model response
+            
+        Returns:
+            Risk level (None if the response has none), risk score, risk
+            factors, recommendations and reasons
+        """
+        sections = content.split("\n\n")
+        
+        risk_level: Optional[RiskLevel] = None
+        risk_score = 0.5  # Default
+        risk_factors = []
+        recommendations = []
+        reasons = []
+        
+        for section in sections:
+            if section.startswith("Risk Level:"):
+                level_text = section.split(":")[1].strip().lower()
+                if level_text in ["low", "medium", "high"]:
+                    risk_level = RiskLevel(level_text)
+            elif section.startswith("Risk Score:"):
+                try:
+                    score_text = section.split(":")[1].strip()
+                    risk_score = float(score_text)
+                except:
+                    risk_score = 0.5
+            elif section.startswith("Risk Factors:"):
+                risk_factors = [f.strip() for f in section.split("\n")[1:] if f.strip()]
+            elif section.startswith("Recommendations:"):
+                recommendations = [r.strip() for r in section.split("\n")[1:] if r.strip()]
+            elif section.startswith("Reasons:"):
+                reasons = [r.strip() for r in section.split("\n")[1:] if r.strip()]
+        
+        return {
+            "risk_level": risk_level,
+            "risk_score": risk_score,
+            "risk_factors": risk_factors,
+            "recommendations": recommendations,
+            "reasons": reasons
+        }
+    
     def calculate_overall_risk(
         self,
         risk_assessments: List[ClauseRiskAssessment]
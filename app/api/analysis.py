@@ -12,6 +12,7 @@ from app.schemas.documents import (
     PolicyCheckResult,
     AmendmentSuggestion
 )
+from app.database.sharding import create_vector_store
 from app.database.vector_store import VectorStore
 from app.agents.policy_check_agent import PolicyCheckAgent
 from app.agents.risk_assessment_agent import RiskAssessmentAgent
@@ -25,7 +26,7 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Initialize vector stores and agents
-contract_store = VectorStore("contracts")
+contract_store = create_vector_store("contracts")
 policy_store = VectorStore("policies")
 policy_check_agent = PolicyCheckAgent()
 risk_assessment_agent = RiskAssessmentAgent()
@@ -38,20 +39,10 @@ clause_extraction_agent = ClauseExtractionAgent()
 async def check_contract_against_policies(contract_id: str):
     """Check a contract against policy guidelines."""
     try:
-        # Get contract document
-        contract_docs = doc_ingest_agent.get_document_by_id(contract_id)
-        if not contract_docs:
-            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
-        
-        # Ensure contract_docs is a list
-        if not isinstance(contract_docs, list):
-            contract_docs = [contract_docs]
-            
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_docs if hasattr(chunk, 'page_content')])
-        
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
         if not document_text:
-            raise HTTPException(status_code=500, detail="Invalid document format returned from storage")
+            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
             
         contract_doc = Document(
             page_content=document_text,
@@ -77,20 +68,10 @@ async def check_contract_against_policies(contract_id: str):
 async def get_contract_risks(contract_id: str):
     """Get risk assessment for a contract."""
     try:
-        # Get contract from vector store
-        contract_chunks = doc_ingest_agent.get_document_by_id(contract_id)
-        if not contract_chunks:
-            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
-        
-        # Ensure contract_chunks is a list
-        if not isinstance(contract_chunks, list):
-            contract_chunks = [contract_chunks]
-            
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_chunks if hasattr(chunk, 'page_content')])
-        
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
         if not document_text:
-            raise HTTPException(status_code=500, detail="Invalid document format returned from storage")
+            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
             
         contract_doc = Document(
             page_content=document_text,
@@ -110,7 +91,7 @@ async def get_contract_risks(contract_id: str):
         risk_assessments = []
         for clause in clauses:
             # Get relevant policies
-            policy_references = policy_check_agent.check_clause_against_policies(clause)
+            policy_references = policy_check_agent.check_clause_against_policies(clause, contract_id)
             
             # Assess risk
             risk_assessment = risk_assessment_agent.assess_clause_risk(
@@ -141,20 +122,10 @@ async def get_contract_risks(contract_id: str):
 async def get_contract_amendments(contract_id: str):
     """Get amendment suggestions for a contract."""
     try:
-        # Get contract from vector store
-        contract_chunks = doc_ingest_agent.get_document_by_id(contract_id)
-        if not contract_chunks:
-            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
-        
-        # Ensure contract_chunks is a list
-        if not isinstance(contract_chunks, list):
-            contract_chunks = [contract_chunks]
-            
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_chunks if hasattr(chunk, 'page_content')])
-        
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
         if not document_text:
-            raise HTTPException(status_code=500, detail="Invalid document format returned from storage")
+            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
             
         contract_doc = Document(
             page_content=document_text,
@@ -168,7 +139,7 @@ async def get_contract_amendments(contract_id: str):
         risk_assessments = []
         for clause in clauses:
             # Get relevant policies
-            policy_references = policy_check_agent.check_clause_against_policies(clause)
+            policy_references = policy_check_agent.check_clause_against_policies(clause, contract_id)
             
             # Assess risk
             risk_assessment = risk_assessment_agent.assess_clause_risk(
@@ -203,20 +174,10 @@ async def get_contract_amendments(contract_id: str):
 async def get_contract_summary(contract_id: str):
     """Get a summary of the contract analysis."""
     try:
-        # Get contract from vector store
-        contract_chunks = doc_ingest_agent.get_document_by_id(contract_id)
-        if not contract_chunks:
-            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
-        
-        # Ensure contract_chunks is a list
-        if not isinstance(contract_chunks, list):
-            contract_chunks = [contract_chunks]
-            
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_chunks if hasattr(chunk, 'page_content')])
-        
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
         if not document_text:
-            raise HTTPException(status_code=500, detail="Invalid document format returned from storage")
+            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
             
         contract_doc = Document(
             page_content=document_text,
@@ -230,7 +191,7 @@ async def get_contract_summary(contract_id: str):
         risk_assessments = []
         for clause in clauses:
             # Get relevant policies
-            policy_references = policy_check_agent.check_clause_against_policies(clause)
+            policy_references = policy_check_agent.check_clause_against_policies(clause, contract_id)
             
             # Assess risk
             risk_assessment = risk_assessment_agent.assess_clause_risk(
@@ -1,13 +1,17 @@
 import os
+import json
 import shutil
 import uuid
 from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks, Form, Depends
-from typing import List, Optional
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 import logging
 from langchain_core.documents import Document
 
 from app.core.config import settings
+from app.core.storage import save_upload, UploadTooLargeError
 from app.schemas.documents import (
     UploadResponse, 
     DocumentType,
@@ -36,51 +40,43 @@ summary_agent = SummaryAgent()
 @router.post("/upload")
 async def upload_contract(
     file: UploadFile = File(...),
-    document_type: DocumentType = Form(DocumentType.CONTRACT)
+    document_type: DocumentType = Form(DocumentType.CONTRACT),
+    force: bool = Form(False),
+    previous_version_id: Optional[str] = Form(None)
 ) -> UploadResponse:
     """Upload and process a contract document.
     
     Args:
         file: Contract file
         document_type: Type of document
+        force: Re-ingest even if identical content was uploaded before
+        previous_version_id: ID of the contract this upload is a new version of
         
     Returns:
         Upload response with file ID
     """
     try:
-        # Create temp directory if it doesn't exist
-        temp_dir = Path("temp")
-        temp_dir.mkdir(exist_ok=True)
-        
         # Save uploaded file
-        temp_file = temp_dir / file.filename
-        try:
-            contents = await file.read()
-            temp_file.write_bytes(contents)
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Error saving file: {str(e)}"
-            )
+        file_path, size = await _save_contract_upload(file)
         
         # Process contract
-        try:
-            analysis = process_contract(str(temp_file), document_type)
-            
-            # Return upload response
-            return UploadResponse(
-                file_id=analysis.contract_id,
-                filename=file.filename,
-                content_type=file.content_type,
-                size=len(contents),
-                status="success",
-                message="Contract uploaded successfully"
-            )
-            
-        finally:
-            # Clean up temp file
-            if temp_file.exists():
-                temp_file.unlink()
+        analysis = process_contract(
+            str(file_path),
+            document_type,
+            metadata={"filename": file.filename},
+            force=force,
+            previous_version_id=previous_version_id
+        )
+        
+        # Return upload response
+        return UploadResponse(
+            file_id=analysis.contract_id,
+            filename=file.filename,
+            content_type=file.content_type,
+            size=size,
+            status="success",
+            message="Contract uploaded successfully"
+        )
             
     except HTTPException:
         raise
@@ -91,6 +87,71 @@ async def upload_contract(
             detail=f"Error uploading contract: {str(e)}"
         )
 
+@router.post("/upload/stream")
+async def upload_contract_stream(
+    file: UploadFile = File(...),
+    document_type: DocumentType = Form(DocumentType.CONTRACT),
+    force: bool = Form(False),
+    previous_version_id: Optional[str] = Form(None)
+) -> StreamingResponse:
+    """Upload a contract and stream analysis progress as Server-Sent Events.
+    
+    Events are emitted as each pipeline stage finishes: ``ingested``,
+    ``clauses``, ``policy_check``, one ``risk`` per clause, ``overall_risk``,
+    ``amendments``, ``summary_token`` deltas, ``summary`` and finally
+    ``complete`` with the full analysis. Failures are reported as ``error``.
+    
+    Args:
+        file: Contract file
+        document_type: Type of document
+        force: Re-ingest even if identical content was uploaded before
+        previous_version_id: ID of the contract this upload is a new version of
+        
+    Returns:
+        Streaming response with ``text/event-stream`` content
+    """
+    file_path, _ = await _save_contract_upload(file)
+    return _event_stream_response(
+        stream_contract_events(
+            str(file_path),
+            document_type,
+            metadata={"filename": file.filename},
+            force=force,
+            previous_version_id=previous_version_id
+        )
+    )
+
+async def _save_contract_upload(file: UploadFile) -> Tuple[Path, int]:
+    """Stream an uploaded contract into the content-addressed contracts directory.
+    
+    Args:
+        file: Uploaded file
+        
+    Returns:
+        Path of the saved file and its size in bytes
+    """
+    try:
+        file_path, size, _ = await save_upload(file, settings.CONTRACTS_DIR)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Error saving file: {str(e)}"
+        )
+    return file_path, size
+
+def _event_stream_response(events: Iterator[str]) -> StreamingResponse:
+    """Wrap an SSE generator in a response that proxies will not buffer."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
 @router.get("/{contract_id}")
 async def get_contract(contract_id: str) -> ContractAnalysis:
     """Get analysis results for a contract.
@@ -102,16 +163,13 @@ async def get_contract(contract_id: str) -> ContractAnalysis:
         Contract analysis
     """
     try:
-        # Get document from vector store
-        document_chunks = doc_ingest_agent.get_document_by_id(contract_id)
-        if not document_chunks:
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
+        if not document_text:
             raise HTTPException(
                 status_code=404,
                 detail=f"Contract with ID {contract_id} not found"
             )
-        
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in document_chunks])
         contract_doc = Document(
             page_content=document_text,
             metadata={"document_id": contract_id}
@@ -133,7 +191,7 @@ async def get_contract(contract_id: str) -> ContractAnalysis:
         risk_assessments = []
         for clause in clauses:
             # Get relevant policies
-            policy_references = policy_check_agent.check_clause_against_policies(clause)
+            policy_references = policy_check_agent.check_clause_against_policies(clause, contract_id)
             
             # Assess risk
             risk_assessment = risk_assessment_agent.assess_clause_risk(
@@ -162,8 +220,9 @@ async def get_contract(contract_id: str) -> ContractAnalysis:
             risk_assessments=risk_assessments
         )
         
-        # Get metadata from first chunk
-        metadata = document_chunks[0].metadata
+        # Get metadata from the catalog
+        record = doc_ingest_agent.catalog.get(contract_id)
+        metadata = record["metadata"] if record else {}
         contract_metadata = ContractMetadata(
             title=metadata.get("title", "Unknown"),
             document_type=DocumentType(metadata.get("document_type", "contract")),
@@ -202,7 +261,7 @@ async def analyze_contract(
     """Analyze a previously uploaded contract."""
     try:
         # Find the contract file
-        contract_files = list(settings.CONTRACTS_DIR.glob(f"{file_id}.*"))
+        contract_files = _find_contract_files(file_id)
         
         if not contract_files:
             raise HTTPException(status_code=404, detail=f"Contract with ID {file_id} not found")
@@ -220,6 +279,21 @@ async def analyze_contract(
         logger.error(f"Error analyzing contract: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error analyzing contract: {str(e)}")
 
+@router.post("/analyze/{file_id}/stream")
+async def analyze_contract_stream(
+    file_id: str,
+    document_type: DocumentType = DocumentType.CONTRACT
+) -> StreamingResponse:
+    """Analyze a previously uploaded contract, streaming progress as Server-Sent Events."""
+    contract_files = _find_contract_files(file_id)
+    
+    if not contract_files:
+        raise HTTPException(status_code=404, detail=f"Contract with ID {file_id} not found")
+    
+    return _event_stream_response(
+        stream_contract_events(str(contract_files[0]), document_type)
+    )
+
 @router.get("/{contract_id}", response_model=ContractAnalysis)
 async def get_contract_analysis(contract_id: str):
     """Get the analysis for a specific contract."""
@@ -245,7 +319,7 @@ async def delete_contract(contract_id: str):
     """Delete a contract and its analysis."""
     try:
         # Find the contract file
-        contract_files = list(settings.CONTRACTS_DIR.glob(f"{contract_id}.*"))
+        contract_files = _find_contract_files(contract_id)
         
         if not contract_files:
             raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
@@ -253,8 +327,12 @@ async def delete_contract(contract_id: str):
         # Delete the file
         for file_path in contract_files:
             os.remove(file_path)
+        doc_ingest_agent.catalog.remove(contract_id)
         
-        # TODO: Delete from vector store
+        # Delete the contract's chunks and text
+        doc_ingest_agent.contract_store.delete_document(contract_id)
+        doc_ingest_agent.text_store.delete(contract_id)
+        doc_ingest_agent.policy_dependencies.delete_contract(contract_id)
         
         return {"status": "success", "message": f"Contract {contract_id} deleted successfully"}
     
@@ -264,38 +342,102 @@ async def delete_contract(contract_id: str):
         logger.error(f"Error deleting contract: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error deleting contract: {str(e)}")
 
-def process_contract(file_path: str, document_type: DocumentType) -> ContractAnalysis:
+def _find_contract_files(contract_id: str) -> List[Path]:
+    """Find the stored file(s) for a contract.
+    
+    Uploads are stored under their content hash, so the catalog is consulted
+    first; files named after the contract ID are still found for older data.
+    
+    Args:
+        contract_id: Contract ID
+        
+    Returns:
+        Paths of existing contract files
+    """
+    record = doc_ingest_agent.catalog.get(contract_id)
+    if record and record["file_path"] and os.path.exists(record["file_path"]):
+        return [Path(record["file_path"])]
+    return list(settings.CONTRACTS_DIR.glob(f"{contract_id}.*"))
+
+def process_contract(
+    file_path: str,
+    document_type: DocumentType,
+    metadata: Optional[Dict[str, Any]] = None,
+    force: bool = False,
+    previous_version_id: Optional[str] = None
+) -> ContractAnalysis:
     """Process a contract document through all agents.
     
     Args:
         file_path: Path to the contract file
         document_type: Type of document
+        metadata: Optional metadata for the document
+        force: Re-ingest even if identical content was ingested before
+        previous_version_id: ID of the contract this is a new version of
         
     Returns:
         Contract analysis
     """
+    analysis = None
+    for event, payload in iter_contract_pipeline(file_path, document_type, metadata, force, previous_version_id):
+        if event == "complete":
+            analysis = payload
+    return analysis
+
+def iter_contract_pipeline(
+    file_path: str,
+    document_type: DocumentType,
+    metadata: Optional[Dict[str, Any]] = None,
+    force: bool = False,
+    previous_version_id: Optional[str] = None
+) -> Iterator[Tuple[str, Any]]:
+    """Run a contract through all agents, yielding events as each stage finishes.
+    
+    For a new version of a contract, clauses whose text is unchanged reuse
+    the cached clause, risk and amendment results of the previous version.
+    
+    Args:
+        file_path: Path to the contract file
+        document_type: Type of document
+        metadata: Optional metadata for the document
+        force: Re-ingest even if identical content was ingested before
+        previous_version_id: ID of the contract this is a new version of
+        
+    Yields:
+        Tuples of (event name, payload). The last event is ``complete`` with
+        the full ContractAnalysis as its payload.
+    """
     logger.info(f"Processing contract: {file_path}")
     
     try:
         # Step 1: Ingest document
+        if previous_version_id and not doc_ingest_agent.catalog.get(previous_version_id):
+            raise HTTPException(status_code=404, detail=f"Contract with ID {previous_version_id} not found")
+        
         document_id, contract_metadata = doc_ingest_agent.ingest_document(
             file_path=file_path,
-            document_type=document_type
+            document_type=document_type,
+            metadata=metadata,
+            force=force,
+            previous_version_id=previous_version_id
         )
         
-        # Step 2: Get document from vector store
-        document = doc_ingest_agent.get_document_by_id(document_id)
-        if not document:
+        # Step 2: Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(document_id)
+        if not document_text:
             raise HTTPException(status_code=404, detail=f"Contract with ID {document_id} not found")
         
+        yield "ingested", {"contract_id": document_id, "metadata": contract_metadata}
+        
         # Create contract document
         contract_doc = Document(
-            page_content=document.page_content,
+            page_content=document_text,
             metadata={"document_id": document_id}
         )
         
         # Step 3: Extract clauses
         clauses = clause_extraction_agent.extract_clauses(contract_doc.page_content)
+        yield "clauses", {"clauses": clauses}
         
         # Step 4: Get policy documents
         policy_docs = policy_check_agent.policy_store.get_all_documents()
@@ -305,12 +447,13 @@ def process_contract(file_path: str, document_type: DocumentType) -> ContractAna
         
         # Step 5: Check policies
         policy_check_result = policy_check_agent.check_policies(contract_doc, policy_docs)
+        yield "policy_check", policy_check_result
         
         # Step 6: Check clauses against policies and assess risks
         risk_assessments = []
         for clause in clauses:
             # Get relevant policies
-            policy_references = policy_check_agent.check_clause_against_policies(clause)
+            policy_references = policy_check_agent.check_clause_against_policies(clause, document_id)
             
             # Assess risk
             risk_assessment = risk_assessment_agent.assess_clause_risk(
@@ -318,11 +461,16 @@ def process_contract(file_path: str, document_type: DocumentType) -> ContractAna
                 policy_references=policy_references
             )
             risk_assessments.append(risk_assessment)
+            yield "risk", risk_assessment
         
         # Step 7: Calculate overall risk
         overall_risk_score, overall_risk_level = risk_assessment_agent.calculate_overall_risk(
             risk_assessments
         )
+        yield "overall_risk", {
+            "overall_risk_score": overall_risk_score,
+            "overall_risk_level": overall_risk_level
+        }
         
         # Step 8: Generate amendment suggestions
         amendments = amendment_suggester_agent.suggest_amendments(
@@ -331,15 +479,21 @@ def process_contract(file_path: str, document_type: DocumentType) -> ContractAna
             risk_assessments=risk_assessments,
             policy_references=policy_docs
         )
+        yield "amendments", {"amendments": amendments}
         
-        # Step 9: Generate summary
-        summary = summary_agent.generate_summary(
+        # Step 9: Generate summary, forwarding tokens as Groq produces them
+        summary_parts = []
+        for delta in summary_agent.stream_summary(
             contract=contract_doc,
             policies=policy_docs,
             risk_assessments=risk_assessments
-        )
+        ):
+            summary_parts.append(delta)
+            yield "summary_token", {"text": delta}
+        summary = "".join(summary_parts).strip()
+        yield "summary", {"summary": summary}
         
-        return ContractAnalysis(
+        yield "complete", ContractAnalysis(
             contract_id=document_id,
             metadata=contract_metadata,
             clauses=clauses,
@@ -361,25 +515,71 @@ def process_contract(file_path: str, document_type: DocumentType) -> ContractAna
             detail=f"Error processing contract: {str(e)}"
         )
 
-@router.get("/{contract_id}/clauses")
-async def get_contract_clauses(contract_id: str):
-    """Get clauses from a contract."""
+def stream_contract_events(
+    file_path: str,
+    document_type: DocumentType,
+    metadata: Optional[Dict[str, Any]] = None,
+    force: bool = False,
+    previous_version_id: Optional[str] = None
+) -> Iterator[str]:
+    """Format pipeline events as Server-Sent Events.
+    
+    Args:
+        file_path: Path to the contract file
+        document_type: Type of document
+        metadata: Optional metadata for the document
+        force: Re-ingest even if identical content was ingested before
+        previous_version_id: ID of the contract this is a new version of
+        
+    Yields:
+        SSE-formatted messages
+    """
     try:
-        # Get contract from vector store
-        contract_chunks = doc_ingest_agent.get_document_by_id(contract_id)
+        for event, payload in iter_contract_pipeline(file_path, document_type, metadata, force, previous_version_id):
+            yield _format_sse(event, payload)
+    except HTTPException as e:
+        yield _format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+    except Exception as e:
+        logger.error(f"Error streaming contract analysis: {str(e)}")
+        yield _format_sse("error", {"status_code": 500, "detail": str(e)})
+
+def _format_sse(event: str, payload: Any) -> str:
+    """Serialize a single Server-Sent Event.
+    
+    Args:
+        event: Event name
+        payload: JSON-serializable payload (Pydantic models are supported)
         
-        if not contract_chunks:
+    Returns:
+        SSE message text
+    """
+    data = json.dumps(jsonable_encoder(payload))
+    return f"event: {event}\ndata: {data}\n\n"
+
+@router.get("/{contract_id}/versions")
+async def get_contract_versions(contract_id: str):
+    """Get every version of a contract, first to latest."""
+    try:
+        versions = doc_ingest_agent.get_versions(contract_id)
+        if not versions:
             raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
         
-        # Ensure contract_chunks is a list
-        if not isinstance(contract_chunks, list):
-            contract_chunks = [contract_chunks]
-            
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_chunks if hasattr(chunk, 'page_content')])
-        
+        return {"contract_id": contract_id, "versions": versions}
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving contract versions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving contract versions: {str(e)}")
+
+@router.get("/{contract_id}/clauses")
+async def get_contract_clauses(contract_id: str):
+    """Get clauses from a contract."""
+    try:
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
         if not document_text:
-            raise HTTPException(status_code=500, detail="Invalid document format returned from storage")
+            raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
             
         # Extract clauses
         clauses = clause_extraction_agent.extract_clauses(document_text)
@@ -396,14 +596,10 @@ async def get_contract_clauses(contract_id: str):
 async def check_contract_policies(contract_id: str):
     """Check contract against policies."""
     try:
-        # Get contract from vector store
-        contract_chunks = doc_ingest_agent.get_document_by_id(contract_id)
-        
-        if not contract_chunks:
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
+        if not document_text:
             raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
-        
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_chunks])
         contract_doc = Document(
             page_content=document_text,
             metadata={"contract_id": contract_id}
@@ -427,13 +623,10 @@ async def check_contract_policies(contract_id: str):
 async def get_contract_risks(contract_id: str):
     """Get risk assessment for a contract."""
     try:
-        # Get contract from vector store
-        contract_chunks = doc_ingest_agent.get_document_by_id(contract_id)
-        if not contract_chunks:
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
+        if not document_text:
             raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
-        
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_chunks])
         contract_doc = Document(
             page_content=document_text,
             metadata={"document_id": contract_id}
@@ -452,7 +645,7 @@ async def get_contract_risks(contract_id: str):
         risk_assessments = []
         for clause in clauses:
             # Get relevant policies
-            policy_references = policy_check_agent.check_clause_against_policies(clause)
+            policy_references = policy_check_agent.check_clause_against_policies(clause, contract_id)
             
             # Assess risk
             risk_assessment = risk_assessment_agent.assess_clause_risk(
@@ -486,14 +679,10 @@ async def get_contract_risks(contract_id: str):
 async def suggest_amendments(contract_id: str):
     """Suggest amendments for a contract."""
     try:
-        # Get contract from vector store
-        contract_chunks = doc_ingest_agent.get_document_by_id(contract_id)
-        
-        if not contract_chunks:
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
+        if not document_text:
             raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
-        
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_chunks])
         contract_doc = Document(
             page_content=document_text,
             metadata={"contract_id": contract_id}
@@ -506,7 +695,7 @@ async def suggest_amendments(contract_id: str):
         risk_assessments = []
         for clause in clauses:
             # Get relevant policies
-            policy_references = policy_check_agent.check_clause_against_policies(clause)
+            policy_references = policy_check_agent.check_clause_against_policies(clause, contract_id)
             
             # Assess risk
             risk_assessment = risk_assessment_agent.assess_clause_risk(
@@ -538,14 +727,10 @@ async def suggest_amendments(contract_id: str):
 async def get_contract_summary(contract_id: str):
     """Get a summary of the contract analysis."""
     try:
-        # Get contract from vector store
-        contract_chunks = doc_ingest_agent.get_document_by_id(contract_id)
-        
-        if not contract_chunks:
+        # Get the document text stored at ingest
+        document_text = doc_ingest_agent.get_document_text(contract_id)
+        if not document_text:
             raise HTTPException(status_code=404, detail=f"Contract with ID {contract_id} not found")
-        
-        # Combine chunks into full document
-        document_text = "\n\n".join([chunk.page_content for chunk in contract_chunks])
         contract_doc = Document(
             page_content=document_text,
             metadata={"contract_id": contract_id}
@@ -556,7 +741,7 @@ async def get_contract_summary(contract_id: str):
         clauses = clause_extraction_agent.extract_clauses(document_text)
         for clause in clauses:
             # Get relevant policies
-            policy_references = policy_check_agent.check_clause_against_policies(clause)
+            policy_references = policy_check_agent.check_clause_against_policies(clause, contract_id)
             
             # Assess risk
             risk_assessment = risk_assessment_agent.assess_clause_risk(
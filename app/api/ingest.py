@@ -0,0 +1,79 @@
+import shutil
+import tempfile
+from fastapi import APIRouter, BackgroundTasks, File, UploadFile, HTTPException, Form
+from fastapi.concurrency import run_in_threadpool
+from pathlib import Path
+import logging
+
+from app.core.config import settings
+from app.core.extraction import collect_document_files, resolve_ingest_path
+from app.core.storage import save_upload, UploadTooLargeError
+from app.schemas.documents import BatchIngestReport, BatchIngestRequest, DocumentType
+from app.agents.doc_ingest_agent import DocIngestAgent
+from app.api.policies import schedule_reanalysis
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Initialize agents
+doc_ingest_agent = DocIngestAgent()
+
+@router.post("/batch", response_model=BatchIngestReport)
+def ingest_batch(request: BatchIngestRequest, background_tasks: BackgroundTasks):
+    """Ingest every supported document under a directory or archive in the ingest root."""
+    try:
+        source = resolve_ingest_path(request.path)
+        with tempfile.TemporaryDirectory(dir=settings.TEMP_DIR) as workdir:
+            file_paths = collect_document_files(source, Path(workdir))
+            report = doc_ingest_agent.ingest_batch(
+                file_paths,
+                document_type=request.document_type,
+                force=request.force
+            )
+        if request.document_type == DocumentType.POLICY and report.ingested:
+            schedule_reanalysis(background_tasks)
+        return report
+    
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in batch ingestion: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error in batch ingestion: {str(e)}")
+
+@router.post("/archive", response_model=BatchIngestReport)
+async def ingest_archive(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    document_type: DocumentType = Form(DocumentType.CONTRACT),
+    force: bool = Form(False)
+):
+    """Upload a .zip or .tar(.gz) archive and ingest every document inside it."""
+    workdir = Path(tempfile.mkdtemp(dir=settings.TEMP_DIR))
+    try:
+        archive_path, _, _ = await save_upload(
+            file,
+            workdir,
+            max_bytes=settings.MAX_ARCHIVE_SIZE_MB * 1024 * 1024
+        )
+        file_paths = collect_document_files(archive_path, workdir / "extracted")
+        report = await run_in_threadpool(
+            doc_ingest_agent.ingest_batch,
+            file_paths,
+            document_type=document_type,
+            force=force
+        )
+        if document_type == DocumentType.POLICY and report.ingested:
+            schedule_reanalysis(background_tasks)
+        return report
+    
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error ingesting archive: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error ingesting archive: {str(e)}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
\ No newline at end of file
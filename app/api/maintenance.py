@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+import logging
+
+from app.agents.doc_ingest_agent import DocIngestAgent
+from app.database.maintenance import VectorStoreMaintenance
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Initialize agents
+doc_ingest_agent = DocIngestAgent()
+maintenance = VectorStoreMaintenance(
+    {
+        "contracts": doc_ingest_agent.contract_store,
+        "policies": doc_ingest_agent.policy_store,
+    },
+    doc_ingest_agent.catalog,
+    doc_ingest_agent.text_store
+)
+
+@router.get("/stats")
+def get_vector_store_stats():
+    """Get chunk counts, disk usage and search latency per collection."""
+    try:
+        return {name: store.stats() for name, store in maintenance.stores.items()}
+    except Exception as e:
+        logger.error(f"Error collecting vector store stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error collecting vector store stats: {str(e)}")
+
+@router.post("/gc")
+def collect_garbage(collection: Optional[str] = None):
+    """Delete chunks of documents that are no longer catalogued."""
+    try:
+        return maintenance.collect_garbage(collection)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in vector store GC: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error in vector store GC: {str(e)}")
+
+@router.post("/compact")
+def compact(collection: Optional[str] = None):
+    """Vacuum the collections' keyword indexes, reporting before/after stats."""
+    try:
+        return maintenance.compact(collection)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error compacting vector store: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error compacting vector store: {str(e)}")
\ No newline at end of file
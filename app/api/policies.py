@@ -1,52 +1,66 @@
 import os
 import shutil
 import uuid
-from fastapi import APIRouter, File, UploadFile, HTTPException, Form
+from fastapi import APIRouter, BackgroundTasks, File, UploadFile, HTTPException, Form
 from typing import List
 from pathlib import Path
 import logging
 
 from app.core.config import settings
+from app.core.storage import save_upload, UploadTooLargeError
 from app.schemas.documents import UploadResponse, DocumentType
 from app.agents.doc_ingest_agent import DocIngestAgent
+from app.agents.policy_check_agent import PolicyCheckAgent
+from app.agents.risk_assessment_agent import RiskAssessmentAgent
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Initialize agents
 doc_ingest_agent = DocIngestAgent()
+policy_check_agent = PolicyCheckAgent()
+risk_assessment_agent = RiskAssessmentAgent()
+
+def schedule_reanalysis(background_tasks: BackgroundTasks):
+    """Re-analyze clauses affected by a policy change after the response is sent."""
+    if settings.POLICY_REANALYSIS_ON_CHANGE:
+        background_tasks.add_task(policy_check_agent.update_after_policy_change, risk_assessment_agent)
 
 @router.post("/upload", response_model=UploadResponse)
 async def upload_policy(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    force: bool = Form(False)
 ):
-    """Upload a policy document."""
+    """Upload a policy document.
+    
+    Re-uploading identical content returns the existing document ID unless
+    ``force`` is set. Clauses whose retrieved policies change are
+    re-analyzed in the background.
+    """
     try:
-        # Generate unique file ID
-        file_id = str(uuid.uuid4())
-        file_ext = Path(file.filename).suffix
-        
-        # Create file path
-        file_path = settings.POLICIES_DIR / f"{file_id}{file_ext}"
-        
-        # Save file
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        # Stream file to a content-addressed path
+        file_path, size, _ = await save_upload(file, settings.POLICIES_DIR)
         
         # Process the policy document
         document_id, _ = doc_ingest_agent.ingest_document(
             file_path=str(file_path),
-            document_type=DocumentType.POLICY
+            document_type=DocumentType.POLICY,
+            metadata={"filename": file.filename},
+            force=force
         )
+        schedule_reanalysis(background_tasks)
         
         return UploadResponse(
             file_id=document_id,
             filename=file.filename,
             content_type=file.content_type,
-            size=os.path.getsize(file_path),
+            size=size,
             message="Policy document uploaded and processed successfully"
         )
     
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         logger.error(f"Error uploading policy document: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error uploading policy document: {str(e)}")
@@ -55,11 +69,28 @@ async def upload_policy(
 async def list_policies():
     """List all policy documents."""
     try:
-        # List all policy files
+        policies = []
+        catalogued_files = set()
+        
+        # List catalogued policies by document ID
+        for record in doc_ingest_agent.catalog.list_documents("policies"):
+            file_path = Path(record["file_path"])
+            if not file_path.exists():
+                continue
+            catalogued_files.add(file_path.resolve())
+            policies.append({
+                "file_id": record["document_id"],
+                "filename": record["filename"],
+                "size": os.path.getsize(file_path),
+                "upload_date": record["created_at"]
+            })
+        
+        # List policy files that predate the catalog
         policy_files = list(settings.POLICIES_DIR.glob("*.*"))
         
-        policies = []
         for file_path in policy_files:
+            if file_path.resolve() in catalogued_files:
+                continue
             policies.append({
                 "file_id": file_path.stem,
                 "filename": file_path.name,
@@ -73,12 +104,34 @@ async def list_policies():
         logger.error(f"Error listing policy documents: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error listing policy documents: {str(e)}")
 
+@router.get("/dependencies")
+async def get_policy_dependencies():
+    """Get the policy corpus version and how many analyzed clauses await re-analysis."""
+    try:
+        return doc_ingest_agent.policy_dependencies.stats()
+    
+    except Exception as e:
+        logger.error(f"Error retrieving policy dependencies: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving policy dependencies: {str(e)}")
+
+@router.post("/reanalyze")
+def reanalyze_affected_clauses():
+    """Re-analyze the clauses whose retrieved policies changed, now."""
+    result = policy_check_agent.update_after_policy_change(risk_assessment_agent)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=f"Error re-analyzing clauses: {result['error']}")
+    return result
+
 @router.delete("/{policy_id}")
-async def delete_policy(policy_id: str):
+async def delete_policy(policy_id: str, background_tasks: BackgroundTasks):
     """Delete a policy document."""
     try:
         # Find the policy file
-        policy_files = list(settings.POLICIES_DIR.glob(f"{policy_id}.*"))
+        record = doc_ingest_agent.catalog.get(policy_id)
+        if record and os.path.exists(record["file_path"]):
+            policy_files = [Path(record["file_path"])]
+        else:
+            policy_files = list(settings.POLICIES_DIR.glob(f"{policy_id}.*"))
         
         if not policy_files:
             raise HTTPException(status_code=404, detail=f"Policy document with ID {policy_id} not found")
@@ -86,8 +139,15 @@ async def delete_policy(policy_id: str):
         # Delete the file
         for file_path in policy_files:
             os.remove(file_path)
+        doc_ingest_agent.catalog.remove(policy_id)
         
-        # TODO: Delete from vector store
+        # Delete the policy's chunks and text
+        doc_ingest_agent.policy_store.delete_document(policy_id)
+        doc_ingest_agent.text_store.delete(policy_id)
+        if doc_ingest_agent.policy_index is not None:
+            doc_ingest_agent.policy_index.delete_document(policy_id)
+        doc_ingest_agent.policy_dependencies.bump_corpus_version()
+        schedule_reanalysis(background_tasks)
         
         return {"status": "success", "message": f"Policy document {policy_id} deleted successfully"}
     
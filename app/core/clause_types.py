@@ -0,0 +1,49 @@
+from typing import List, Optional, Tuple
+
+from app.schemas.documents import ClauseType
+
+# Keyword stems per clause type, in the order they are tried
+CLAUSE_KEYWORDS: List[Tuple[ClauseType, List[str]]] = [
+    (ClauseType.TERMINATION, ["terminat", "cancel", "end of agreement"]),
+    (ClauseType.JURISDICTION, ["jurisdict", "venue", "forum", "court"]),
+    (ClauseType.PAYMENT_TERMS, ["payment", "fee", "compensat", "invoice"]),
+    (ClauseType.CONFIDENTIALITY, ["confidential", "disclos", "secret"]),
+    (ClauseType.INTELLECTUAL_PROPERTY, ["intellectual", "patent", "copyright", "trademark"]),
+    (ClauseType.LIABILITY, ["liab", "warrant", "disclaimer"]),
+    (ClauseType.INDEMNIFICATION, ["indemnif", "hold harmless"]),
+    (ClauseType.FORCE_MAJEURE, ["force majeure", "act of god", "unforeseen"]),
+    (ClauseType.ASSIGNMENT, ["assign", "transfer", "delegat"]),
+    (ClauseType.GOVERNING_LAW, ["govern", "applicable law", "choice of law"]),
+]
+
+def determine_clause_type(text: str) -> Optional[ClauseType]:
+    """Determine clause type based on text content.
+    
+    Args:
+        text: Clause text
+    
+    Returns:
+        The first clause type with a keyword in the text, or None
+    """
+    text_lower = text.lower()
+    for clause_type, keywords in CLAUSE_KEYWORDS:
+        if any(keyword in text_lower for keyword in keywords):
+            return clause_type
+    return None
+
+def rank_clause_types(text: str) -> List[Tuple[ClauseType, int]]:
+    """Count keyword occurrences of every clause type in a text.
+    
+    Args:
+        text: Text to classify
+    
+    Returns:
+        Clause types found with their keyword counts, most frequent first
+    """
+    text_lower = text.lower()
+    counts = []
+    for clause_type, keywords in CLAUSE_KEYWORDS:
+        count = sum(text_lower.count(keyword) for keyword in keywords)
+        if count:
+            counts.append((clause_type, count))
+    return sorted(counts, key=lambda item: item[1], reverse=True)
\ No newline at end of file
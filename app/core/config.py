@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import logging
@@ -18,12 +19,14 @@ CONTRACTS_DIR = BASE_DIR / "data" / "contracts"
 POLICIES_DIR = BASE_DIR / "data" / "policies"
 EMBEDDINGS_DIR = BASE_DIR / "data" / "embeddings"
 UPLOADS_DIR = BASE_DIR / "public" / "uploads"
+TEMP_DIR = BASE_DIR / "data" / "tmp"
 
 # Ensure directories exist
 CONTRACTS_DIR.mkdir(parents=True, exist_ok=True)
 POLICIES_DIR.mkdir(parents=True, exist_ok=True)
 EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
 class Settings(BaseSettings):
     """Application settings."""
@@ -39,23 +42,145 @@ class Settings(BaseSettings):
     DEFAULT_MODEL: str = "llama3-70b-8192"
     LLM_MODEL: str = "llama3-70b-8192"
     
+    # Model per task, falling back to LLM_MODEL: a small model for mechanical
+    # extraction and triage, the large one for judgment. Answers from a
+    # model other than LLM_ESCALATION_MODEL that fail to parse, or that the
+    # task treats as low confidence, are asked again of the escalation model.
+    LLM_TASK_MODELS: Dict[str, str] = {
+        "clause_refinement": "llama3-8b-8192",
+        "risk_assessment": "llama3-70b-8192",
+        "amendment": "llama3-70b-8192",
+        "summary": "llama3-70b-8192",
+        "policy_check": "llama3-70b-8192"
+    }
+    LLM_ESCALATION_MODEL: str = "llama3-70b-8192"
+    LLM_ESCALATION_MIN_GROUNDING: float = 0.8  # refined clause words found in the source
+    
+    # Client-side limits shared by every call to a model. Set the quotas to
+    # the account's Groq limits (0 disables a quota), per model in
+    # LLM_MODEL_QUOTAS as (requests, tokens) per minute; concurrency adapts
+    # between the bounds on 429s and responses slower than the target.
+    LLM_REQUESTS_PER_MINUTE: int = 0
+    LLM_TOKENS_PER_MINUTE: int = 0
+    LLM_MODEL_QUOTAS: Dict[str, Tuple[int, int]] = {}
+    LLM_MAX_REQUEST_TOKENS: int = 8192  # token burst allowance, so one full-context call never runs into debt
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_MIN_CONCURRENCY: int = 1
+    LLM_LATENCY_TARGET_SECONDS: float = 30.0
+    
+    # Retries of timeouts, 429s, 5xx and connection errors with jittered
+    # exponential backoff, within a per-call deadline
+    LLM_MAX_RETRIES: int = 5
+    LLM_RETRY_BASE_DELAY: float = 1.0
+    LLM_RETRY_MAX_DELAY: float = 30.0
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    LLM_CALL_DEADLINE_SECONDS: float = 180.0
+    
+    # Hedged requests: send a duplicate when a call outlasts this latency quantile
+    LLM_HEDGE_REQUESTS: bool = False
+    LLM_HEDGE_QUANTILE: float = 0.95
+    
+    # Concurrent identical LLM requests share one upstream call
+    LLM_SINGLE_FLIGHT: bool = True
+    
     # Document processing settings
     MAX_TOKEN_LIMIT: int = 8192
+    CHUNKER: str = "section"  # section (split on numbered sections and pages) or recursive
     CHUNK_SIZE: int = 2000
-    CHUNK_OVERLAP: int = 400
+    CHUNK_OVERLAP: int = 400  # section chunker: only between windows of an over-long paragraph
+    
+    # PDF extraction: documents with at least this many pages are extracted
+    # by a process pool of PDF_EXTRACT_WORKERS workers
+    PDF_PARALLEL_MIN_PAGES: int = 64
+    PDF_EXTRACT_WORKERS: int = min(8, os.cpu_count() or 1)
+    
+    # Batch ingestion: chunks buffered per vector store write
+    INGEST_BATCH_SIZE: int = 512
     
     # Vector database settings
     VECTOR_STORE_DIR: str = "vector_store"
-    VECTOR_DB_TYPE: str = "chroma"
+    VECTOR_DB_TYPE: str = "chroma"  # chroma, numpy or pinecone
+    NUMPY_INDEX_DTYPE: str = "float32"  # float32, float16 or pq (product quantized)
+    NUMPY_PQ_SUBSPACES: int = 96  # bytes per vector in the quantized scan
+    NUMPY_PQ_RERANK_K: int = 100  # candidates re-scored from the full vectors
+    NUMPY_PQ_MIN_TRAIN_ROWS: int = 1024
+    
+    # Pinecone-compatible remote index (VECTOR_DB_TYPE=pinecone)
+    PINECONE_API_KEY: Optional[str] = None
+    PINECONE_INDEX_HOST: str = ""  # e.g. https://contracts-abc123.svc.pinecone.io
+    PINECONE_API_VERSION: str = "2024-07"
+    PINECONE_NAMESPACE_PREFIX: str = ""
+    PINECONE_UPSERT_BATCH_SIZE: int = 100
+    PINECONE_TIMEOUT: float = 30.0
+    
+    # Hybrid retrieval (BM25 + vectors, reciprocal rank fusion)
+    HYBRID_SEARCH_ENABLED: bool = True
+    HYBRID_FETCH_K: int = 20
+    RRF_K: int = 60
+    POLICY_RETRIEVAL_K: int = 3
+    
+    # Clause type -> policy chunk index built at policy ingest; typed clauses
+    # use it instead of a vector search
+    POLICY_TOPIC_INDEX_ENABLED: bool = True
+    POLICY_TOPIC_INDEX_PATH: Path = BASE_DIR / "data" / "policy_topics.sqlite3"
+    POLICY_TOPIC_MAX_CHUNKS: int = 6
+    POLICY_TOPIC_MIN_KEYWORD_HITS: int = 2
+    
+    # Contract collection sharding (searches fan out to shards in parallel)
+    CONTRACT_SHARD_BY: str = ""  # document_type or month; empty disables sharding
+    SHARD_SEARCH_WORKERS: int = 8
+    
+    # Vector store maintenance
+    VECTOR_GC_INTERVAL_SECONDS: int = 3600  # 0 disables the background collector
+    VECTOR_GC_GRACE_SECONDS: int = 600
+    
+    # Document catalog (content hash -> ingested document)
+    CATALOG_PATH: Path = BASE_DIR / "data" / "catalog.sqlite3"
+    
+    # Canonical extracted text per document (gzip-compressed)
+    TEXT_STORE_DIR: Path = BASE_DIR / "data" / "texts"
+    TEXT_STORE_COMPRESSION_LEVEL: int = 6
+    
+    # Per-clause analysis results keyed by clause text, model and policies,
+    # so contract versions only re-analyze the clauses that changed
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_PATH: Path = BASE_DIR / "data" / "analysis_cache.sqlite3"
+    ANALYSIS_CACHE_MAX_ROWS: int = 200000  # oldest results are dropped beyond this; 0 for no cap
+    ANALYSIS_CACHE_TTL_DAYS: float = 90  # 0 keeps results until evicted by the row cap
+    
+    # Policy chunks retrieved for each analyzed clause; a policy change only
+    # re-analyzes clauses whose retrieved set changes
+    POLICY_DEPENDENCY_PATH: Path = BASE_DIR / "data" / "policy_dependencies.sqlite3"
+    POLICY_REANALYSIS_ON_CHANGE: bool = True
     
     # Embeddings settings
     EMBEDDING_MODEL: str = "sentence-transformers/all-mpnet-base-v2"
+    EMBEDDING_DEVICE: str = "cpu"
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_NORMALIZE: bool = False
+    EMBEDDING_NUM_THREADS: int = 0  # 0 keeps the torch default
+    EMBEDDING_TOKENIZER_PARALLELISM: bool = True
+    VECTOR_WRITE_BATCH_SIZE: int = 4096
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: Path = EMBEDDINGS_DIR / "embedding_cache.sqlite3"
+    QUERY_EMBEDDING_CACHE_SIZE: int = 2048
     
     # Paths
     CONTRACTS_DIR: Path = CONTRACTS_DIR
     POLICIES_DIR: Path = POLICIES_DIR
     EMBEDDINGS_DIR: Path = EMBEDDINGS_DIR
     UPLOADS_DIR: Path = UPLOADS_DIR
+    TEMP_DIR: Path = TEMP_DIR
+    
+    # Upload settings
+    MAX_UPLOAD_SIZE_MB: int = 50
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MAX_ARCHIVE_SIZE_MB: int = 2048
+    MAX_ARCHIVE_UNPACKED_MB: int = 8192  # decompressed total, checked before unpacking
+    MAX_ARCHIVE_MEMBERS: int = 100000
+    
+    # Server-side paths accepted by /api/ingest/batch must resolve inside this directory
+    INGEST_ROOT: Path = BASE_DIR / "data" / "ingest"
     
     # Clause types to extract
     CLAUSE_TYPES: list = [
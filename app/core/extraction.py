@@ -0,0 +1,537 @@
+import re
+import logging
+import tarfile
+import zipfile
+import threading
+import multiprocessing
+import xml.etree.ElementTree as ET
+import fitz  # PyMuPDF
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from pypdf import PdfReader
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared worker pool for page extraction. Workers are spawned rather than
+# forked so they don't inherit the API process's model threads.
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+# File types that extract_text_and_metadata can handle
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt", ".md"}
+
+# Files unpacked as archives; the last suffix alone covers uploads stored as <sha256>.gz
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tgz", ".gz", ".tbz2", ".bz2", ".txz", ".xz")
+
+# WordprocessingML and Dublin Core (document properties) namespaces
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+# Stands in for a page break within a paragraph's text until it is split
+_PAGE_BREAK = "\f"
+
+_ROMAN_NUMERALS = [
+    (1000, "m"), (900, "cm"), (500, "d"), (400, "cd"), (100, "c"), (90, "xc"),
+    (50, "l"), (40, "xl"), (10, "x"), (9, "ix"), (5, "v"), (4, "iv"), (1, "i")
+]
+
+def extract_text_and_metadata(
+    file_path: str,
+    parallel: Optional[bool] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """Extract text and metadata from a document.
+    
+    Args:
+        file_path: Path to the document file
+        parallel: Passed to extract_from_pdf for PDF files
+    
+    Returns:
+        Extracted text and metadata
+    """
+    file_ext = Path(file_path).suffix.lower()
+    
+    if file_ext == ".pdf":
+        return extract_from_pdf(file_path, parallel=parallel)
+    elif file_ext == ".docx":
+        return extract_from_docx(file_path)
+    elif file_ext == ".doc":
+        raise ValueError("Legacy .doc files are not supported; save the document as .docx")
+    elif file_ext in [".txt", ".md"]:
+        return extract_from_text(file_path)
+    else:
+        raise ValueError(f"Unsupported file format: {file_ext}")
+
+def extract_from_pdf(file_path: str, parallel: Optional[bool] = None) -> Tuple[str, Dict[str, Any]]:
+    """Extract text and metadata from a PDF file.
+    
+    Documents with at least PDF_PARALLEL_MIN_PAGES pages are split into
+    page ranges that are extracted by a process pool, each worker opening
+    the file independently. Smaller documents use the serial path, where
+    pool overhead would outweigh the gain.
+    
+    Args:
+        file_path: Path to the PDF file
+        parallel: Force (True) or disable (False) parallel extraction;
+            decided by page count when None
+    
+    Returns:
+        Extracted text and metadata
+    """
+    metadata = {}
+    pages = []
+    
+    try:
+        # Extract with PyMuPDF (fitz)
+        with fitz.open(file_path) as doc:
+            page_count = len(doc)
+            metadata = {
+                "page_count": page_count,
+                "title": doc.metadata.get("title", ""),
+                "author": doc.metadata.get("author", ""),
+                "subject": doc.metadata.get("subject", ""),
+                "keywords": doc.metadata.get("keywords", ""),
+                "creator": doc.metadata.get("creator", ""),
+                "producer": doc.metadata.get("producer", ""),
+            }
+            
+            if parallel is None:
+                parallel = (
+                    settings.PDF_EXTRACT_WORKERS > 1
+                    and page_count >= settings.PDF_PARALLEL_MIN_PAGES
+                )
+            
+            if not parallel:
+                # Extract text from each page
+                for page_num, page in enumerate(doc):
+                    pages.append(_format_page(page_num, page.get_text()))
+        
+        if parallel:
+            pages = _extract_pages_parallel(file_path, page_count)
+    
+    except Exception as e:
+        logger.error(f"Error extracting with PyMuPDF: {str(e)}")
+        pages = []
+        
+        # Fallback to pypdf
+        try:
+            with open(file_path, "rb") as f:
+                reader = PdfReader(f)
+                metadata = {
+                    "page_count": len(reader.pages),
+                }
+                
+                if reader.metadata:
+                    metadata.update({
+                        "title": reader.metadata.get("/Title", ""),
+                        "author": reader.metadata.get("/Author", ""),
+                        "subject": reader.metadata.get("/Subject", ""),
+                        "keywords": reader.metadata.get("/Keywords", ""),
+                        "creator": reader.metadata.get("/Creator", ""),
+                        "producer": reader.metadata.get("/Producer", ""),
+                    })
+                
+                # Extract text from each page
+                for page_num, page in enumerate(reader.pages):
+                    pages.append(_format_page(page_num, page.extract_text()))
+        
+        except Exception as e2:
+            logger.error(f"Error extracting with pypdf: {str(e2)}")
+            raise ValueError(f"Could not extract text from PDF: {str(e2)}")
+    
+    return "".join(pages), metadata
+
+def extract_from_text(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """Extract text from a plain text file.
+    
+    Args:
+        file_path: Path to the text file
+    
+    Returns:
+        Extracted text and metadata
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        
+        metadata = {
+            "line_count": text.count("\n") + 1,
+            "char_count": len(text),
+        }
+        
+        return text, metadata
+    
+    except Exception as e:
+        logger.error(f"Error extracting from text file: {str(e)}")
+        raise ValueError(f"Could not extract text from file: {str(e)}")
+
+def extract_from_docx(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """Extract text and metadata from a Word (.docx) file.
+    
+    ``word/document.xml`` is streamed from the archive with an incremental
+    parser and each paragraph is discarded once its text is taken, so
+    memory stays flat however long the document is. List numbering
+    ("1.", "2.1", "(a)") is rendered from ``word/numbering.xml`` so clause
+    headings survive. Word stores no page layout, so page markers are
+    placed at explicit page breaks, section breaks and the page breaks
+    Word recorded when the file was last saved.
+    
+    Args:
+        file_path: Path to the DOCX file
+    
+    Returns:
+        Extracted text and metadata
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            numbering = _DocxNumbering(archive) if "word/numbering.xml" in names else None
+            styles = _docx_styles(archive) if "word/styles.xml" in names else {}
+            metadata = _docx_properties(archive) if "docProps/core.xml" in names else {}
+            with archive.open("word/document.xml") as document:
+                pages, paragraph_count, heading_count = _docx_pages(document, numbering, styles)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        logger.error(f"Error extracting from DOCX: {str(e)}")
+        raise ValueError(f"Could not extract text from DOCX: {str(e)}")
+    
+    metadata.update({
+        "page_count": len(pages),
+        "paragraph_count": paragraph_count,
+        "heading_count": heading_count,
+    })
+    return "".join(_format_page(page_num, text) for page_num, text in enumerate(pages)), metadata
+
+def _docx_pages(
+    document,
+    numbering: Optional["_DocxNumbering"],
+    styles: Dict[str, Dict[str, Any]]
+) -> Tuple[List[str], int, int]:
+    """Stream paragraphs out of document.xml, grouped into pages."""
+    pages: List[List[str]] = [[]]
+    parts: List[str] = []
+    paragraph_count = 0
+    heading_count = 0
+    break_after = False
+    body = None
+    depth = 0
+    
+    def new_page():
+        # Never leave an empty page behind
+        if pages[-1]:
+            pages.append([])
+    
+    for event, elem in ET.iterparse(document, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            depth += 1
+            if tag == _W + "body":
+                body = elem
+            elif tag == _W + "lastRenderedPageBreak":
+                parts.append(_PAGE_BREAK)
+            continue
+        
+        depth -= 1
+        if tag == _W + "t":
+            parts.append(elem.text or "")
+        elif tag == _W + "tab":
+            parts.append("\t")
+        elif tag in (_W + "br", _W + "cr"):
+            if elem.get(_W + "type") == "page":
+                parts.append(_PAGE_BREAK)
+            else:
+                parts.append("\n")
+        elif tag == _W + "pPr":
+            # Paragraph properties come first: render the numbering label
+            style_id = _docx_val(elem.find(_W + "pStyle"))
+            style = styles.get(style_id, {})
+            if style.get("heading"):
+                heading_count += 1
+            
+            num_pr = elem.find(_W + "numPr")
+            num_id = _docx_val(num_pr.find(_W + "numId")) if num_pr is not None else None
+            level = _docx_val(num_pr.find(_W + "ilvl")) if num_pr is not None else None
+            num_id = num_id or style.get("num_id")
+            if numbering is not None and num_id and num_id != "0":
+                if level is None:
+                    level = numbering.style_levels.get(style_id, style.get("level", "0"))
+                label = numbering.label(num_id, int(level))
+                if label:
+                    parts.append(label + " ")
+            
+            sect_pr = elem.find(_W + "sectPr")
+            if sect_pr is not None:
+                break_after = _docx_val(sect_pr.find(_W + "type")) != "continuous"
+        elif tag == _W + "p":
+            # A page break inside the paragraph splits it across pages
+            segments = [segment.strip() for segment in "".join(parts).split(_PAGE_BREAK)]
+            parts.clear()
+            for index, segment in enumerate(segments):
+                if index:
+                    new_page()
+                if segment:
+                    pages[-1].append(segment)
+            if any(segments):
+                paragraph_count += 1
+            if break_after:
+                new_page()
+                break_after = False
+        
+        # Drop finished top-level blocks so the tree never grows
+        if depth == 2 and body is not None:
+            body.clear()
+    
+    if not pages[-1] and len(pages) > 1:
+        pages.pop()
+    return ["\n\n".join(paragraphs) for paragraphs in pages], paragraph_count, heading_count
+
+def _docx_val(elem) -> Optional[str]:
+    """The w:val attribute of an element, if present."""
+    return elem.get(_W + "val") if elem is not None else None
+
+def _docx_styles(archive: zipfile.ZipFile) -> Dict[str, Dict[str, Any]]:
+    """Heading flags and list numbering of paragraph styles."""
+    styles = {}
+    with archive.open("word/styles.xml") as f:
+        for style in ET.parse(f).getroot().iter(_W + "style"):
+            name = (_docx_val(style.find(_W + "name")) or "").lower()
+            info: Dict[str, Any] = {"heading": name.startswith("heading") or name == "title"}
+            num_pr = style.find(f"{_W}pPr/{_W}numPr")
+            if num_pr is not None:
+                info["num_id"] = _docx_val(num_pr.find(_W + "numId"))
+                info["level"] = _docx_val(num_pr.find(_W + "ilvl")) or "0"
+            styles[style.get(_W + "styleId")] = info
+    return styles
+
+def _docx_properties(archive: zipfile.ZipFile) -> Dict[str, Any]:
+    """Title and author from the document properties."""
+    with archive.open("docProps/core.xml") as f:
+        root = ET.parse(f).getroot()
+    metadata = {}
+    for key, tag in (("title", _DC + "title"), ("author", _DC + "creator")):
+        value = (root.findtext(tag) or "").strip()
+        if value:
+            metadata[key] = value
+    return metadata
+
+class _DocxNumbering:
+    """Renders list numbering labels in document order."""
+    
+    def __init__(self, archive: zipfile.ZipFile):
+        with archive.open("word/numbering.xml") as f:
+            root = ET.parse(f).getroot()
+        
+        # abstractNumId -> level -> (format, label template, start)
+        self.abstract: Dict[str, Dict[int, Tuple[str, str, int]]] = {}
+        self.style_levels: Dict[str, str] = {}
+        for abstract in root.iter(_W + "abstractNum"):
+            levels = {}
+            for lvl in abstract.iter(_W + "lvl"):
+                ilvl = int(lvl.get(_W + "ilvl", "0"))
+                levels[ilvl] = (
+                    _docx_val(lvl.find(_W + "numFmt")) or "decimal",
+                    _docx_val(lvl.find(_W + "lvlText")) or "",
+                    int(_docx_val(lvl.find(_W + "start")) or 1)
+                )
+                style_id = _docx_val(lvl.find(_W + "pStyle"))
+                if style_id:
+                    self.style_levels[style_id] = str(ilvl)
+            self.abstract[abstract.get(_W + "abstractNumId")] = levels
+        
+        # numId -> (abstractNumId, restarts); lists sharing an abstract
+        # definition continue each other's numbering unless overridden
+        self.nums: Dict[str, Tuple[str, bool]] = {}
+        for num in root.iter(_W + "num"):
+            restarts = num.find(f"{_W}lvlOverride/{_W}startOverride") is not None
+            self.nums[num.get(_W + "numId")] = (_docx_val(num.find(_W + "abstractNumId")), restarts)
+        
+        self.counters: Dict[str, Dict[int, int]] = {}
+    
+    def label(self, num_id: str, level: int) -> str:
+        """Advance the counter for a list level and render its label."""
+        abstract_id, restarts = self.nums.get(num_id, (None, False))
+        levels = self.abstract.get(abstract_id)
+        if not levels or level not in levels:
+            return ""
+        
+        counters = self.counters.setdefault(num_id if restarts else abstract_id, {})
+        counters[level] = counters.get(level, levels[level][2] - 1) + 1
+        for deeper in [lvl for lvl in counters if lvl > level]:
+            del counters[deeper]
+        
+        def render(match):
+            lvl = int(match.group(1)) - 1
+            fmt, _, start = levels.get(lvl, ("decimal", "", 1))
+            return _format_number(counters.get(lvl, start), fmt)
+        
+        fmt, template, _ = levels[level]
+        if fmt == "bullet":
+            return "-"
+        return re.sub(r"%(\d)", render, template).strip()
+
+def _format_number(value: int, fmt: str) -> str:
+    """Render a list counter in a Word number format."""
+    if fmt in ("lowerLetter", "upperLetter"):
+        letters = ""
+        while value > 0:
+            value, remainder = divmod(value - 1, 26)
+            letters = chr(ord("a") + remainder) + letters
+        return letters.upper() if fmt == "upperLetter" else letters
+    if fmt in ("lowerRoman", "upperRoman"):
+        numeral = ""
+        for amount, symbol in _ROMAN_NUMERALS:
+            while value >= amount:
+                numeral += symbol
+                value -= amount
+        return numeral.upper() if fmt == "upperRoman" else numeral
+    if fmt == "decimalZero":
+        return f"{value:02d}"
+    if fmt == "none":
+        return ""
+    return str(value)
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared extraction process pool, creating it on first use."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pdf_pool
+
+def _extract_pages_parallel(file_path: str, page_count: int) -> List[str]:
+    """Extract page texts by fanning page ranges out to the process pool.
+    
+    Args:
+        file_path: Path to the PDF file
+        page_count: Number of pages in the document
+    
+    Returns:
+        Formatted page texts in document order
+    """
+    # Several ranges per worker keeps the pool busy when pages vary in cost
+    range_count = max(1, settings.PDF_EXTRACT_WORKERS * 4)
+    step = max(1, -(-page_count // range_count))
+    starts = list(range(0, page_count, step))
+    stops = [min(start + step, page_count) for start in starts]
+    
+    pool = get_process_pool()
+    pages = []
+    for page_texts in pool.map(_extract_page_range, [file_path] * len(starts), starts, stops):
+        pages.extend(page_texts)
+    return pages
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract a range of pages in a worker process.
+    
+    Args:
+        file_path: Path to the PDF file
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+    
+    Returns:
+        Formatted page texts
+    """
+    with fitz.open(file_path) as doc:
+        return [_format_page(page_num, doc[page_num].get_text()) for page_num in range(start, stop)]
+
+def _format_page(page_num: int, text: str) -> str:
+    """Format a page's text with the page marker used by clause extraction."""
+    return f"\n\n--- Page {page_num + 1} ---\n\n{text}"
+
+def collect_document_files(source: Path, workdir: Path) -> List[Path]:
+    """Collect supported documents from a directory, archive or single file.
+    
+    Zip and tar archives are unpacked into ``workdir`` first, unless their
+    member count or decompressed size exceeds MAX_ARCHIVE_MEMBERS or
+    MAX_ARCHIVE_UNPACKED_MB. Archive members that are not regular files or
+    would land outside ``workdir`` are skipped.
+    
+    Args:
+        source: Directory, .zip/.tar(.gz) archive or document file
+        workdir: Scratch directory for unpacking archives
+    
+    Returns:
+        Sorted list of document paths
+    
+    Raises:
+        ValueError: If the path doesn't exist or the archive is invalid or too large
+    """
+    source = Path(source)
+    
+    # Documents are checked before archives: a .docx is itself a zip file
+    if source.is_dir():
+        root = source
+    elif source.is_file() and source.suffix.lower() in SUPPORTED_EXTENSIONS:
+        return [source]
+    elif source.is_file() and source.name.lower().endswith(ARCHIVE_SUFFIXES):
+        if zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                members = [info for info in archive.infolist() if not info.is_dir()]
+                _check_archive_size(source, len(members), sum(info.file_size for info in members))
+                archive.extractall(workdir, members=members)
+        elif tarfile.is_tarfile(source):
+            with tarfile.open(source) as archive:
+                base = workdir.resolve()
+                members = [
+                    member for member in archive.getmembers()
+                    if member.isfile() and base in (base / member.name).resolve().parents
+                ]
+                _check_archive_size(source, len(members), sum(member.size for member in members))
+                archive.extractall(workdir, members=members)
+        else:
+            raise ValueError(f"Not a valid zip or tar archive: {source.name}")
+        root = workdir
+    elif source.is_file():
+        return []
+    else:
+        raise ValueError(f"Path not found or unsupported: {source}")
+    
+    return sorted(
+        path for path in root.rglob("*")
+        if path.is_file()
+        and path.suffix.lower() in SUPPORTED_EXTENSIONS
+        and not path.name.startswith(".")
+    )
+
+def _check_archive_size(source: Path, members: int, unpacked_bytes: int):
+    """Reject archives that would unpack to too many files or bytes (e.g. zip bombs).
+    
+    Args:
+        source: Archive path
+        members: Number of files to unpack
+        unpacked_bytes: Their total decompressed size from the archive headers
+    
+    Raises:
+        ValueError: If a limit is exceeded
+    """
+    if members > settings.MAX_ARCHIVE_MEMBERS:
+        raise ValueError(f"Archive {source.name} has {members} files, over the limit of {settings.MAX_ARCHIVE_MEMBERS}")
+    max_bytes = settings.MAX_ARCHIVE_UNPACKED_MB * 1024 * 1024
+    if unpacked_bytes > max_bytes:
+        raise ValueError(f"Archive {source.name} unpacks to {unpacked_bytes} bytes, over the limit of {max_bytes}")
+
+def resolve_ingest_path(path: str, root: Optional[Path] = None) -> Path:
+    """Resolve a server-side ingest path, confined to the ingest root.
+    
+    Relative paths are taken from the root. The path is fully resolved, so
+    ``..`` components and symlinks pointing outside the root are rejected.
+    
+    Args:
+        path: Requested path
+        root: Directory paths must stay inside (defaults to INGEST_ROOT)
+    
+    Returns:
+        Resolved path
+    
+    Raises:
+        PermissionError: If the path resolves outside the root
+    """
+    root = Path(root or settings.INGEST_ROOT).resolve()
+    resolved = (root / path).resolve()
+    if resolved != root and root not in resolved.parents:
+        raise PermissionError(f"Path is outside the ingest root: {path}")
+    return resolved
\ No newline at end of file
@@ -1,9 +1,19 @@
-from typing import Any, List, Mapping, Optional
+import time
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, SystemMessage
 from langchain_core.outputs import ChatGeneration, ChatResult
 from groq import Groq
 from app.core.config import settings
+from app.core.rate_limit import LimitedStream, RateLimiter, estimate_tokens, get_rate_limiter, is_rate_limited, retry_after
+from app.core.retry import CallMetrics, call_with_retries, get_call_metrics, get_call_stats, hedged
+from app.core.single_flight import SingleFlight, request_key
+
+logger = logging.getLogger(__name__)
+
+# Identical requests in flight across all agents and models
+_in_flight = SingleFlight()
 
 class GroqChatModel(BaseChatModel):
     """Custom LLM class for Groq integration."""
@@ -17,14 +27,15 @@ class GroqChatModel(BaseChatModel):
     def __init__(self, **kwargs):
         """Initialize the Groq chat model."""
         super().__init__(**kwargs)
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # Retries are handled by complete, not by the SDK
+        self.client = Groq(api_key=settings.GROQ_API_KEY, max_retries=0)
     
     def _convert_messages_to_prompt(self, messages: List[BaseMessage]) -> List[dict]:
         """Convert messages to Groq chat format.
         
         Args:
             messages: List of messages
-            
+        
         Returns:
             List of message dictionaries in Groq format
         """
@@ -45,6 +56,138 @@ class GroqChatModel(BaseChatModel):
             })
         return groq_messages
     
+    def complete(
+        self,
+        messages: List[Dict[str, Any]],
+        stream: bool = False,
+        deadline: Optional[float] = None,
+        hedge: Optional[bool] = None,
+        **kwargs: Any
+    ) -> Any:
+        """Send a chat completion request through the model's shared rate limiter.
+        
+        Every Groq call goes through here, so concurrent analyses share the
+        model's request and token quotas. Timeouts, 429s, 5xx responses and
+        connection errors are retried with jittered exponential backoff
+        until the deadline. With hedging, a duplicate request is sent when
+        the first hasn't answered within the model's recent p95 latency
+        (LLM_HEDGE_QUANTILE), and the first response wins. Retry counts,
+        errors, hedges and latencies are kept per model (get_llm_call_stats).
+        
+        Concurrent identical requests (same model, parameters and messages)
+        share one upstream call and its result (LLM_SINGLE_FLIGHT), so two
+        users opening the same contract don't both pay for it.
+        
+        Args:
+            messages: Messages in Groq format
+            stream: Return an iterator of completion chunks; only the
+                request is retried, and streams are never hedged
+            deadline: Seconds the call may take, retries included
+                (defaults to LLM_CALL_DEADLINE_SECONDS)
+            hedge: Send a hedged duplicate (defaults to LLM_HEDGE_REQUESTS)
+            **kwargs: Request parameters overriding the model's
+        
+        Returns:
+            The completion, or when streaming a LimitedStream of chunks,
+            which holds its rate limiter slot until it is read or closed
+        """
+        request = {
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "top_p": self.top_p,
+            **kwargs
+        }
+        metrics = get_call_metrics(request["model"])
+        call = lambda: self._complete(messages, stream, request, metrics, deadline, hedge)
+        
+        # A stream can only be consumed once, so streams are never shared
+        if stream or not settings.LLM_SINGLE_FLIGHT:
+            return call()
+        
+        completion, shared = _in_flight.do(request_key(dict(request, messages=messages)), call)
+        if shared:
+            metrics.record_coalesced()
+        return completion
+    
+    def _complete(
+        self,
+        messages: List[Dict[str, Any]],
+        stream: bool,
+        request: Dict[str, Any],
+        metrics: CallMetrics,
+        deadline: Optional[float],
+        hedge: Optional[bool]
+    ) -> Any:
+        """Send a request with retries and optional hedging, recording its metrics."""
+        limiter = get_rate_limiter(request["model"])
+        hedge = settings.LLM_HEDGE_REQUESTS if hedge is None else hedge
+        attempts = 0
+        
+        def attempt(remaining: float) -> Tuple[Any, bool, bool]:
+            nonlocal attempts
+            attempts += 1
+            call_deadline = time.monotonic() + remaining
+            send = lambda: self._send(messages, stream, request, limiter, metrics, call_deadline)
+            
+            # A duplicate would only queue behind a full concurrency limit
+            if not hedge or stream or limiter.concurrency.in_flight >= int(limiter.concurrency.limit):
+                return send(), False, False
+            return hedged(send, metrics.latencies.quantile(settings.LLM_HEDGE_QUANTILE))
+        
+        try:
+            (completion, was_hedged, hedge_won), retries = call_with_retries(
+                attempt,
+                deadline or settings.LLM_CALL_DEADLINE_SECONDS,
+                max_retries=settings.LLM_MAX_RETRIES,
+                base_delay=settings.LLM_RETRY_BASE_DELAY,
+                max_delay=settings.LLM_RETRY_MAX_DELAY,
+                on_error=metrics.record_error
+            )
+        except Exception:
+            metrics.record_call(max(attempts - 1, 0), failed=True)
+            raise
+        
+        metrics.record_call(retries, hedged=was_hedged, hedge_won=hedge_won)
+        if retries:
+            logger.info(f"Groq call to {request['model']} succeeded after {retries} retries")
+        return completion
+    
+    def _send(
+        self,
+        messages: List[Dict[str, Any]],
+        stream: bool,
+        request: Dict[str, Any],
+        limiter: RateLimiter,
+        metrics: CallMetrics,
+        deadline: float
+    ) -> Any:
+        """Send one request once the rate limiter admits it."""
+        estimated_tokens = estimate_tokens(messages)
+        started = limiter.acquire(estimated_tokens)
+        timeout = min(settings.LLM_REQUEST_TIMEOUT_SECONDS, max(deadline - started, 1.0))
+        try:
+            completion = self.client.chat.completions.create(
+                messages=messages,
+                stream=stream,
+                timeout=timeout,
+                **request
+            )
+        except Exception as e:
+            limiter.release(started, estimated_tokens, throttled=is_rate_limited(e), retry_after=retry_after(e))
+            raise
+        
+        if stream:
+            return LimitedStream(completion, limiter, started, estimated_tokens)
+        
+        metrics.latencies.record(time.monotonic() - started)
+        usage = getattr(completion, "usage", None)
+        if usage is not None:
+            metrics.record_usage(usage.prompt_tokens or 0, usage.completion_tokens or 0)
+        limiter.release(started, estimated_tokens, used_tokens=getattr(usage, "total_tokens", None))
+        return completion
+
+    
     def _generate(
         self,
         messages: List[BaseMessage],
@@ -59,22 +202,14 @@ class GroqChatModel(BaseChatModel):
             stop: Optional stop sequences
             run_manager: Optional run manager
             **kwargs: Additional arguments
-            
+        
         Returns:
             ChatResult containing the generated response
         """
         try:
             groq_messages = self._convert_messages_to_prompt(messages)
             
-            completion = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=groq_messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                top_p=self.top_p,
-                stream=False,
-                stop=stop,
-            )
+            completion = self.complete(groq_messages, stop=stop)
             
             # Create ChatGeneration object
             message = AIMessage(content=completion.choices[0].message.content)
@@ -89,4 +224,11 @@ class GroqChatModel(BaseChatModel):
     @property
     def _llm_type(self) -> str:
         """Return the type of LLM."""
-        return "groq" 
\ No newline at end of file
+        return "groq"
+
+def get_llm_call_stats() -> Dict[str, Dict[str, Any]]:
+    """Call metrics and rate limiter state of every model called so far."""
+    stats = get_call_stats()
+    for model_name in stats:
+        stats[model_name]["limiter"] = get_rate_limiter(model_name).stats()
+    return stats
\ No newline at end of file
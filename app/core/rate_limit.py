@@ -0,0 +1,377 @@
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate.
+    
+    The balance may go negative when usage is settled after the fact;
+    later callers then wait until the debt is repaid.
+    """
+    
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """Initialize the bucket full.
+        
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Largest balance (defaults to one minute of tokens)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity or per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+    
+    def _refill(self):
+        """Add the tokens accrued since the last update. Caller holds the lock."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take tokens, waiting until enough have accrued.
+        
+        A request larger than the capacity only waits for a full bucket and
+        takes the rest as debt, so it can't wait forever but is still
+        charged in full.
+        
+        Args:
+            amount: Tokens to take
+        
+        Returns:
+            Seconds spent waiting
+        """
+        needed = min(amount, self.capacity)
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return time.monotonic() - started
+                self._cond.wait((needed - self._tokens) / self.rate)
+    
+    def adjust(self, amount: float):
+        """Debit (positive) or credit (negative) tokens after a call settles.
+        
+        Args:
+            amount: Tokens used beyond what was acquired
+        """
+        with self._cond:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+            self._cond.notify_all()
+    
+    def pause(self, seconds: float):
+        """Withhold tokens for a while, e.g. for a server's retry-after.
+        
+        Args:
+            seconds: Time before the next token is available
+        """
+        with self._cond:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+    
+    @property
+    def available(self) -> float:
+        """Current balance."""
+        with self._cond:
+            self._refill()
+            return self._tokens
+
+class AdaptiveConcurrency:
+    """AIMD limit on concurrent requests.
+    
+    Each successful call grows the limit by 1/limit, about one slot per
+    window of calls. A throttled call or one slower than the latency target
+    halves it. Calls started before the last decrease don't decrease it
+    again, so a burst of 429s from one congested window halves it once.
+    """
+    
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_target: float):
+        """Initialize the limiter.
+        
+        Args:
+            initial: Starting limit
+            minimum: Lowest limit
+            maximum: Highest limit
+            latency_target: Seconds above which a call counts as congestion
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._decreased_at = 0.0
+        self._cond = threading.Condition()
+    
+    def acquire(self) -> float:
+        """Wait for a free slot.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+        return time.monotonic() - started
+    
+    def release(self, started: float, throttled: bool = False):
+        """Free a slot and adapt the limit to how the call went.
+        
+        Args:
+            started: Monotonic time the call was sent
+            throttled: Whether the server rejected the call for rate limiting
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._in_flight -= 1
+            if throttled or now - started > self.latency_target:
+                if started >= self._decreased_at:
+                    self.limit = max(float(self.minimum), self.limit / 2)
+                    self._decreased_at = now
+                    logger.debug(f"LLM concurrency limit lowered to {int(self.limit)}")
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+    
+    @property
+    def in_flight(self) -> int:
+        """Calls currently holding a slot."""
+        with self._cond:
+            return self._in_flight
+
+class RateLimiter:
+    """Client-side limiter for one model's request and token quotas.
+    
+    A call holds an adaptive concurrency slot and is charged one request
+    and its estimated prompt tokens before it is sent. When it returns, the
+    token bucket is settled with the tokens actually used. A 429 pauses both
+    buckets for the server's retry-after and lowers the concurrency limit.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        latency_target: float = 30.0,
+        burst_seconds: float = 10.0,
+        max_request_tokens: int = 0
+    ):
+        """Initialize the limiter.
+        
+        Args:
+            requests_per_minute: Request quota (0 for unlimited)
+            tokens_per_minute: Token quota (0 for unlimited)
+            max_concurrency: Highest number of concurrent calls
+            min_concurrency: Lowest number of concurrent calls
+            latency_target: Seconds above which a call counts as congestion
+            burst_seconds: Seconds of quota that may be spent at once; kept
+                short so bursts don't overrun a provider's sliding minute
+            max_request_tokens: Largest expected call; the token burst is
+                at least this (up to a minute of quota) so one call fits
+        """
+        burst = burst_seconds / 60.0
+        token_burst = min(tokens_per_minute, max(tokens_per_minute * burst, max_request_tokens))
+        self.requests = TokenBucket(requests_per_minute, max(1.0, requests_per_minute * burst)) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute, token_burst) if tokens_per_minute > 0 else None
+        self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency, max_concurrency, latency_target)
+        
+        # Without a retry-after, wait one request interval after a 429
+        self.throttle_pause = 60.0 / requests_per_minute if requests_per_minute > 0 else 1.0
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._throttled = 0
+        self._waited = 0.0
+    
+    def acquire(self, estimated_tokens: int) -> float:
+        """Wait for a concurrency slot and quota for one call.
+        
+        Args:
+            estimated_tokens: Tokens the call is expected to use
+        
+        Returns:
+            Monotonic time the call may be sent, to pass to release
+        """
+        waited = self.concurrency.acquire()
+        if self.requests is not None:
+            waited += self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += self.tokens.acquire(estimated_tokens)
+        with self._lock:
+            self._calls += 1
+            self._waited += waited
+        return time.monotonic()
+    
+    def release(
+        self,
+        started: float,
+        estimated_tokens: int,
+        used_tokens: Optional[int] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None
+    ):
+        """Settle a call.
+        
+        Args:
+            started: Value returned by acquire
+            estimated_tokens: Tokens passed to acquire
+            used_tokens: Tokens the call actually used, if known
+            throttled: Whether the server rejected the call for rate limiting
+            retry_after: Seconds the server asked to wait before retrying
+        """
+        self.concurrency.release(started, throttled)
+        if self.tokens is not None and used_tokens is not None:
+            self.tokens.adjust(used_tokens - estimated_tokens)
+        if throttled:
+            with self._lock:
+                self._throttled += 1
+            for bucket in (self.requests, self.tokens):
+                if bucket is not None:
+                    bucket.pause(retry_after or self.throttle_pause)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Calls, throttled calls, total wait and the current concurrency limit."""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "throttled": self._throttled,
+                "waited_seconds": round(self._waited, 3),
+                "concurrency_limit": int(self.concurrency.limit),
+                "in_flight": self.concurrency.in_flight
+            }
+
+class LimitedStream:
+    """Streamed completion that holds a rate limiter slot until it is finished.
+    
+    The call is settled exactly once: when the stream is exhausted, fails,
+    is closed or is garbage collected, including streams that are never
+    iterated. Completion tokens are estimated from the streamed text.
+    """
+    
+    def __init__(self, stream: Any, limiter: RateLimiter, started: float, estimated_tokens: int):
+        """Wrap a stream.
+        
+        Args:
+            stream: Iterator of completion chunks in Groq format
+            limiter: Limiter that admitted the call
+            started: Value returned by limiter.acquire
+            estimated_tokens: Tokens passed to limiter.acquire
+        """
+        self._stream = stream
+        self._iterator = None
+        self._limiter = limiter
+        self._started = started
+        self._estimated_tokens = estimated_tokens
+        self._generated = 0
+        self._settled = False
+        self._lock = threading.Lock()
+    
+    def __iter__(self) -> "LimitedStream":
+        return self
+    
+    def __next__(self) -> Any:
+        if self._settled:
+            raise StopIteration
+        try:
+            if self._iterator is None:
+                self._iterator = iter(self._stream)
+            chunk = next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+        if chunk.choices and chunk.choices[0].delta.content:
+            self._generated += len(chunk.choices[0].delta.content)
+        return chunk
+    
+    def __enter__(self) -> "LimitedStream":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self):
+        """Stop the stream and settle the call, if not done already."""
+        with self._lock:
+            if self._settled:
+                return
+            self._settled = True
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        except Exception as e:
+            logger.debug(f"Error closing stream: {str(e)}")
+        finally:
+            self._limiter.release(
+                self._started,
+                self._estimated_tokens,
+                used_tokens=self._estimated_tokens + self._generated // 4
+            )
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(model_name: str) -> RateLimiter:
+    """Get the process-wide rate limiter of a model, creating it on first use.
+    
+    Quotas are per model, so every agent calling the same model shares one
+    limiter. A model listed in LLM_MODEL_QUOTAS gets its own quotas; other
+    models use LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE.
+    
+    Args:
+        model_name: Model name
+    
+    Returns:
+        Rate limiter for the model
+    """
+    with _limiters_lock:
+        if model_name not in _limiters:
+            requests_per_minute, tokens_per_minute = settings.LLM_MODEL_QUOTAS.get(
+                model_name,
+                (settings.LLM_REQUESTS_PER_MINUTE, settings.LLM_TOKENS_PER_MINUTE)
+            )
+            _limiters[model_name] = RateLimiter(
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                min_concurrency=settings.LLM_MIN_CONCURRENCY,
+                latency_target=settings.LLM_LATENCY_TARGET_SECONDS,
+                max_request_tokens=settings.LLM_MAX_REQUEST_TOKENS
+            )
+        return _limiters[model_name]
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Estimate the prompt tokens of chat messages (about four characters per token).
+    
+    Args:
+        messages: Chat messages in Groq format
+    
+    Returns:
+        Estimated prompt tokens
+    """
+    return sum(len(str(message.get("content") or "")) // 4 + 4 for message in messages)
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether an API error is a rate limit rejection (HTTP 429)."""
+    return getattr(error, "status_code", None) == 429
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds a rejected call asked to wait, from its retry-after header."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
\ No newline at end of file
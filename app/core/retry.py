@@ -0,0 +1,245 @@
+import time
+import random
+import logging
+import threading
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from app.core.rate_limit import is_rate_limited
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Threads running hedged calls; a losing call finishes in the background
+_hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+
+def classify_error(error: Exception) -> Optional[str]:
+    """Classify an API error as retryable.
+    
+    Args:
+        error: Exception raised by a call
+    
+    Returns:
+        "rate_limit", "server", "timeout" or "connection" for errors worth
+        retrying, None for the rest (bad requests, authentication, parsing)
+    """
+    if is_rate_limited(error):
+        return "rate_limit"
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int) and status_code >= 500:
+        return "server"
+    
+    # Groq SDK errors are matched by name so this module doesn't need the SDK
+    name = type(error).__name__
+    if isinstance(error, TimeoutError) or "Timeout" in name:
+        return "timeout"
+    if isinstance(error, ConnectionError) or name == "APIConnectionError":
+        return "connection"
+    return None
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter.
+    
+    Args:
+        attempt: Retry number, from 0
+        base: Delay ceiling of the first retry in seconds
+        cap: Largest delay ceiling in seconds
+    
+    Returns:
+        Seconds to wait, uniform between 0 and the capped exponential ceiling
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def call_with_retries(
+    call: Callable[[float], T],
+    timeout: float,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+    on_error: Optional[Callable[[str], None]] = None
+) -> Tuple[T, int]:
+    """Run a call, retrying retryable errors with jittered backoff until a deadline.
+    
+    Args:
+        call: Function taking the seconds left before the deadline
+        timeout: Seconds the call may take in total, retries included
+        max_retries: Most retries
+        base_delay: Backoff ceiling of the first retry in seconds
+        max_delay: Largest backoff ceiling in seconds
+        on_error: Called with the class of every retryable error
+    
+    Returns:
+        The call's result and the number of retries it took
+    
+    Raises:
+        The last error, once it isn't retryable, the retries are used up or
+        the backoff would pass the deadline
+    """
+    deadline = time.monotonic() + timeout
+    retries = 0
+    while True:
+        try:
+            return call(deadline - time.monotonic()), retries
+        except Exception as e:
+            error_class = classify_error(e)
+            if error_class is None:
+                raise
+            if on_error:
+                on_error(error_class)
+            
+            delay = backoff_delay(retries, base_delay, max_delay)
+            if retries >= max_retries or time.monotonic() + delay >= deadline:
+                raise
+            retries += 1
+            logger.warning(f"LLM call failed ({error_class}: {str(e)}), retry {retries}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+def hedged(call: Callable[[], T], hedge_after: Optional[float]) -> Tuple[T, bool, bool]:
+    """Run a call and, if it hasn't returned in time, a duplicate; the first success wins.
+    
+    Args:
+        call: Function to run
+        hedge_after: Seconds to wait before sending the duplicate (None never sends one)
+    
+    Returns:
+        The result, whether a duplicate was sent and whether the duplicate won
+    
+    Raises:
+        The last error if every attempt failed
+    """
+    primary = _hedge_pool.submit(call)
+    if hedge_after is None:
+        return primary.result(), False, False
+    
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result(), False, False
+    
+    backup = _hedge_pool.submit(call)
+    pending = {primary, backup}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result(), True, future is backup
+            except Exception as e:
+                error = e
+    raise error
+
+class LatencyTracker:
+    """Rolling window of call latencies."""
+    
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """Initialize the tracker.
+        
+        Args:
+            window: Latest latencies kept
+            min_samples: Samples needed before quantiles are reported
+        """
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float):
+        """Record the latency of a successful call."""
+        with self._lock:
+            self._latencies.append(seconds)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency quantile of the window, or None with too few samples.
+        
+        Args:
+            q: Quantile between 0 and 1
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+class CallMetrics:
+    """Retry, hedging and latency counters of one model's calls."""
+    
+    def __init__(self):
+        """Initialize empty counters."""
+        self.latencies = LatencyTracker()
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._failed = 0
+        self._retries = Counter()
+        self._errors = Counter()
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._coalesced = 0
+        self._prompt_tokens = 0
+        self._completion_tokens = 0
+    
+    def record_error(self, error_class: str):
+        """Count a retryable error."""
+        with self._lock:
+            self._errors[error_class] += 1
+    
+    def record_call(self, retries: int, failed: bool = False, hedged: bool = False, hedge_won: bool = False):
+        """Count a finished call.
+        
+        Args:
+            retries: Retries the call took
+            failed: Whether the call finally failed
+            hedged: Whether a duplicate request was sent
+            hedge_won: Whether the duplicate answered first
+        """
+        with self._lock:
+            self._calls += 1
+            self._failed += failed
+            self._retries[retries] += 1
+            self._hedged += hedged
+            self._hedge_wins += hedge_won
+    
+    def record_usage(self, prompt_tokens: int, completion_tokens: int):
+        """Add the tokens a request used."""
+        with self._lock:
+            self._prompt_tokens += prompt_tokens
+            self._completion_tokens += completion_tokens
+    
+    def record_coalesced(self):
+        """Count a call answered by an identical call already in flight."""
+        with self._lock:
+            self._coalesced += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Calls, failures, calls per retry count, errors by class, hedges, coalesced calls, tokens and latency quantiles."""
+        with self._lock:
+            stats = {
+                "calls": self._calls,
+                "failed": self._failed,
+                "retries": {str(retries): count for retries, count in sorted(self._retries.items())},
+                "errors": dict(self._errors),
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "coalesced": self._coalesced,
+                "prompt_tokens": self._prompt_tokens,
+                "completion_tokens": self._completion_tokens
+            }
+        for q in (0.5, 0.95, 0.99):
+            latency = self.latencies.quantile(q)
+            stats[f"latency_p{int(q * 100)}"] = round(latency, 3) if latency is not None else None
+        return stats
+
+_metrics: Dict[str, CallMetrics] = {}
+_metrics_lock = threading.Lock()
+
+def get_call_metrics(model_name: str) -> CallMetrics:
+    """Get the process-wide call metrics of a model, creating them on first use."""
+    with _metrics_lock:
+        if model_name not in _metrics:
+            _metrics[model_name] = CallMetrics()
+        return _metrics[model_name]
+
+def get_call_stats() -> Dict[str, Dict[str, Any]]:
+    """Call metrics of every model called so far."""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    return {model_name: model_metrics.stats() for model_name, model_metrics in metrics.items()}
\ No newline at end of file
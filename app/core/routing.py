@@ -0,0 +1,67 @@
+import re
+from typing import Optional
+
+from app.core.config import settings
+
+_WORD = re.compile(r"[a-z0-9]{4,}")
+
+def task_model(task: str) -> str:
+    """Model configured for a task.
+    
+    Args:
+        task: Task name, e.g. "clause_refinement" or "risk_assessment"
+    
+    Returns:
+        Model name from LLM_TASK_MODELS, else LLM_MODEL
+    """
+    return settings.LLM_TASK_MODELS.get(task, settings.LLM_MODEL)
+
+def escalation_model(task: str) -> Optional[str]:
+    """Model to ask again when a task's model gives a doubtful answer.
+    
+    Args:
+        task: Task name
+    
+    Returns:
+        LLM_ESCALATION_MODEL, or None if the task already uses it
+    """
+    if task_model(task) == settings.LLM_ESCALATION_MODEL:
+        return None
+    return settings.LLM_ESCALATION_MODEL
+
+def grounding(source: str, output: str) -> float:
+    """Share of an output's words that occur in its source text.
+    
+    Extraction answers should copy the source; a low share means the model
+    paraphrased, added commentary or invented text.
+    
+    Args:
+        source: Text the model was given
+        output: Text the model returned
+    
+    Returns:
+        Share between 0 and 1 of the output's words of four or more
+        characters found in the source (1.0 for an output without any)
+    """
+    output_words = _WORD.findall(output.lower())
+    if not output_words:
+        return 1.0
+    source_words = set(_WORD.findall(source.lower()))
+    return sum(word in source_words for word in output_words) / len(output_words)
+
+def refinement_needs_escalation(source: str, refined: Optional[str]) -> bool:
+    """Whether a clause refinement from a small model should be asked again.
+    
+    Rejections (NOT_VALID) drop a clause, so they are confirmed by the
+    escalation model, as are refinements not grounded in the source.
+    
+    Args:
+        source: Candidate clause text
+        refined: Refined text, None for NOT_VALID
+    
+    Returns:
+        True if the escalation model should refine the clause
+    """
+    if refined is None:
+        return True
+    return grounding(source, refined) < settings.LLM_ESCALATION_MIN_GROUNDING
\ No newline at end of file
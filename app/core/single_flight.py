@@ -0,0 +1,71 @@
+import json
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Hash a request's model, parameters and messages.
+    
+    Args:
+        request: Request parameters, messages included
+    
+    Returns:
+        SHA-256 hex digest, equal for identical requests
+    """
+    payload = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SingleFlight:
+    """Registry of in-flight calls, so concurrent identical calls share one.
+    
+    The first caller for a key runs the call. Callers arriving with the same
+    key before it finishes wait for it and get its result or its exception.
+    The key is released when the call finishes, so later calls run again;
+    persistent caching is left to the analysis cache.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: str, call: Callable[[], T]) -> Tuple[T, bool]:
+        """Run a call unless an identical one is in flight.
+        
+        Args:
+            key: Identity of the call
+            call: Function to run
+        
+        Returns:
+            The result and whether it was shared from another caller's call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        
+        if not leader:
+            return future.result(), True
+        
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
\ No newline at end of file
@@ -0,0 +1,122 @@
+import os
+import uuid
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+async def save_upload(
+    file: UploadFile,
+    directory: Path,
+    max_bytes: Optional[int] = None
+) -> Tuple[Path, int, str]:
+    """Stream an uploaded file to a content-addressed path on disk.
+    
+    The file is copied in ``UPLOAD_CHUNK_SIZE`` pieces into a private
+    temporary file while its SHA-256 is computed, then atomically renamed
+    to ``<sha256><suffix>`` inside ``directory``. Memory use is bounded by
+    the chunk size regardless of the upload size, and concurrent uploads
+    never share a partial file. Byte-identical uploads resolve to the same
+    final path.
+    
+    Args:
+        file: Uploaded file
+        directory: Directory to store the file in
+        max_bytes: Size limit in bytes (defaults to MAX_UPLOAD_SIZE_MB)
+    
+    Returns:
+        Final file path, size in bytes and SHA-256 hex digest
+    
+    Raises:
+        UploadTooLargeError: If the upload exceeds the size limit
+    """
+    if max_bytes is None:
+        max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    
+    # Reject early when the client declared the size up front
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(f"File exceeds the {max_bytes} byte upload limit")
+    
+    directory.mkdir(parents=True, exist_ok=True)
+    settings.TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    part_path = settings.TEMP_DIR / f"{uuid.uuid4().hex}.part"
+    
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part_path, "wb") as f:
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the {max_bytes} byte upload limit")
+                digest.update(chunk)
+                f.write(chunk)
+        
+        content_hash = digest.hexdigest()
+        suffix = Path(file.filename or "").suffix.lower()
+        final_path = directory / f"{content_hash}{suffix}"
+        
+        # Identical content is already stored; keep the existing file
+        if final_path.exists():
+            part_path.unlink()
+        else:
+            os.replace(part_path, final_path)
+        
+        logger.info(f"Stored upload {file.filename} as {final_path.name} ({size} bytes)")
+        return final_path, size, content_hash
+    
+    finally:
+        if part_path.exists():
+            part_path.unlink()
+
+def file_sha256(file_path: str) -> str:
+    """Compute the SHA-256 of a file without loading it into memory.
+    
+    Args:
+        file_path: Path to the file
+    
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(settings.UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def store_file(source: Path, directory: Path, content_hash: str) -> Path:
+    """Copy a local file into a content-addressed store directory.
+    
+    Args:
+        source: File to copy
+        directory: Store directory
+        content_hash: SHA-256 of the file
+    
+    Returns:
+        Path of the stored file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    final_path = directory / f"{content_hash}{Path(source).suffix.lower()}"
+    if final_path.exists():
+        return final_path
+    
+    part_path = settings.TEMP_DIR / f"{uuid.uuid4().hex}.part"
+    try:
+        shutil.copyfile(source, part_path)
+        os.replace(part_path, final_path)
+    finally:
+        if part_path.exists():
+            part_path.unlink()
+    return final_path
\ No newline at end of file
@@ -0,0 +1,172 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Writes between enforcing the row cap and TTL
+_PRUNE_INTERVAL = 256
+
+class AnalysisCache:
+    """SQLite-backed store of per-clause analysis results keyed by content.
+    
+    Each entry is keyed by a stage ("clause", "risk", "amendment") and a
+    hash of every input the result depends on: the clause text and type,
+    the model settings and the policy text it was judged against. A new
+    version of a contract therefore reuses the results of every clause it
+    shares with the previous version, and only edited clauses miss.
+    
+    Results older than the TTL are never returned. Expired results and the
+    oldest results beyond the row cap are deleted on startup and every
+    few hundred writes, so the database stays bounded.
+    """
+    
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_rows: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """Initialize the cache.
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to ANALYSIS_CACHE_PATH)
+            max_rows: Results to keep, 0 for no cap (defaults to ANALYSIS_CACHE_MAX_ROWS)
+            ttl_seconds: Age after which results expire, 0 for never
+                (defaults to ANALYSIS_CACHE_TTL_DAYS)
+        """
+        self.db_path = Path(db_path or settings.ANALYSIS_CACHE_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_rows = settings.ANALYSIS_CACHE_MAX_ROWS if max_rows is None else max_rows
+        self.ttl_seconds = settings.ANALYSIS_CACHE_TTL_DAYS * 86400 if ttl_seconds is None else ttl_seconds
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "stage TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (stage, key)"
+                ") WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at)")
+        self.prune()
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a transaction on the cache database, closing it afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from the inputs of an analysis step."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """Get a cached result.
+        
+        Args:
+            stage: Analysis stage
+            key: Key from make_key
+        
+        Returns:
+            The cached JSON value, or None on a miss
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM results WHERE stage = ? AND key = ? AND created_at >= ?",
+                (stage, key, self._expiry())
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+    
+    def put(self, stage: str, key: str, value: Any):
+        """Store a result.
+        
+        Args:
+            stage: Analysis stage
+            key: Key from make_key
+            value: JSON-serializable result
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (stage, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (stage, key, json.dumps(value, default=str), time.time())
+            )
+            self._writes += 1
+            due = self._writes % _PRUNE_INTERVAL == 0
+        if due:
+            self.prune()
+    
+    def _expiry(self) -> float:
+        """Creation time before which results have expired."""
+        return time.time() - self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+    
+    def prune(self) -> int:
+        """Delete expired results, then the oldest results beyond the row cap.
+        
+        Returns:
+            Number of results removed
+        """
+        with self._lock, self._connect() as conn:
+            removed = conn.execute("DELETE FROM results WHERE created_at < ?", (self._expiry(),)).rowcount
+            if self.max_rows > 0:
+                # Creation time of the oldest result that still fits under the cap
+                row = conn.execute(
+                    "SELECT created_at FROM results ORDER BY created_at DESC LIMIT 1 OFFSET ?",
+                    (self.max_rows - 1,)
+                ).fetchone()
+                if row is not None:
+                    removed += conn.execute("DELETE FROM results WHERE created_at < ?", (row[0],)).rowcount
+        if removed:
+            logger.info(f"Pruned {removed} analysis cache results")
+        return removed
+    
+    def clear(self, stage: Optional[str] = None) -> int:
+        """Drop cached results.
+        
+        Args:
+            stage: Only drop results of this stage
+        
+        Returns:
+            Number of results removed
+        """
+        with self._lock, self._connect() as conn:
+            if stage:
+                cursor = conn.execute("DELETE FROM results WHERE stage = ?", (stage,))
+            else:
+                cursor = conn.execute("DELETE FROM results")
+        return cursor.rowcount
+
+_analysis_cache: Optional[AnalysisCache] = None
+_analysis_cache_lock = threading.Lock()
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """Get the shared analysis cache, or None when ANALYSIS_CACHE_ENABLED is off."""
+    global _analysis_cache
+    if not settings.ANALYSIS_CACHE_ENABLED:
+        return None
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = AnalysisCache()
+        return _analysis_cache
\ No newline at end of file
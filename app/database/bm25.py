@@ -0,0 +1,255 @@
+import re
+import json
+import math
+import sqlite3
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Dollar amounts and percentages stay whole ("$5,000,000", "10%") so caps
+# can be matched exactly; words keep inner hyphens and apostrophes
+_TOKEN_PATTERN = re.compile(r"\$?\d+(?:[.,]\d+)*%?|[a-z]+(?:['-][a-z]+)*")
+
+_STOPWORDS = frozenset("""
+a an and any are as at be been by for from has have if in into is it its
+of on or such that the their then there these this to was were which will
+with shall may must not no other than all each per under upon
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into index terms, dropping stopwords."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked ID lists with reciprocal rank fusion.
+    
+    Each ID scores ``sum(1 / (k + rank))`` over the lists it appears in,
+    so items ranked well by several retrievers rise to the top without
+    having to calibrate their raw scores against each other.
+    
+    Args:
+        rankings: ID lists, best first
+        k: Damping constant; larger values flatten the rank contribution
+    
+    Returns:
+        (ID, fused score) pairs, best first
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+class BM25Index:
+    """Persistent inverted index with Okapi BM25 scoring.
+    
+    Postings, chunk lengths and chunk texts live in SQLite next to the
+    vector collection and are updated incrementally as chunks are added or
+    removed, so the index never needs a full rebuild.
+    """
+    
+    def __init__(self, db_path: Path, k1: float = 1.5, b: float = 0.75):
+        """Initialize the index.
+        
+        Args:
+            db_path: Path to the SQLite database
+            k1: Term frequency saturation
+            b: Length normalization strength
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._init_db()
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a transaction on the index database, closing it afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _init_db(self):
+        """Create index tables if they don't exist."""
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    chunk_id TEXT PRIMARY KEY,
+                    document_id TEXT,
+                    length INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    metadata TEXT
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, chunk_id)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_postings_chunk ON postings (chunk_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_document ON chunks (document_id)")
+    
+    def count(self) -> int:
+        """Number of indexed chunks."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+    
+    def add(self, ids: List[str], texts: List[str], metadatas: Optional[List[Dict[str, Any]]] = None):
+        """Index chunks, replacing any already indexed under the same IDs.
+        
+        Args:
+            ids: Chunk IDs
+            texts: Chunk texts
+            metadatas: Optional chunk metadata
+        """
+        metadatas = metadatas or [{} for _ in ids]
+        chunk_rows, posting_rows = [], []
+        for chunk_id, text, metadata in zip(ids, texts, metadatas):
+            terms = Counter(tokenize(text))
+            chunk_rows.append((
+                chunk_id,
+                (metadata or {}).get("document_id"),
+                sum(terms.values()),
+                text,
+                json.dumps(metadata or {}, default=str)
+            ))
+            posting_rows.extend((term, chunk_id, tf) for term, tf in terms.items())
+        
+        with self._lock, self._connect() as conn:
+            self._delete_chunks(conn, ids)
+            conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?, ?)", chunk_rows)
+            conn.executemany("INSERT INTO postings VALUES (?, ?, ?)", posting_rows)
+    
+    def clear(self):
+        """Remove every chunk from the index."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM chunks")
+    
+    def delete(self, ids: List[str]) -> int:
+        """Remove chunks from the index.
+        
+        Args:
+            ids: Chunk IDs
+        
+        Returns:
+            Number of chunks removed
+        """
+        with self._lock, self._connect() as conn:
+            return self._delete_chunks(conn, ids)
+    
+    def delete_document(self, document_id: str) -> int:
+        """Remove all chunks of a document.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Number of chunks removed
+        """
+        with self._lock, self._connect() as conn:
+            ids = [row[0] for row in conn.execute(
+                "SELECT chunk_id FROM chunks WHERE document_id = ?", (document_id,)
+            )]
+            return self._delete_chunks(conn, ids)
+    
+    @staticmethod
+    def _delete_chunks(conn: sqlite3.Connection, ids: List[str]) -> int:
+        """Delete chunks and their postings within an open transaction."""
+        removed = 0
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({placeholders})", batch)
+            removed += conn.execute(f"DELETE FROM chunks WHERE chunk_id IN ({placeholders})", batch).rowcount
+        return removed
+    
+    def search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, float]]:
+        """Rank chunks against a query with BM25.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter: Optional metadata equality filter
+        
+        Returns:
+            (chunk ID, score) pairs, best first
+        """
+        terms = Counter(tokenize(query))
+        if not terms:
+            return []
+        
+        with self._connect() as conn:
+            total, total_length = conn.execute("SELECT COUNT(*), SUM(length) FROM chunks").fetchone()
+            if not total:
+                return []
+            average_length = (total_length or 0) / total or 1.0
+            
+            placeholders = ",".join("?" * len(terms))
+            rows = conn.execute(
+                f"SELECT p.term, p.chunk_id, p.tf, c.length, c.metadata FROM postings p "
+                f"JOIN chunks c ON c.chunk_id = p.chunk_id WHERE p.term IN ({placeholders})",
+                list(terms)
+            ).fetchall()
+        
+        document_frequency = Counter(term for term, *_ in rows)
+        scores: Dict[str, float] = {}
+        for term, chunk_id, tf, length, metadata in rows:
+            if filter and not self._matches(json.loads(metadata or "{}"), filter):
+                continue
+            df = document_frequency[term]
+            idf = math.log(1.0 + (total - df + 0.5) / (df + 0.5))
+            norm = tf + self.k1 * (1.0 - self.b + self.b * length / average_length)
+            # Repeated query terms weigh proportionally more
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + terms[term] * idf * tf * (self.k1 + 1.0) / norm
+        
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+    
+    @staticmethod
+    def _matches(metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+        """Check a metadata equality filter."""
+        return all(metadata.get(key) == value for key, value in filter.items())
+    
+    def get(self, ids: List[str]) -> Dict[str, Document]:
+        """Get indexed chunks as documents.
+        
+        Args:
+            ids: Chunk IDs
+        
+        Returns:
+            Mapping of found chunk IDs to documents
+        """
+        found = {}
+        with self._connect() as conn:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for chunk_id, text, metadata in conn.execute(
+                    f"SELECT chunk_id, text, metadata FROM chunks WHERE chunk_id IN ({placeholders})",
+                    batch
+                ):
+                    found[chunk_id] = Document(page_content=text, metadata=json.loads(metadata or "{}"))
+        return found
\ No newline at end of file
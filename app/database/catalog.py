@@ -0,0 +1,243 @@
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class DocumentCatalog:
+    """SQLite-backed catalog of ingested documents keyed by content hash."""
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        """Initialize the catalog.
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to CATALOG_PATH)
+        """
+        self.db_path = Path(db_path or settings.CATALOG_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._init_db()
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a transaction on the catalog database, closing it afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _init_db(self):
+        """Create catalog tables if they don't exist."""
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    document_id TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    collection TEXT NOT NULL,
+                    document_type TEXT NOT NULL,
+                    filename TEXT,
+                    title TEXT,
+                    file_path TEXT,
+                    chunk_count INTEGER DEFAULT 0,
+                    metadata TEXT,
+                    created_at REAL NOT NULL,
+                    previous_version_id TEXT,
+                    version INTEGER DEFAULT 1
+                )
+                """
+            )
+            
+            # Catalogs created before versioning lack the version columns
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(documents)")}
+            if "previous_version_id" not in columns:
+                conn.execute("ALTER TABLE documents ADD COLUMN previous_version_id TEXT")
+            if "version" not in columns:
+                conn.execute("ALTER TABLE documents ADD COLUMN version INTEGER DEFAULT 1")
+            
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_hash "
+                "ON documents (collection, content_hash)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_previous_version "
+                "ON documents (previous_version_id)"
+            )
+    
+    def find_by_hash(self, content_hash: str, collection: str) -> Optional[Dict[str, Any]]:
+        """Find an ingested document by content hash.
+        
+        Args:
+            content_hash: SHA-256 of the document file
+            collection: Vector store collection name
+        
+        Returns:
+            Catalog record if found, None otherwise
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM documents WHERE collection = ? AND content_hash = ?",
+                (collection, content_hash)
+            ).fetchone()
+        return self._row_to_record(row)
+    
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Get a catalog record by document ID.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Catalog record if found, None otherwise
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM documents WHERE document_id = ?",
+                (document_id,)
+            ).fetchone()
+        return self._row_to_record(row)
+    
+    def register(
+        self,
+        document_id: str,
+        content_hash: str,
+        collection: str,
+        document_type: str,
+        filename: str,
+        title: str,
+        file_path: str,
+        chunk_count: int,
+        metadata: Optional[Dict[str, Any]] = None,
+        previous_version_id: Optional[str] = None,
+        version: int = 1
+    ):
+        """Record an ingested document, replacing any entry with the same hash.
+        
+        Args:
+            document_id: Document ID
+            content_hash: SHA-256 of the document file
+            collection: Vector store collection name
+            document_type: Document type value
+            filename: Original filename
+            title: Document title
+            file_path: Path of the stored file
+            chunk_count: Number of chunks written to the vector store
+            metadata: Additional metadata to keep with the record
+            previous_version_id: Document this one is a new version of
+            version: Version number within the document's lineage
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (document_id, content_hash, collection, "
+                "document_type, filename, title, file_path, chunk_count, metadata, created_at, "
+                "previous_version_id, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    document_id,
+                    content_hash,
+                    collection,
+                    document_type,
+                    filename,
+                    title,
+                    file_path,
+                    chunk_count,
+                    json.dumps(metadata or {}, default=str),
+                    time.time(),
+                    previous_version_id,
+                    version
+                )
+            )
+    
+    def remove(self, document_id: str) -> bool:
+        """Remove a document from the catalog.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            True if a record was removed
+        """
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM documents WHERE document_id = ?",
+                (document_id,)
+            )
+        return cursor.rowcount > 0
+    
+    def get_versions(self, document_id: str) -> List[Dict[str, Any]]:
+        """Get every version in a document's lineage.
+        
+        Args:
+            document_id: ID of any version of the document
+        
+        Returns:
+            Catalog records from the first version to the latest
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM documents WHERE document_id = ?", (document_id,)).fetchone()
+            if row is None:
+                return []
+            
+            # Walk back to the first version, then forward to the latest
+            seen = {row["document_id"]}
+            while row["previous_version_id"]:
+                previous = conn.execute(
+                    "SELECT * FROM documents WHERE document_id = ?",
+                    (row["previous_version_id"],)
+                ).fetchone()
+                if previous is None or previous["document_id"] in seen:
+                    break
+                seen.add(previous["document_id"])
+                row = previous
+            
+            versions = [row]
+            seen = {row["document_id"]}
+            while True:
+                following = conn.execute(
+                    "SELECT * FROM documents WHERE previous_version_id = ? ORDER BY created_at DESC",
+                    (versions[-1]["document_id"],)
+                ).fetchone()
+                if following is None or following["document_id"] in seen:
+                    break
+                seen.add(following["document_id"])
+                versions.append(following)
+        return [self._row_to_record(version) for version in versions]
+    
+    def list_documents(self, collection: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List catalog records.
+        
+        Args:
+            collection: Optional collection name to filter by
+        
+        Returns:
+            List of catalog records, oldest first
+        """
+        with self._connect() as conn:
+            if collection:
+                rows = conn.execute(
+                    "SELECT * FROM documents WHERE collection = ? ORDER BY created_at",
+                    (collection,)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM documents ORDER BY created_at").fetchall()
+        return [self._row_to_record(row) for row in rows]
+    
+    @staticmethod
+    def _row_to_record(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        """Convert a database row to a record dictionary."""
+        if row is None:
+            return None
+        record = dict(row)
+        record["metadata"] = json.loads(record["metadata"] or "{}")
+        return record
\ No newline at end of file
@@ -0,0 +1,232 @@
+import re
+import bisect
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Page marker written by extraction before each PDF page
+PAGE_MARKER = re.compile(r"\n*--- Page (\d+) ---\n*")
+
+# Numbered headings at the start of a line: "1. SCOPE", "2.1 Term:",
+# "ARTICLE IV", "Section 5". A bare number needs a trailing "." or ")" so
+# wrapped lines that start with an amount are not taken for headings.
+SECTION_HEADING = re.compile(
+    r"^[ \t]*(?:"
+    r"(?:ARTICLE|Article|SECTION|Section)[ \t]+(?P<named>\d+(?:\.\d+)*|[IVXLC]+)[.):]?"
+    r"|(?P<dotted>\d{1,3}(?:\.\d{1,3})+)\.?"
+    r"|(?P<number>\d{1,3})[.)]"
+    r")[ \t]+(?=\S)(?P<title>[^\n]*)",
+    re.MULTILINE
+)
+
+# Blank lines between paragraphs
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+class SectionChunker:
+    """Split documents along their structure instead of fixed windows.
+    
+    A document is cut at its top-level numbered sections first. Sections
+    longer than ``chunk_size`` are cut at subsections and page markers,
+    then at deeper headings and paragraphs. Only a single paragraph that
+    is still too long is split into overlapping windows. Consecutive
+    pieces are packed back together up to ``chunk_size``, so short
+    sections share a chunk without any section being split.
+    
+    Each chunk carries ``section``, ``section_title``, ``page``,
+    ``page_end``, ``start_offset`` and ``end_offset`` metadata where known.
+    """
+    
+    def __init__(self, chunk_size: int = 2000, chunk_overlap: int = 400):
+        """Initialize the chunker.
+        
+        Args:
+            chunk_size: Maximum chunk length in characters
+            chunk_overlap: Overlap between windows of an over-long paragraph
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+    
+    def split(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Split a document into chunks.
+        
+        Args:
+            text: Document text
+            metadata: Metadata copied to every chunk
+        
+        Returns:
+            List of document chunks
+        """
+        pages = [(match.start(), match.end(), int(match.group(1))) for match in PAGE_MARKER.finditer(text)]
+        headings = [
+            (match.start(), self._heading_number(match), match.group("title").strip()[:100])
+            for match in SECTION_HEADING.finditer(text)
+        ]
+        levels = self._boundaries(text, pages, headings)
+        
+        page_starts = [start for start, _, _ in pages]
+        heading_starts = [start for start, _, _ in headings]
+        
+        chunks = []
+        for start, end in self._split(text, 0, len(text), levels, 0):
+            content = PAGE_MARKER.sub("\n\n", text[start:end]).strip()
+            if not content:
+                continue
+            
+            chunk_metadata = dict(metadata or {})
+            chunk_metadata.update({"start_offset": start, "end_offset": end})
+            
+            # The section in force at the chunk start, else the first one inside it
+            heading = bisect.bisect_right(heading_starts, start) - 1
+            if heading < 0 and heading_starts and heading_starts[0] < end:
+                heading = 0
+            if heading >= 0:
+                chunk_metadata["section"] = headings[heading][1]
+                chunk_metadata["section_title"] = headings[heading][2]
+            if pages:
+                # Content before the first marker belongs to the first page
+                first = bisect.bisect_right(page_starts, start) - 1
+                last = bisect.bisect_right(page_starts, end - 1) - 1
+                chunk_metadata["page"] = pages[max(first, 0)][2]
+                chunk_metadata["page_end"] = pages[max(last, 0)][2]
+            chunks.append(Document(page_content=content, metadata=chunk_metadata))
+        return chunks
+    
+    @staticmethod
+    def _heading_number(match: re.Match) -> str:
+        """Section number of a heading match."""
+        return match.group("named") or match.group("dotted") or match.group("number")
+    
+    @staticmethod
+    def _boundaries(
+        text: str,
+        pages: List[Tuple[int, int, int]],
+        headings: List[Tuple[int, str, str]]
+    ) -> List[List[int]]:
+        """Candidate cut positions, from the coarsest level to the finest."""
+        depths = [number.count(".") for _, number, _ in headings]
+        top = min(depths) if depths else 0
+        
+        sections = [start for (start, _, _), depth in zip(headings, depths) if depth == top]
+        subsections = [start for (start, _, _), depth in zip(headings, depths) if depth == top + 1]
+        subsections += [start for start, _, _ in pages]
+        deeper = [start for (start, _, _), depth in zip(headings, depths) if depth > top + 1]
+        deeper += [match.end() for match in PARAGRAPH_BREAK.finditer(text)]
+        return [sorted(set(level)) for level in (sections, subsections, deeper)]
+    
+    def _split(self, text: str, start: int, end: int, levels: List[List[int]], level: int) -> List[Tuple[int, int]]:
+        """Split a span into pieces of at most chunk_size characters."""
+        if end - start <= self.chunk_size:
+            return [(start, end)]
+        if level == len(levels):
+            return self._split_windows(text, start, end)
+        
+        cuts = levels[level][bisect.bisect_right(levels[level], start):bisect.bisect_left(levels[level], end)]
+        if not cuts:
+            return self._split(text, start, end, levels, level + 1)
+        
+        pieces = []
+        for piece_start, piece_end in zip([start] + cuts, cuts + [end]):
+            pieces.extend(self._split(text, piece_start, piece_end, levels, level + 1))
+        return self._pack(pieces)
+    
+    def _split_windows(self, text: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Split an unstructured span into overlapping windows, cutting at whitespace."""
+        windows = []
+        while start < end:
+            stop = min(start + self.chunk_size, end)
+            if stop < end:
+                space = text.rfind(" ", start + self.chunk_overlap + 1, stop)
+                if space != -1:
+                    stop = space
+            windows.append((start, stop))
+            if stop == end:
+                break
+            start = max(stop - self.chunk_overlap, start + 1)
+        return windows
+    
+    def _pack(self, pieces: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Merge consecutive pieces while the merged span fits in a chunk."""
+        packed = []
+        for start, end in pieces:
+            if packed and end - packed[-1][0] <= self.chunk_size and start >= packed[-1][1]:
+                packed[-1] = (packed[-1][0], end)
+            else:
+                packed.append((start, end))
+        return packed
+
+def get_chunker() -> SectionChunker:
+    """Get a section chunker configured from settings."""
+    return SectionChunker(settings.CHUNK_SIZE, settings.CHUNK_OVERLAP)
+
+def reassemble_chunks(chunks: List[Document], max_overlap: int = 0) -> str:
+    """Rebuild document text from its chunks.
+    
+    Chunks are put in ``chunk_index`` order. Text repeated at the start of
+    a chunk from the end of the previous one (splitter overlap) is
+    dropped: with offset metadata the overlap is known exactly, otherwise
+    the longest repeated run of up to ``max_overlap`` characters is removed.
+    
+    Args:
+        chunks: Chunks of one document
+        max_overlap: Longest overlap to look for when offsets are missing
+    
+    Returns:
+        Document text
+    """
+    ordered = sorted(chunks, key=lambda chunk: chunk.metadata.get("chunk_index", 0))
+    parts: List[str] = []
+    previous: Optional[Document] = None
+    for chunk in ordered:
+        text = chunk.page_content
+        if previous is not None:
+            limit = max_overlap
+            if "end_offset" in previous.metadata and "start_offset" in chunk.metadata:
+                limit = max(previous.metadata["end_offset"] - chunk.metadata["start_offset"], 0)
+            text = text[_overlap(previous.page_content, text, limit):]
+        parts.append(text)
+        previous = chunk
+    return "\n\n".join(part.strip() for part in parts if part.strip())
+
+def diff_chunks(previous: List[str], current: List[str]) -> Tuple[List[int], List[int]]:
+    """Compare the chunk texts of two versions of a document.
+    
+    Chunks are matched by content regardless of position, so text moved or
+    shifted by an edit elsewhere still counts as unchanged. A chunk that
+    occurs more often in the new version than in the old counts as new.
+    
+    Args:
+        previous: Chunk texts of the previous version, in order
+        current: Chunk texts of the new version, in order
+    
+    Returns:
+        Indexes of new or edited chunks in ``current`` and of chunks of
+        ``previous`` that no longer occur
+    """
+    available = Counter(previous)
+    changed = []
+    for index, text in enumerate(current):
+        if available[text]:
+            available[text] -= 1
+        else:
+            changed.append(index)
+    
+    removed = []
+    for index in range(len(previous) - 1, -1, -1):
+        if available[previous[index]]:
+            available[previous[index]] -= 1
+            removed.append(index)
+    return changed, sorted(removed)
+
+def _overlap(previous: str, text: str, max_overlap: int) -> int:
+    """Length of the longest suffix of ``previous`` that starts ``text``."""
+    for size in range(min(max_overlap, len(previous), len(text)), 0, -1):
+        if text.startswith(previous[-size:]):
+            return size
+    return 0
\ No newline at end of file
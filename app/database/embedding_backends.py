@@ -0,0 +1,295 @@
+import os
+import json
+import uuid
+import shutil
+import inspect
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# EMBEDDING_MODEL prefixes that select an alternative CPU backend, e.g.
+# "onnx-int8:sentence-transformers/all-mpnet-base-v2"
+BACKEND_PREFIXES = ("int8", "onnx", "onnx-int8")
+
+def parse_embedding_model(spec: str) -> Tuple[str, str]:
+    """Split an EMBEDDING_MODEL value into backend and model name.
+    
+    Args:
+        spec: Model name, optionally prefixed with "<backend>:"
+    
+    Returns:
+        Backend ("torch" when there is no known prefix) and model name
+    """
+    prefix, separator, model_name = spec.partition(":")
+    if separator and prefix in BACKEND_PREFIXES:
+        return prefix, model_name
+    return "torch", spec
+
+class Int8Embeddings(Embeddings):
+    """Sentence-transformers model with dynamically int8-quantized linear layers.
+    
+    Weights of every nn.Linear are stored as int8 and activations are
+    quantized on the fly, which shrinks the model roughly 4x and speeds up
+    CPU matmuls. The pooling layers are untouched, so vectors keep the
+    original dimension.
+    """
+    
+    def __init__(self, model_name: str, batch_size: int, normalize: bool):
+        """Load and quantize the model.
+        
+        Args:
+            model_name: Sentence-transformers model name or path
+            batch_size: Texts per forward pass
+            normalize: Whether to L2-normalize vectors
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+        
+        model = SentenceTransformer(model_name, device="cpu")
+        self.model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.batch_size = batch_size
+        self.normalize = normalize
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of texts."""
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self.embed_documents([text])[0]
+
+class OnnxEmbeddings(Embeddings):
+    """Sentence-transformers model exported to ONNX and run with onnxruntime.
+    
+    The transformer is exported once into EMBEDDINGS_DIR/onnx and reused
+    afterwards, so torch is only needed for the export. Pooling and
+    normalization are replayed in numpy from the exported configuration.
+    """
+    
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int,
+        normalize: bool,
+        quantize: bool = False,
+        num_threads: int = 0,
+        export_dir: Optional[Path] = None
+    ):
+        """Load the exported model, exporting it first if needed.
+        
+        Args:
+            model_name: Sentence-transformers model name or path
+            batch_size: Texts per forward pass
+            normalize: Whether to L2-normalize vectors
+            quantize: Use the int8-quantized export
+            num_threads: onnxruntime intra-op threads (0 keeps the default)
+            export_dir: Directory holding the export
+        """
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImportError("onnxruntime is required for ONNX embedding backends: pip install onnxruntime")
+        from transformers import AutoTokenizer
+        
+        self.export_dir = Path(export_dir or onnx_export_dir(model_name))
+        if not (self.export_dir / "config.json").exists():
+            export_onnx_model(model_name, self.export_dir)
+        
+        model_file = self.export_dir / ("model.int8.onnx" if quantize else "model.onnx")
+        if quantize and not model_file.exists():
+            quantize_onnx_model(self.export_dir / "model.onnx", model_file)
+        
+        with open(self.export_dir / "config.json", "r", encoding="utf-8") as f:
+            self.config = json.load(f)
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.export_dir))
+        options = onnxruntime.SessionOptions()
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(
+            str(model_file),
+            options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [node.name for node in self.session.get_inputs()]
+        self.batch_size = batch_size
+        self.normalize = normalize or self.config["normalize"]
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of texts."""
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        
+        # Batching texts of similar length keeps padding to a minimum
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.config["max_seq_length"],
+                return_tensors="np"
+            )
+            inputs = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+            pooled = self._pool(token_embeddings, encoded["attention_mask"])
+            for index, vector in zip(batch, pooled):
+                vectors[index] = vector.tolist()
+        
+        return vectors
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self.embed_documents([text])[0]
+    
+    def _pool(self, token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Pool token embeddings into sentence vectors."""
+        mode = self.config["pooling_mode"]
+        mask = attention_mask[..., None].astype(token_embeddings.dtype)
+        
+        if mode == "cls":
+            pooled = token_embeddings[:, 0]
+        elif mode == "max":
+            pooled = np.where(mask > 0, token_embeddings, -1e9).max(axis=1)
+        else:
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        
+        if self.normalize:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+def onnx_export_dir(model_name: str) -> Path:
+    """Get the directory an ONNX export of a model is stored in."""
+    return settings.EMBEDDINGS_DIR / "onnx" / model_name.strip("/").replace("/", "__")
+
+def export_onnx_model(model_name: str, export_dir: Path) -> Path:
+    """Export a sentence-transformers model's transformer to ONNX.
+    
+    The export is written to a scratch directory and renamed into place,
+    so concurrent or interrupted exports never leave a partial directory.
+    
+    Args:
+        model_name: Sentence-transformers model name or path
+        export_dir: Target directory
+    
+    Returns:
+        Path of the export directory
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
+    logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    
+    pooling_mode, normalize = _pipeline_config(model)
+    input_names = [
+        name for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in tokenizer.model_input_names
+    ]
+    
+    class TokenEmbeddings(torch.nn.Module):
+        """Wraps the transformer to return only the last hidden state."""
+        
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+        
+        def forward(self, *args):
+            return self.transformer(**dict(zip(input_names, args)))[0]
+    
+    dummy = tokenizer(["ONNX export sample"], return_tensors="pt")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["token_embeddings"]}
+    export_kwargs: Dict[str, Any] = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False
+    
+    scratch_dir = export_dir.parent / f".{export_dir.name}.{uuid.uuid4().hex}"
+    scratch_dir.mkdir(parents=True)
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                TokenEmbeddings(),
+                tuple(dummy[name] for name in input_names),
+                str(scratch_dir / "model.onnx"),
+                input_names=input_names,
+                output_names=["token_embeddings"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14,
+                **export_kwargs
+            )
+        tokenizer.save_pretrained(str(scratch_dir))
+        with open(scratch_dir / "config.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "model_name": model_name,
+                "pooling_mode": pooling_mode,
+                "normalize": normalize,
+                "max_seq_length": model.max_seq_length,
+                "dimension": model.get_sentence_embedding_dimension()
+            }, f, indent=2)
+        
+        if export_dir.exists():
+            # Another process finished first
+            shutil.rmtree(scratch_dir)
+        else:
+            os.replace(scratch_dir, export_dir)
+    finally:
+        if scratch_dir.exists():
+            shutil.rmtree(scratch_dir)
+    
+    return export_dir
+
+def quantize_onnx_model(model_file: Path, output_file: Path) -> Path:
+    """Dynamically quantize an exported ONNX model's weights to int8.
+    
+    Args:
+        model_file: Float32 ONNX model
+        output_file: Path of the quantized model
+    
+    Returns:
+        Path of the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    logger.info(f"Quantizing {model_file} to int8")
+    part_file = output_file.with_name(f".{output_file.name}.{uuid.uuid4().hex}")
+    try:
+        quantize_dynamic(str(model_file), str(part_file), weight_type=QuantType.QInt8)
+        os.replace(part_file, output_file)
+    finally:
+        if part_file.exists():
+            part_file.unlink()
+    return output_file
+
+def _pipeline_config(model: Any) -> Tuple[str, bool]:
+    """Read the pooling mode and normalization from a sentence-transformers model."""
+    from sentence_transformers.models import Normalize, Pooling
+    
+    pooling = next((module for module in model if isinstance(module, Pooling)), None)
+    if pooling is None:
+        raise ValueError("ONNX export requires a model with a Pooling module")
+    
+    # sentence-transformers 2.x exposes the mode as a string method
+    if hasattr(pooling, "get_pooling_mode_str"):
+        pooling_mode = pooling.get_pooling_mode_str()
+    else:
+        pooling_mode = pooling.pooling_mode
+    if pooling_mode not in ("mean", "cls", "max"):
+        raise ValueError(f"Unsupported pooling mode for ONNX export: {pooling_mode}")
+    
+    normalize = any(isinstance(module, Normalize) for module in model)
+    return pooling_mode, normalize
\ No newline at end of file
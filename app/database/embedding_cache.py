@@ -0,0 +1,239 @@
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's bound-parameter limit
+_MAX_QUERY_KEYS = 500
+
+class EmbeddingCache:
+    """Disk-backed cache of embedding vectors keyed by text hash and model.
+    
+    Vectors are stored as raw little-endian float32 bytes in a single SQLite
+    table, i.e. 4 bytes per dimension plus the 32-byte key.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        """Initialize the cache.
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to EMBEDDING_CACHE_PATH)
+        """
+        self.db_path = Path(db_path or settings.EMBEDDING_CACHE_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key BLOB PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL"
+                ") WITHOUT ROWID"
+            )
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a transaction on the cache database, closing it afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def make_key(model_name: str, text: str) -> bytes:
+        """Build the cache key for a text embedded with a model."""
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).digest()
+    
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        """Look up cached vectors.
+        
+        Args:
+            keys: Cache keys
+        
+        Returns:
+            Mapping of found keys to vectors
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._connect() as conn:
+            for start in range(0, len(unique_keys), _MAX_QUERY_KEYS):
+                batch = unique_keys[start:start + _MAX_QUERY_KEYS]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype="<f4").tolist()
+        
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(unique_keys) - len(found)
+        return found
+    
+    def put_many(self, items: Dict[bytes, List[float]]):
+        """Store vectors in the cache.
+        
+        Args:
+            items: Mapping of cache keys to vectors
+        """
+        if not items:
+            return
+        rows = []
+        for key, vector in items.items():
+            array = np.asarray(vector, dtype="<f4")
+            rows.append((key, array.shape[0], array.tobytes()))
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                rows
+            )
+    
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and the number of cached vectors."""
+        with self._connect() as conn:
+            size = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+class QueryEmbeddingCache:
+    """Bounded in-memory LRU of query embeddings."""
+    
+    def __init__(self, max_size: int):
+        """Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of query vectors to keep
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace so formatting-only differences share an entry."""
+        return " ".join(text.split())
+    
+    def get(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        """Get a cached vector, marking it as most recently used."""
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+    
+    def put(self, key: Tuple[str, str], vector: List[float]):
+        """Store a vector, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and the current number of entries."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves repeated texts from caches.
+    
+    Document embeddings go through the persistent EmbeddingCache and query
+    embeddings through an in-memory LRU; either may be disabled.
+    """
+    
+    def __init__(
+        self,
+        underlying: Embeddings,
+        namespace: str,
+        cache: Optional[EmbeddingCache] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None
+    ):
+        """Initialize the wrapper.
+        
+        Args:
+            underlying: Embedding model used on cache misses
+            namespace: Model identity mixed into cache keys
+            cache: Persistent document embedding cache
+            query_cache: In-memory query embedding cache
+        """
+        self.underlying = underlying
+        self.namespace = namespace
+        self.cache = cache
+        self.query_cache = query_cache
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, encoding only those not found in the cache."""
+        if self.cache is None:
+            return self.underlying.embed_documents(texts)
+        
+        keys = [EmbeddingCache.make_key(self.namespace, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+        
+        # Encode each distinct missing text once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+        
+        if missing:
+            encoded = self.underlying.embed_documents(list(missing.values()))
+            new_vectors = dict(zip(missing.keys(), encoded))
+            self.cache.put_many(new_vectors)
+            vectors.update(new_vectors)
+        
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} encoded")
+        return [vectors[key] for key in keys]
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing the vector of an identical recent query."""
+        if self.query_cache is None:
+            return self.underlying.embed_query(text)
+        
+        # Whitespace runs don't change the tokenization, so the normalized
+        # text is what gets embedded
+        text = QueryEmbeddingCache.normalize(text)
+        key = (self.namespace, text)
+        vector = self.query_cache.get(key)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self.query_cache.put(key, vector)
+        return vector
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get statistics for the enabled caches."""
+        return {
+            "model": self.namespace,
+            "document_cache": self.cache.stats() if self.cache is not None else None,
+            "query_cache": self.query_cache.stats() if self.query_cache is not None else None
+        }
\ No newline at end of file
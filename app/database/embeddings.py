@@ -0,0 +1,171 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_community.embeddings import HuggingFaceEmbeddings
+
+from app.core.config import settings
+from app.database.embedding_backends import Int8Embeddings, OnnxEmbeddings, parse_embedding_model
+from app.database.embedding_cache import CachedEmbeddings, EmbeddingCache, QueryEmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+_embeddings_cache: Dict[str, Embeddings] = {}
+_embeddings_lock = threading.Lock()
+
+def get_embeddings(model_name: Optional[str] = None) -> Embeddings:
+    """Get the shared embedding model, loading it on first use.
+    
+    Every VectorStore used to load its own copy of the model; sharing one
+    instance per model keeps a single set of weights in memory. When
+    EMBEDDING_CACHE_ENABLED is set, document embeddings are served from
+    the persistent cache and only unseen texts reach the model. Query
+    embeddings are kept in a bounded LRU of QUERY_EMBEDDING_CACHE_SIZE
+    entries (0 disables it).
+    
+    Args:
+        model_name: Embedding model (defaults to EMBEDDING_MODEL)
+    
+    Returns:
+        LangChain embeddings instance
+    """
+    model_name = model_name or settings.EMBEDDING_MODEL
+    with _embeddings_lock:
+        if model_name not in _embeddings_cache:
+            embeddings = _load_embeddings(model_name)
+            if settings.EMBEDDING_CACHE_ENABLED or settings.QUERY_EMBEDDING_CACHE_SIZE > 0:
+                # Normalized and raw vectors differ, so they get separate keys
+                namespace = f"{model_name}|normalize={settings.EMBEDDING_NORMALIZE}"
+                embeddings = CachedEmbeddings(
+                    embeddings,
+                    namespace,
+                    cache=EmbeddingCache() if settings.EMBEDDING_CACHE_ENABLED else None,
+                    query_cache=(
+                        QueryEmbeddingCache(settings.QUERY_EMBEDDING_CACHE_SIZE)
+                        if settings.QUERY_EMBEDDING_CACHE_SIZE > 0 else None
+                    )
+                )
+            _embeddings_cache[model_name] = embeddings
+        return _embeddings_cache[model_name]
+
+def get_embedding_cache_stats() -> List[Dict[str, Any]]:
+    """Get cache statistics for every loaded embedding model.
+    
+    Returns:
+        One entry per model with document and query cache hit rates
+    """
+    with _embeddings_lock:
+        models = list(_embeddings_cache.values())
+    return [model.stats() for model in models if isinstance(model, CachedEmbeddings)]
+
+def _load_embeddings(model_name: str) -> Embeddings:
+    """Load an embedding model with the configured encode settings.
+    
+    A "int8:", "onnx:" or "onnx-int8:" prefix on the model name selects a
+    quantized or ONNX Runtime CPU backend; otherwise the model runs through
+    HuggingFaceEmbeddings.
+    """
+    # The fast tokenizer can use several threads per batch; extraction
+    # workers are spawned rather than forked, so this is safe to enable
+    os.environ["TOKENIZERS_PARALLELISM"] = "true" if settings.EMBEDDING_TOKENIZER_PARALLELISM else "false"
+    
+    if settings.EMBEDDING_NUM_THREADS > 0:
+        import torch
+        torch.set_num_threads(settings.EMBEDDING_NUM_THREADS)
+    
+    backend, base_model = parse_embedding_model(model_name)
+    logger.info(f"Loading embedding model: {base_model} ({backend} backend)")
+    
+    if backend == "int8":
+        return Int8Embeddings(base_model, settings.EMBEDDING_BATCH_SIZE, settings.EMBEDDING_NORMALIZE)
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxEmbeddings(
+            base_model,
+            settings.EMBEDDING_BATCH_SIZE,
+            settings.EMBEDDING_NORMALIZE,
+            quantize=backend == "onnx-int8",
+            num_threads=settings.EMBEDDING_NUM_THREADS
+        )
+    
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": settings.EMBEDDING_DEVICE},
+        encode_kwargs={
+            "batch_size": settings.EMBEDDING_BATCH_SIZE,
+            "normalize_embeddings": settings.EMBEDDING_NORMALIZE,
+        }
+    )
+
+class EmbeddingWriter:
+    """Embeds chunks in batches and bulk-upserts them into a Chroma collection."""
+    
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        collection: Any,
+        write_batch_size: Optional[int] = None
+    ):
+        """Initialize the writer.
+        
+        Args:
+            embeddings: Embedding model
+            collection: Chroma collection to write to
+            write_batch_size: Chunks per upsert (defaults to VECTOR_WRITE_BATCH_SIZE)
+        """
+        self.embeddings = embeddings
+        self.collection = collection
+        self.write_batch_size = write_batch_size or settings.VECTOR_WRITE_BATCH_SIZE
+        
+        # Chroma rejects upserts larger than the SQLite variable limit allows
+        max_batch_size = getattr(getattr(collection, "_client", None), "max_batch_size", None)
+        if isinstance(max_batch_size, int) and max_batch_size > 0:
+            self.write_batch_size = min(self.write_batch_size, max_batch_size)
+        
+        self.last_stats: Dict[str, float] = {}
+    
+    def write(self, documents: List[Document], ids: List[str]) -> Dict[str, float]:
+        """Embed and upsert documents.
+        
+        All texts are encoded in one call, which the model splits into
+        EMBEDDING_BATCH_SIZE batches. Vectors are then upserted in a few
+        large writes, so SQLite commits are shared by many documents.
+        
+        Args:
+            documents: Chunks to write
+            ids: Chunk IDs, one per document
+        
+        Returns:
+            Write statistics including chunks/sec
+        """
+        if not documents:
+            return {"chunks": 0, "embed_seconds": 0.0, "write_seconds": 0.0, "chunks_per_second": 0.0}
+        
+        start_time = time.perf_counter()
+        vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        embedded_time = time.perf_counter()
+        
+        for start in range(0, len(documents), self.write_batch_size):
+            stop = start + self.write_batch_size
+            self.collection.upsert(
+                ids=ids[start:stop],
+                embeddings=vectors[start:stop],
+                metadatas=[doc.metadata for doc in documents[start:stop]],
+                documents=[doc.page_content for doc in documents[start:stop]]
+            )
+        end_time = time.perf_counter()
+        
+        total_seconds = end_time - start_time
+        self.last_stats = {
+            "chunks": len(documents),
+            "embed_seconds": round(embedded_time - start_time, 3),
+            "write_seconds": round(end_time - embedded_time, 3),
+            "chunks_per_second": round(len(documents) / total_seconds, 2) if total_seconds > 0 else 0.0
+        }
+        logger.info(
+            f"Wrote {len(documents)} chunks: embed {self.last_stats['embed_seconds']}s, "
+            f"write {self.last_stats['write_seconds']}s ({self.last_stats['chunks_per_second']} chunks/sec)"
+        )
+        return self.last_stats
\ No newline at end of file
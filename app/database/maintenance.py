@@ -0,0 +1,136 @@
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.database.catalog import DocumentCatalog
+from app.database.text_store import DocumentTextStore
+
+if TYPE_CHECKING:
+    from app.database.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Where each collection's source files are stored
+COLLECTION_DIRS = {
+    "contracts": settings.CONTRACTS_DIR,
+    "policies": settings.POLICIES_DIR,
+}
+
+class VectorStoreMaintenance:
+    """Garbage collection and compaction for the vector collections."""
+    
+    def __init__(
+        self,
+        stores: Dict[str, "VectorStore"],
+        catalog: DocumentCatalog,
+        text_store: Optional[DocumentTextStore] = None
+    ):
+        """Initialize maintenance.
+        
+        Args:
+            stores: Vector stores by collection name
+            catalog: Document catalog to reconcile against
+            text_store: Document text store cleaned along with the chunks
+        """
+        self.stores = stores
+        self.catalog = catalog
+        self.text_store = text_store
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_run: Dict[str, Any] = {}
+    
+    def _select(self, collection: Optional[str]) -> Dict[str, "VectorStore"]:
+        """Get the stores to operate on."""
+        if collection is None:
+            return self.stores
+        if collection not in self.stores:
+            raise ValueError(f"Unknown collection: {collection}")
+        return {collection: self.stores[collection]}
+    
+    def collect_garbage(self, collection: Optional[str] = None) -> Dict[str, Any]:
+        """Delete chunks of documents that are no longer in the catalog.
+        
+        A document is orphaned when it has chunks but no catalog record and
+        no file named after its ID (files from before the catalog existed).
+        Chunks written within VECTOR_GC_GRACE_SECONDS are left alone, since
+        ingestion writes chunks before it registers the document. Chunks
+        without an ``ingested_at`` timestamp were written before the catalog
+        existed and are never collected; delete those documents explicitly.
+        
+        Args:
+            collection: Collection to collect (all when None)
+        
+        Returns:
+            Removed document IDs and chunk counts per collection
+        """
+        cutoff = time.time() - settings.VECTOR_GC_GRACE_SECONDS
+        results = {}
+        for name, store in self._select(collection).items():
+            catalogued = {record["document_id"] for record in self.catalog.list_documents(name)}
+            directory = COLLECTION_DIRS.get(name)
+            
+            removed_documents: List[str] = []
+            removed_chunks = 0
+            for document_id, ingested_at in store.list_document_ids().items():
+                if document_id in catalogued or not ingested_at or ingested_at > cutoff:
+                    continue
+                if directory is not None and any(Path(directory).glob(f"{document_id}.*")):
+                    continue
+                removed_chunks += store.delete_document(document_id)
+                removed_documents.append(document_id)
+                if self.text_store is not None:
+                    self.text_store.delete(document_id)
+            
+            if removed_documents:
+                logger.info(f"GC removed {len(removed_documents)} orphaned documents from {name}")
+            results[name] = {"documents": removed_documents, "chunks": removed_chunks}
+        
+        self.last_run = {"timestamp": time.time(), "results": results}
+        return results
+    
+    def compact(self, collection: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Compact collections, reporting size and search latency before and after.
+        
+        Args:
+            collection: Collection to compact (all when None)
+        
+        Returns:
+            Before/after stats per collection
+        """
+        return [store.compact() for store in self._select(collection).values()]
+    
+    def start(self, interval_seconds: Optional[float] = None):
+        """Run garbage collection periodically in a background thread.
+        
+        Args:
+            interval_seconds: Seconds between runs (defaults to VECTOR_GC_INTERVAL_SECONDS;
+                0 disables the collector)
+        """
+        interval = settings.VECTOR_GC_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+        if interval <= 0 or self._thread is not None:
+            return
+        
+        def run():
+            # Reconcile once at startup, then every interval
+            while True:
+                try:
+                    self.collect_garbage()
+                except Exception as e:
+                    logger.error(f"Error in vector store GC: {str(e)}")
+                if self._stop.wait(interval):
+                    break
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name="vector-store-gc", daemon=True)
+        self._thread.start()
+        logger.info(f"Started vector store GC every {interval}s")
+    
+    def stop(self):
+        """Stop the background collector."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
\ No newline at end of file
@@ -0,0 +1,729 @@
+import os
+import json
+import uuid
+import shutil
+import logging
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore as LangChainVectorStore
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per block when the matrix is stored as float16
+_SCORE_BLOCK_ROWS = 65536
+
+# Product quantization: centroids per subspace, k-means iterations and
+# rows sampled to train the codebooks
+_PQ_CENTROIDS = 256
+_PQ_TRAIN_ITERATIONS = 10
+_PQ_TRAIN_SAMPLE = 16384
+
+_indexes: Dict[Path, "NumpyVectorIndex"] = {}
+_indexes_lock = threading.Lock()
+
+def get_index(
+    embedding: Embeddings,
+    persist_directory: Path,
+    dtype: str = "float32",
+    **kwargs: Any
+) -> "NumpyVectorIndex":
+    """Get the shared index for a directory, loading it on first use.
+    
+    Several VectorStore objects open the same collection; sharing one index
+    per directory keeps their in-memory state consistent after writes.
+    
+    Args:
+        embedding: Embedding model for query and text embedding
+        persist_directory: Directory holding the index files
+        dtype: Storage dtype, "float32", "float16" or "pq"
+        **kwargs: Product quantization options for NumpyVectorIndex
+    
+    Returns:
+        Shared index instance
+    """
+    key = Path(persist_directory).resolve()
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = NumpyVectorIndex(embedding, persist_directory, dtype=dtype, **kwargs)
+        return _indexes[key]
+
+def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid (L2) for each row."""
+    return np.argmax(vectors @ centroids.T - 0.5 * np.einsum("ij,ij->i", centroids, centroids), axis=1)
+
+def train_codebooks(vectors: np.ndarray, subspaces: int, seed: int = 0) -> np.ndarray:
+    """Train product quantization codebooks with k-means per subspace.
+    
+    Args:
+        vectors: Training vectors, one per row
+        subspaces: Number of subspaces; must divide the dimension
+        seed: Random seed for sampling and initialization
+    
+    Returns:
+        Codebooks of shape (subspaces, centroids, dimension // subspaces)
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > _PQ_TRAIN_SAMPLE:
+        vectors = vectors[np.sort(rng.choice(len(vectors), _PQ_TRAIN_SAMPLE, replace=False))]
+    vectors = np.asarray(vectors, dtype=np.float32)
+    count, dim = vectors.shape
+    width = dim // subspaces
+    centroids = min(_PQ_CENTROIDS, count)
+    
+    codebooks = np.empty((subspaces, centroids, width), dtype=np.float32)
+    for m in range(subspaces):
+        sub = vectors[:, m * width:(m + 1) * width]
+        codebook = sub[rng.choice(count, centroids, replace=False)].copy()
+        for _ in range(_PQ_TRAIN_ITERATIONS):
+            assignment = _nearest_centroids(sub, codebook)
+            sizes = np.bincount(assignment, minlength=centroids)
+            sums = np.zeros_like(codebook)
+            np.add.at(sums, assignment, sub)
+            filled = sizes > 0
+            codebook[filled] = sums[filled] / sizes[filled, None]
+        codebooks[m] = codebook
+    return codebooks
+
+def encode(vectors: np.ndarray, codebooks: np.ndarray) -> np.ndarray:
+    """Quantize vectors to one centroid code per subspace.
+    
+    Args:
+        vectors: Vectors, one per row
+        codebooks: Codebooks from train_codebooks
+    
+    Returns:
+        uint8 codes of shape (subspaces, rows)
+    """
+    subspaces, _, width = codebooks.shape
+    codes = np.empty((subspaces, len(vectors)), dtype=np.uint8)
+    for start in range(0, len(vectors), _SCORE_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + _SCORE_BLOCK_ROWS], dtype=np.float32)
+        for m in range(subspaces):
+            codes[m, start:start + len(block)] = _nearest_centroids(block[:, m * width:(m + 1) * width], codebooks[m])
+    return codes
+
+class _IndexState(NamedTuple):
+    """Everything a search reads, replaced as a whole by each write.
+    
+    ``columns`` caches metadata fields as arrays; it belongs to one state,
+    so filling it lazily never mixes rows of different states.
+    """
+    vectors: np.ndarray
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    positions: Dict[str, int]
+    columns: Dict[str, np.ndarray]
+    codebooks: Optional[np.ndarray]
+    codes: Optional[np.ndarray]
+    trained_rows: int
+
+class NumpyVectorIndex(LangChainVectorStore):
+    """Exact cosine-similarity index backed by a memory-mapped NumPy matrix.
+    
+    Vectors are L2-normalized on write and stored row-wise in
+    ``vectors.npy`` (float32 or float16); ids, texts and metadata are kept
+    in ``records.json``. The matrix is memory-mapped on load, so only the
+    pages touched by a search are read. A search is one matrix product
+    followed by ``argpartition``, and several queries are answered with a
+    single product.
+    
+    With ``dtype="pq"`` the matrix is stored as float16 and additionally
+    product-quantized into ``pq.npz`` (one byte per subspace per vector).
+    Only the codes are held in memory and scanned; the best ``rerank_k``
+    candidates are then re-scored exactly from the memory-mapped matrix.
+    Codebooks are trained once the index holds ``pq_min_train_rows``
+    vectors and retrained whenever it has grown fourfold since; smaller
+    indexes are searched exactly.
+    
+    Writes rewrite the files and swap them in atomically, then publish the
+    new in-memory state with a single assignment. Readers take one snapshot
+    of the state, so a search never mixes rows of two versions. ``upsert``
+    matches the Chroma collection signature, so EmbeddingWriter can write
+    to this index directly.
+    """
+    
+    def __init__(
+        self,
+        embedding: Embeddings,
+        persist_directory: Path,
+        dtype: str = "float32",
+        pq_subspaces: int = 96,
+        rerank_k: int = 100,
+        pq_min_train_rows: int = 1024
+    ):
+        """Initialize the index, loading it from disk if present.
+        
+        Args:
+            embedding: Embedding model for query and text embedding
+            persist_directory: Directory holding the index files
+            dtype: Storage dtype, "float32", "float16" or "pq"
+            pq_subspaces: Product quantization subspaces (bytes per vector)
+            rerank_k: Candidates re-scored exactly after a quantized scan
+            pq_min_train_rows: Vectors needed before codebooks are trained
+        """
+        if dtype not in ("float32", "float16", "pq"):
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+        
+        self.embedding = embedding
+        self.persist_directory = Path(persist_directory)
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        self.quantized = dtype == "pq"
+        self.dtype = np.dtype("float16" if self.quantized else dtype)
+        self.pq_subspaces = pq_subspaces
+        self.rerank_k = rerank_k
+        self.pq_min_train_rows = pq_min_train_rows
+        self._lock = threading.Lock()
+        
+        self._state: _IndexState
+        self._set_state(np.empty((0, 0), dtype=self.dtype), [], [], [])
+        self._load()
+    
+    @property
+    def embeddings(self) -> Embeddings:
+        """Embedding model used by the index."""
+        return self.embedding
+    
+    @property
+    def vectors_path(self) -> Path:
+        return self.persist_directory / "vectors.npy"
+    
+    @property
+    def records_path(self) -> Path:
+        return self.persist_directory / "records.json"
+    
+    @property
+    def pq_path(self) -> Path:
+        return self.persist_directory / "pq.npz"
+    
+    def memory_bytes(self) -> int:
+        """Bytes of vector data scanned by a search (codes when quantized)."""
+        state = self._state
+        if state.codes is not None:
+            return state.codes.nbytes + state.codebooks.nbytes
+        return state.vectors.nbytes
+    
+    def count(self) -> int:
+        """Number of vectors in the index."""
+        return len(self._state.ids)
+    
+    def _load(self):
+        """Memory-map the stored matrix and read the records."""
+        if not self.vectors_path.exists() or not self.records_path.exists():
+            return
+        
+        vectors = np.load(self.vectors_path, mmap_mode="r")
+        with open(self.records_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        
+        if vectors.shape[0] != len(records["ids"]):
+            raise ValueError(
+                f"Index at {self.persist_directory} is inconsistent: "
+                f"{vectors.shape[0]} vectors, {len(records['ids'])} records"
+            )
+        
+        codebooks, codes, trained_rows = None, None, 0
+        if self.quantized and self.pq_path.exists():
+            with np.load(self.pq_path) as pq:
+                if pq["codes"].shape[1] == vectors.shape[0]:
+                    codebooks, codes, trained_rows = pq["codebooks"], pq["codes"], int(pq["trained_rows"])
+                else:
+                    logger.warning(f"Ignoring stale quantization codes in {self.persist_directory}")
+        
+        self._set_state(vectors, records["ids"], records["texts"], records["metadatas"], codebooks, codes, trained_rows)
+        logger.info(f"Loaded NumPy index with {self.count()} vectors from {self.persist_directory}")
+    
+    def _set_state(
+        self,
+        vectors: np.ndarray,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        codebooks: Optional[np.ndarray] = None,
+        codes: Optional[np.ndarray] = None,
+        trained_rows: int = 0
+    ):
+        """Replace the in-memory state; readers see either the old or new state."""
+        self._state = _IndexState(
+            vectors=vectors,
+            ids=ids,
+            texts=texts,
+            metadatas=metadatas,
+            positions={doc_id: row for row, doc_id in enumerate(ids)},
+            columns={},
+            codebooks=codebooks,
+            codes=codes,
+            trained_rows=trained_rows
+        )
+    
+    def _save(
+        self,
+        vectors: np.ndarray,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        codes: Optional[np.ndarray] = None
+    ):
+        """Write the index files and re-map the matrix.
+        
+        ``codes`` are the quantization codes of ``vectors`` under the
+        current codebooks; codebooks are (re)trained here when due.
+        """
+        codebooks, trained_rows = self._state.codebooks, self._state.trained_rows
+        if self.quantized and len(vectors) >= self.pq_min_train_rows and (
+            codebooks is None or codes is None or len(vectors) >= 4 * trained_rows
+        ):
+            codebooks = train_codebooks(vectors, self._subspaces(vectors.shape[1]))
+            codes = encode(vectors, codebooks)
+            trained_rows = len(vectors)
+            logger.info(f"Trained quantization codebooks on {trained_rows} vectors in {self.persist_directory}")
+        if codebooks is None or codes is None:
+            codebooks, codes, trained_rows = None, None, 0
+        
+        suffix = uuid.uuid4().hex
+        vectors_part = self.persist_directory / f".vectors.{suffix}.npy"
+        records_part = self.persist_directory / f".records.{suffix}.json"
+        pq_part = self.persist_directory / f".pq.{suffix}.npz"
+        try:
+            with open(vectors_part, "wb") as f:
+                np.save(f, np.ascontiguousarray(vectors, dtype=self.dtype))
+            with open(records_part, "w", encoding="utf-8") as f:
+                json.dump({"ids": ids, "texts": texts, "metadatas": metadatas}, f, default=str)
+            if codes is not None:
+                with open(pq_part, "wb") as f:
+                    np.savez(f, codebooks=codebooks, codes=codes, trained_rows=trained_rows)
+                os.replace(pq_part, self.pq_path)
+            elif self.pq_path.exists():
+                self.pq_path.unlink()
+            os.replace(records_part, self.records_path)
+            os.replace(vectors_part, self.vectors_path)
+        finally:
+            for part in (vectors_part, records_part, pq_part):
+                if part.exists():
+                    part.unlink()
+        
+        self._set_state(
+            np.load(self.vectors_path, mmap_mode="r"),
+            ids,
+            texts,
+            metadatas,
+            codebooks,
+            codes,
+            trained_rows
+        )
+    
+    def _subspaces(self, dim: int) -> int:
+        """Largest subspace count up to pq_subspaces that divides the dimension."""
+        subspaces = max(1, min(self.pq_subspaces, dim))
+        while dim % subspaces:
+            subspaces -= 1
+        return subspaces
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows so dot products are cosine similarities."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+    
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None
+    ):
+        """Insert or replace vectors by ID.
+        
+        Args:
+            ids: Vector IDs
+            embeddings: Vectors, one per ID
+            metadatas: Optional metadata, one per ID
+            documents: Optional texts, one per ID
+        """
+        if not ids:
+            return
+        new_vectors = self._normalize(embeddings)
+        metadatas = metadatas or [{} for _ in ids]
+        documents = documents or ["" for _ in ids]
+        
+        with self._lock:
+            state = self._state
+            if state.ids and new_vectors.shape[1] != state.vectors.shape[1]:
+                raise ValueError(
+                    f"Vector dimension {new_vectors.shape[1]} does not match index dimension {state.vectors.shape[1]}"
+                )
+            
+            all_ids = list(state.ids)
+            texts = list(state.texts)
+            all_metadatas = list(state.metadatas)
+            positions = dict(state.positions)
+            
+            replaced_rows, replaced_vectors = [], []
+            appended_vectors = []
+            for vector, doc_id, metadata, text in zip(new_vectors, ids, metadatas, documents):
+                row = positions.get(doc_id)
+                if row is None:
+                    positions[doc_id] = len(all_ids)
+                    all_ids.append(doc_id)
+                    texts.append(text)
+                    all_metadatas.append(dict(metadata or {}))
+                    appended_vectors.append(vector)
+                elif row >= len(state.ids):
+                    # Repeated ID within this batch; the last one wins
+                    texts[row] = text
+                    all_metadatas[row] = dict(metadata or {})
+                    appended_vectors[row - len(state.ids)] = vector
+                else:
+                    texts[row] = text
+                    all_metadatas[row] = dict(metadata or {})
+                    replaced_rows.append(row)
+                    replaced_vectors.append(vector)
+            
+            if state.ids:
+                vectors = np.array(state.vectors, dtype=self.dtype)
+            else:
+                vectors = np.empty((0, new_vectors.shape[1]), dtype=self.dtype)
+            if replaced_rows:
+                vectors[replaced_rows] = np.asarray(replaced_vectors, dtype=self.dtype)
+            if appended_vectors:
+                vectors = np.concatenate([vectors, np.asarray(appended_vectors, dtype=self.dtype)])
+            
+            # Encode only the written vectors with the current codebooks
+            codes = None
+            if state.codes is not None:
+                codes = state.codes.copy()
+                if replaced_rows:
+                    codes[:, replaced_rows] = encode(np.asarray(replaced_vectors), state.codebooks)
+                if appended_vectors:
+                    codes = np.concatenate([codes, encode(np.asarray(appended_vectors), state.codebooks)], axis=1)
+            
+            self._save(vectors, all_ids, texts, all_metadatas, codes)
+    
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """Embed and add texts.
+        
+        Args:
+            texts: Texts to add
+            metadatas: Optional metadata, one per text
+            ids: Optional IDs (random UUIDs when omitted)
+        
+        Returns:
+            IDs of the added texts
+        """
+        texts = list(texts)
+        ids = list(ids) if ids else [uuid.uuid4().hex for _ in texts]
+        self.upsert(ids, self.embedding.embed_documents(texts), metadatas, texts)
+        return ids
+    
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete vectors by ID.
+        
+        Args:
+            ids: IDs to delete
+        
+        Returns:
+            True if any vector was deleted
+        """
+        if not ids:
+            return False
+        with self._lock:
+            positions = self._state.positions
+            rows = {positions[doc_id] for doc_id in ids if doc_id in positions}
+            return self._delete_rows(rows) > 0
+    
+    def delete_where(self, filter: Dict[str, Any]) -> int:
+        """Delete all vectors whose metadata matches a filter.
+        
+        Args:
+            filter: Metadata filter
+        
+        Returns:
+            Number of vectors deleted
+        """
+        with self._lock:
+            rows = set(np.flatnonzero(self._filter_mask(self._state, filter)).tolist())
+            return self._delete_rows(rows)
+    
+    def _delete_rows(self, rows: set) -> int:
+        """Remove rows and persist the result; caller holds the lock."""
+        if not rows:
+            return 0
+        state = self._state
+        keep = [row for row in range(len(state.ids)) if row not in rows]
+        self._save(
+            np.array(state.vectors[keep], dtype=self.dtype),
+            [state.ids[row] for row in keep],
+            [state.texts[row] for row in keep],
+            [state.metadatas[row] for row in keep],
+            state.codes[:, keep] if state.codes is not None else None
+        )
+        return len(rows)
+    
+    def get(self, filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Get all documents matching a metadata filter, in insertion order."""
+        state = self._state
+        rows = np.flatnonzero(self._filter_mask(state, filter))
+        return [self._document(state, row) for row in rows]
+    
+    @staticmethod
+    def _column(state: _IndexState, key: str) -> np.ndarray:
+        """Get a metadata field as an array over all rows of a state."""
+        column = state.columns.get(key)
+        if column is None:
+            column = np.empty(len(state.metadatas), dtype=object)
+            column[:] = [metadata.get(key) for metadata in state.metadatas]
+            state.columns[key] = column
+        return column
+    
+    def _filter_mask(self, state: _IndexState, filter: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Evaluate a Chroma-style metadata filter to a boolean row mask.
+        
+        Supports equality, ``$eq``, ``$ne``, ``$in``, ``$nin``, ``$and``
+        and ``$or``.
+        """
+        mask = np.ones(len(state.ids), dtype=bool)
+        for key, condition in (filter or {}).items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._filter_mask(state, clause)
+            elif key == "$or":
+                any_mask = np.zeros(len(state.ids), dtype=bool)
+                for clause in condition:
+                    any_mask |= self._filter_mask(state, clause)
+                mask &= any_mask
+            else:
+                column = self._column(state, key)
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                for operator, value in condition.items():
+                    if operator == "$eq":
+                        mask &= column == value
+                    elif operator == "$ne":
+                        mask &= column != value
+                    elif operator == "$in":
+                        mask &= np.isin(column, list(value))
+                    elif operator == "$nin":
+                        mask &= ~np.isin(column, list(value))
+                    else:
+                        raise ValueError(f"Unsupported filter operator: {operator}")
+        return mask
+    
+    def _scores(self, vectors: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each query against every stored vector."""
+        if vectors.dtype == np.float32:
+            return queries @ vectors.T
+        
+        # Upcast float16 rows block by block to bound the float32 copy
+        return np.concatenate([
+            queries @ np.asarray(vectors[start:start + _SCORE_BLOCK_ROWS], dtype=np.float32).T
+            for start in range(0, vectors.shape[0], _SCORE_BLOCK_ROWS)
+        ], axis=1)
+    
+    def search_vectors(
+        self,
+        query_vectors: np.ndarray,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """Find the top-k rows for a batch of query vectors.
+        
+        Args:
+            query_vectors: Query matrix with one vector per row
+            k: Number of results per query
+            filter: Optional metadata filter
+        
+        Returns:
+            Per query, (row, cosine similarity) pairs with the best first;
+            rows refer to the index as it was when the search started
+        """
+        return self._search(self._state, query_vectors, k, filter)
+    
+    def _search(
+        self,
+        state: _IndexState,
+        query_vectors: np.ndarray,
+        k: int,
+        filter: Optional[Dict[str, Any]]
+    ) -> List[List[Tuple[int, float]]]:
+        """Find the top-k rows of one state for a batch of query vectors."""
+        queries = self._normalize(query_vectors)
+        if len(state.ids) == 0 or k <= 0:
+            return [[] for _ in range(len(queries))]
+        
+        if state.codes is not None:
+            return self._search_quantized(state, queries, k, filter)
+        
+        scores = self._scores(state.vectors, queries)
+        if filter:
+            mask = self._filter_mask(state, filter)
+            scores[:, ~mask] = -np.inf
+            k = min(k, int(mask.sum()))
+            if k == 0:
+                return [[] for _ in range(len(queries))]
+        
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (len(queries), 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        
+        return [
+            [(int(row), float(score)) for row, score in zip(rows, row_scores)]
+            for rows, row_scores in zip(top, top_scores)
+        ]
+    
+    def _search_quantized(
+        self,
+        state: _IndexState,
+        queries: np.ndarray,
+        k: int,
+        filter: Optional[Dict[str, Any]]
+    ) -> List[List[Tuple[int, float]]]:
+        """Scan quantization codes, then re-score the best candidates exactly."""
+        vectors, codebooks, codes = state.vectors, state.codebooks, state.codes
+        mask = self._filter_mask(state, filter) if filter else None
+        subspaces, _, width = codebooks.shape
+        
+        results = []
+        for query in queries:
+            # Asymmetric distance: a query-to-centroid table, summed per code
+            table = np.einsum("mcw,mw->mc", codebooks, query.reshape(subspaces, width))
+            scores = np.zeros(codes.shape[1], dtype=np.float32)
+            for m in range(subspaces):
+                scores += table[m][codes[m]]
+            
+            if mask is not None:
+                scores[~mask] = -np.inf
+            candidates = min(max(self.rerank_k, k), len(scores))
+            if candidates < len(scores):
+                rows = np.argpartition(-scores, candidates - 1)[:candidates]
+            else:
+                rows = np.arange(len(scores))
+            rows = np.sort(rows[np.isfinite(scores[rows])])
+            
+            # Rows are sorted so the memory-mapped reads go front to back
+            exact = np.asarray(vectors[rows], dtype=np.float32) @ query
+            order = np.argsort(-exact)[:k]
+            results.append([(int(rows[i]), float(exact[i])) for i in order])
+        return results
+    
+    @staticmethod
+    def _document(state: _IndexState, row: int) -> Document:
+        """Build a Document for a row of a state."""
+        metadata = dict(state.metadatas[row])
+        return Document(page_content=state.texts[row], metadata=metadata)
+    
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Search with cosine similarity scores (higher is more similar)."""
+        query_vector = self.embedding.embed_query(query)
+        state = self._state
+        return [
+            (self._document(state, row), score)
+            for row, score in self._search(state, np.asarray([query_vector]), k, filter)[0]
+        ]
+    
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        """Search for the documents most similar to a query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+    
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        """Search for the documents most similar to a query vector."""
+        state = self._state
+        return [self._document(state, row) for row, _ in self._search(state, np.asarray([embedding]), k, filter)[0]]
+    
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """Answer several queries with a single matrix product.
+        
+        Args:
+            queries: Search queries
+            k: Number of results per query
+            filter: Optional metadata filter applied to every query
+        
+        Returns:
+            Results for each query, in query order
+        """
+        if not queries:
+            return []
+        query_vectors = np.asarray([self.embedding.embed_query(query) for query in queries])
+        state = self._state
+        return [
+            [self._document(state, row) for row, _ in results]
+            for results in self._search(state, query_vectors, k, filter)
+        ]
+    
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        """Map cosine similarity in [-1, 1] to a relevance score in [0, 1]."""
+        return lambda score: (score + 1.0) / 2.0
+    
+    def delete_collection(self):
+        """Delete the index and its files."""
+        with self._lock:
+            shutil.rmtree(self.persist_directory, ignore_errors=True)
+            self.persist_directory.mkdir(parents=True, exist_ok=True)
+            self._set_state(np.empty((0, 0), dtype=self.dtype), [], [], [])
+    
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        persist_directory: Optional[Path] = None,
+        dtype: str = "float32",
+        **kwargs: Any
+    ) -> "NumpyVectorIndex":
+        """Create an index from texts.
+        
+        Args:
+            texts: Texts to add
+            embedding: Embedding model
+            metadatas: Optional metadata, one per text
+            persist_directory: Directory for the index files
+            dtype: Storage dtype, "float32", "float16" or "pq"
+        
+        Returns:
+            New index
+        """
+        if persist_directory is None:
+            raise ValueError("persist_directory is required")
+        index = cls(embedding, persist_directory, dtype=dtype)
+        index.add_texts(texts, metadatas, ids=kwargs.get("ids"))
+        return index
\ No newline at end of file
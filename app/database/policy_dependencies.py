@@ -0,0 +1,214 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class PolicyDependencyStore:
+    """SQLite-backed record of which policy chunks each analyzed clause used.
+    
+    The policy corpus has a version number that is bumped whenever a policy
+    is added, replaced or deleted. Every clause analysis records the IDs of
+    the policy chunks retrieved for it and the corpus version at the time.
+    After a policy change only the clauses whose retrieval result differs
+    under the new corpus need re-analysis; they are marked stale.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        """Initialize the store.
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to POLICY_DEPENDENCY_PATH)
+        """
+        self.db_path = Path(db_path or settings.POLICY_DEPENDENCY_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS corpus ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO corpus (id, version, updated_at) VALUES (1, 1, ?)", (time.time(),))
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS dependencies (
+                    contract_id TEXT NOT NULL,
+                    clause_key TEXT NOT NULL,
+                    clause_type TEXT NOT NULL,
+                    clause_text TEXT NOT NULL,
+                    policy_chunk_ids TEXT NOT NULL,
+                    corpus_version INTEGER NOT NULL,
+                    stale INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (contract_id, clause_key)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_dependencies_version "
+                "ON dependencies (corpus_version)"
+            )
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a transaction on the database, closing it afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def clause_key(clause_type: str, clause_text: str) -> str:
+        """Identify a clause within a contract by its type and text."""
+        return hashlib.sha256(f"{clause_type}\0{clause_text}".encode("utf-8")).hexdigest()
+    
+    def corpus_version(self) -> int:
+        """Current version of the policy corpus."""
+        with self._connect() as conn:
+            return conn.execute("SELECT version FROM corpus WHERE id = 1").fetchone()["version"]
+    
+    def bump_corpus_version(self) -> int:
+        """Record a change to the policy corpus.
+        
+        Returns:
+            The new corpus version
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE corpus SET version = version + 1, updated_at = ? WHERE id = 1", (time.time(),))
+            version = conn.execute("SELECT version FROM corpus WHERE id = 1").fetchone()["version"]
+        logger.info(f"Policy corpus is now at version {version}")
+        return version
+    
+    def record(
+        self,
+        contract_id: str,
+        clause_type: str,
+        clause_text: str,
+        policy_chunk_ids: List[str],
+        corpus_version: Optional[int] = None
+    ):
+        """Record the policy chunks a clause was analyzed against.
+        
+        Args:
+            contract_id: Contract the clause belongs to
+            clause_type: Clause type value
+            clause_text: Clause text
+            policy_chunk_ids: IDs of the retrieved policy chunks
+            corpus_version: Corpus version of the retrieval (defaults to the current one)
+        """
+        corpus_version = corpus_version or self.corpus_version()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO dependencies (contract_id, clause_key, clause_type, clause_text, "
+                "policy_chunk_ids, corpus_version, stale, updated_at) VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                (
+                    contract_id,
+                    self.clause_key(clause_type, clause_text),
+                    clause_type,
+                    clause_text,
+                    json.dumps(sorted(policy_chunk_ids)),
+                    corpus_version,
+                    time.time()
+                )
+            )
+    
+    def outdated(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Fresh dependency records made against an older corpus version.
+        
+        Args:
+            limit: Maximum number of records to return
+        
+        Returns:
+            Dependency records, oldest corpus version first
+        """
+        query = (
+            "SELECT * FROM dependencies WHERE stale = 0 "
+            "AND corpus_version < (SELECT version FROM corpus WHERE id = 1) ORDER BY corpus_version"
+        )
+        with self._connect() as conn:
+            if limit:
+                rows = conn.execute(query + " LIMIT ?", (limit,)).fetchall()
+            else:
+                rows = conn.execute(query).fetchall()
+        return [self._row_to_record(row) for row in rows]
+    
+    def mark_current(self, contract_id: str, clause_key: str, corpus_version: int):
+        """Confirm that a clause's policy set is unchanged under a corpus version."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE dependencies SET corpus_version = ?, updated_at = ? WHERE contract_id = ? AND clause_key = ?",
+                (corpus_version, time.time(), contract_id, clause_key)
+            )
+    
+    def mark_stale(self, contract_id: str, clause_key: str):
+        """Flag a clause whose policy set changed as needing re-analysis."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE dependencies SET stale = 1, updated_at = ? WHERE contract_id = ? AND clause_key = ?",
+                (time.time(), contract_id, clause_key)
+            )
+    
+    def stale(self, contract_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Clauses waiting for re-analysis.
+        
+        Args:
+            contract_id: Only return clauses of this contract
+        
+        Returns:
+            Dependency records of stale clauses
+        """
+        with self._connect() as conn:
+            if contract_id:
+                rows = conn.execute(
+                    "SELECT * FROM dependencies WHERE stale = 1 AND contract_id = ?",
+                    (contract_id,)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM dependencies WHERE stale = 1").fetchall()
+        return [self._row_to_record(row) for row in rows]
+    
+    def delete_contract(self, contract_id: str) -> int:
+        """Drop the records of a deleted or superseded contract.
+        
+        Args:
+            contract_id: Contract ID
+        
+        Returns:
+            Number of records removed
+        """
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM dependencies WHERE contract_id = ?", (contract_id,))
+        return cursor.rowcount
+    
+    def stats(self) -> Dict[str, int]:
+        """Corpus version and counts of tracked, outdated and stale clauses."""
+        with self._connect() as conn:
+            version = conn.execute("SELECT version FROM corpus WHERE id = 1").fetchone()["version"]
+            row = conn.execute(
+                "SELECT COUNT(*) AS clauses, "
+                "COALESCE(SUM(stale = 0 AND corpus_version < ?), 0) AS outdated, "
+                "COALESCE(SUM(stale), 0) AS stale, "
+                "COUNT(DISTINCT contract_id) AS contracts FROM dependencies",
+                (version,)
+            ).fetchone()
+        return {"corpus_version": version, **dict(row)}
+    
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a database row to a record dictionary."""
+        record = dict(row)
+        record["policy_chunk_ids"] = json.loads(record["policy_chunk_ids"])
+        record["stale"] = bool(record["stale"])
+        return record
\ No newline at end of file
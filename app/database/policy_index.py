@@ -0,0 +1,160 @@
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from langchain_core.documents import Document
+
+from app.core.clause_types import determine_clause_type, rank_clause_types
+from app.core.config import settings
+from app.schemas.documents import ClauseType
+
+logger = logging.getLogger(__name__)
+
+# Chunks under a heading naming the clause type rank above keyword matches
+_HEADING_SCORE = 1000
+
+class PolicyTopicIndex:
+    """SQLite-backed map from clause type to the policy chunks about it.
+    
+    Policy chunks are classified at ingest. A chunk under a section heading
+    that names a clause type ("7. Termination") belongs to that type; other
+    chunks belong to the clause types whose keywords occur at least
+    POLICY_TOPIC_MIN_KEYWORD_HITS times, at most two per chunk. Chunk text
+    and metadata are stored with the mapping, so a lookup needs no vector
+    search.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        """Initialize the index.
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to POLICY_TOPIC_INDEX_PATH)
+        """
+        self.db_path = Path(db_path or settings.POLICY_TOPIC_INDEX_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._init_db()
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a transaction on the index database, closing it afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _init_db(self):
+        """Create the index table if it doesn't exist."""
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS policy_topics (
+                    clause_type TEXT NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    document_id TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    PRIMARY KEY (clause_type, chunk_id)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_policy_topics_document "
+                "ON policy_topics (document_id)"
+            )
+    
+    @staticmethod
+    def classify(chunk: Document) -> List[Tuple[ClauseType, int]]:
+        """Clause types a policy chunk is about, with a ranking score.
+        
+        Args:
+            chunk: Policy chunk
+        
+        Returns:
+            Clause types and scores, best first
+        """
+        heading_type = determine_clause_type(chunk.metadata.get("section_title") or "")
+        if heading_type:
+            return [(heading_type, _HEADING_SCORE + dict(rank_clause_types(chunk.page_content)).get(heading_type, 0))]
+        
+        return [
+            (clause_type, count)
+            for clause_type, count in rank_clause_types(chunk.page_content)[:2]
+            if count >= settings.POLICY_TOPIC_MIN_KEYWORD_HITS
+        ]
+    
+    def add(self, document_id: str, chunks: List[Document]) -> int:
+        """Classify and index the chunks of a policy document.
+        
+        Args:
+            document_id: Policy document ID
+            chunks: Chunks of the document, with chunk_index metadata
+        
+        Returns:
+            Number of (clause type, chunk) entries written
+        """
+        rows = []
+        for index, chunk in enumerate(chunks):
+            chunk_index = chunk.metadata.get("chunk_index", index)
+            chunk_id = f"{document_id}:{chunk_index}"
+            metadata = json.dumps(dict(chunk.metadata, document_id=document_id, chunk_index=chunk_index), default=str)
+            for clause_type, score in self.classify(chunk):
+                rows.append((clause_type.value, chunk_id, document_id, score, chunk.page_content, metadata))
+        
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM policy_topics WHERE document_id = ?", (document_id,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO policy_topics (clause_type, chunk_id, document_id, score, content, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.info(f"Indexed {len(rows)} clause-type entries for policy {document_id}")
+        return len(rows)
+    
+    def delete_document(self, document_id: str) -> int:
+        """Remove a policy document from the index.
+        
+        Args:
+            document_id: Policy document ID
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM policy_topics WHERE document_id = ?", (document_id,))
+        return cursor.rowcount
+    
+    def count(self) -> int:
+        """Number of (clause type, chunk) entries."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM policy_topics").fetchone()[0]
+    
+    def load(self, limit: Optional[int] = None) -> Dict[str, List[Document]]:
+        """Load the best policy chunks of every clause type.
+        
+        Args:
+            limit: Chunks per clause type (defaults to POLICY_TOPIC_MAX_CHUNKS)
+        
+        Returns:
+            Policy chunks keyed by clause type value, best first
+        """
+        limit = limit or settings.POLICY_TOPIC_MAX_CHUNKS
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT clause_type, content, metadata FROM ("
+                "SELECT *, ROW_NUMBER() OVER (PARTITION BY clause_type ORDER BY score DESC, chunk_id) AS rank "
+                "FROM policy_topics) WHERE rank <= ? ORDER BY clause_type, rank",
+                (limit,)
+            ).fetchall()
+        
+        topics: Dict[str, List[Document]] = {}
+        for clause_type, content, metadata in rows:
+            topics.setdefault(clause_type, []).append(Document(page_content=content, metadata=json.loads(metadata)))
+        return topics
\ No newline at end of file
@@ -0,0 +1,388 @@
+import uuid
+import logging
+import httpx
+from urllib.parse import quote
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore as LangChainVectorStore
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Request limits of the Pinecone data plane API
+MAX_UPSERT_BATCH = 1000
+MAX_TOP_K = 10000
+
+# Fetch sends IDs as query parameters; keep URLs well under the 8 KB
+# request line limit common in proxies and servers
+MAX_FETCH_BATCH = 100
+MAX_FETCH_QUERY_BYTES = 4096
+
+# Metadata key holding the chunk text
+TEXT_KEY = "text"
+
+class RemoteVectorStoreError(RuntimeError):
+    """Raised when the remote vector service rejects a request."""
+
+class PineconeRestClient:
+    """Minimal client for the Pinecone data plane REST API.
+    
+    Talks to a single index host over HTTP with httpx. The transport can be
+    replaced, which lets tests run against an in-process fake server.
+    """
+    
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        api_key: Optional[str] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        timeout: Optional[float] = None
+    ):
+        """Initialize the client.
+        
+        Args:
+            host: Index host URL (defaults to PINECONE_INDEX_HOST)
+            api_key: API key (defaults to PINECONE_API_KEY)
+            transport: Optional httpx transport
+            timeout: Request timeout in seconds (defaults to PINECONE_TIMEOUT)
+        """
+        host = host or settings.PINECONE_INDEX_HOST
+        api_key = api_key or settings.PINECONE_API_KEY
+        if not host:
+            raise ValueError("PINECONE_INDEX_HOST environment variable not set")
+        if not api_key:
+            raise ValueError("PINECONE_API_KEY environment variable not set")
+        if not host.startswith(("http://", "https://")):
+            host = f"https://{host}"
+        
+        self.client = httpx.Client(
+            base_url=host,
+            headers={
+                "Api-Key": api_key,
+                "X-Pinecone-API-Version": settings.PINECONE_API_VERSION,
+            },
+            timeout=timeout or settings.PINECONE_TIMEOUT,
+            transport=transport
+        )
+    
+    def _request(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        """Send a request and decode the JSON response."""
+        response = self.client.request(method, path, **kwargs)
+        if response.status_code >= 400:
+            raise RemoteVectorStoreError(
+                f"{method} {path} failed with {response.status_code}: {response.text}"
+            )
+        return response.json() if response.content else {}
+    
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: str) -> int:
+        """Upsert vectors into a namespace."""
+        result = self._request("POST", "/vectors/upsert", json={"vectors": vectors, "namespace": namespace})
+        return result.get("upsertedCount", len(vectors))
+    
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        namespace: str,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Find the nearest vectors, returning matches with metadata."""
+        body = {
+            "vector": vector,
+            "topK": top_k,
+            "namespace": namespace,
+            "includeMetadata": True,
+            "includeValues": False,
+        }
+        if filter:
+            body["filter"] = filter
+        return self._request("POST", "/query", json=body).get("matches", [])
+    
+    def fetch(self, ids: List[str], namespace: str) -> Dict[str, Dict[str, Any]]:
+        """Fetch vectors by ID."""
+        result = self._request("GET", "/vectors/fetch", params={"ids": ids, "namespace": namespace})
+        return result.get("vectors", {})
+    
+    def list_ids(self, namespace: str, prefix: Optional[str] = None) -> Iterator[str]:
+        """List vector IDs in a namespace, following pagination."""
+        params: Dict[str, Any] = {"namespace": namespace}
+        if prefix:
+            params["prefix"] = prefix
+        while True:
+            result = self._request("GET", "/vectors/list", params=params)
+            for vector in result.get("vectors", []):
+                yield vector["id"]
+            token = (result.get("pagination") or {}).get("next")
+            if not token:
+                return
+            params["paginationToken"] = token
+    
+    def delete(
+        self,
+        namespace: str,
+        ids: Optional[List[str]] = None,
+        delete_all: bool = False
+    ):
+        """Delete vectors by ID, or every vector in the namespace."""
+        body: Dict[str, Any] = {"namespace": namespace}
+        if delete_all:
+            body["deleteAll"] = True
+        else:
+            body["ids"] = ids or []
+        self._request("POST", "/vectors/delete", json=body)
+    
+    def describe_index_stats(self) -> Dict[str, Any]:
+        """Get index dimension and per-namespace vector counts."""
+        return self._request("POST", "/describe_index_stats", json={})
+
+class RemoteVectorStore(LangChainVectorStore):
+    """Vector store backed by a Pinecone-compatible index.
+    
+    Each collection lives in its own namespace of one shared index. Chunk
+    IDs have the form ``<document_id>:<chunk_index>``, so a document's
+    chunks are found by ID prefix, which also works on serverless indexes
+    that can't delete by metadata filter. ``upsert`` matches the Chroma
+    collection signature, so EmbeddingWriter can write to this store.
+    """
+    
+    def __init__(
+        self,
+        embedding: Embeddings,
+        namespace: str,
+        client: Optional[PineconeRestClient] = None,
+        upsert_batch_size: Optional[int] = None
+    ):
+        """Initialize the store.
+        
+        Args:
+            embedding: Embedding model for queries
+            namespace: Namespace for this collection
+            client: REST client (created from settings when omitted)
+            upsert_batch_size: Vectors per upsert request (defaults to PINECONE_UPSERT_BATCH_SIZE)
+        """
+        self.embedding = embedding
+        self.namespace = f"{settings.PINECONE_NAMESPACE_PREFIX}{namespace}"
+        self.client = client or PineconeRestClient()
+        self.upsert_batch_size = min(upsert_batch_size or settings.PINECONE_UPSERT_BATCH_SIZE, MAX_UPSERT_BATCH)
+    
+    @property
+    def embeddings(self) -> Embeddings:
+        """Embedding model used by the store."""
+        return self.embedding
+    
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None
+    ):
+        """Upsert vectors in batches of ``upsert_batch_size``.
+        
+        Args:
+            ids: Vector IDs
+            embeddings: Vectors, one per ID
+            metadatas: Optional metadata, one per ID
+            documents: Optional texts, stored under the "text" metadata key
+        """
+        metadatas = metadatas or [{} for _ in ids]
+        documents = documents or [None for _ in ids]
+        vectors = []
+        for vector_id, values, metadata, text in zip(ids, embeddings, metadatas, documents):
+            metadata = self._clean_metadata(metadata)
+            if text is not None:
+                metadata[TEXT_KEY] = text
+            vectors.append({"id": vector_id, "values": [float(v) for v in values], "metadata": metadata})
+        
+        for start in range(0, len(vectors), self.upsert_batch_size):
+            self.client.upsert(vectors[start:start + self.upsert_batch_size], self.namespace)
+    
+    @staticmethod
+    def _clean_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Keep only metadata types Pinecone accepts; nulls are not allowed."""
+        cleaned = {}
+        for key, value in (metadata or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, (str, bool, int, float)):
+                cleaned[key] = value
+            elif isinstance(value, (list, tuple)):
+                cleaned[key] = [str(item) for item in value]
+            else:
+                cleaned[key] = str(value)
+        return cleaned
+    
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """Embed and upsert texts.
+        
+        Args:
+            texts: Texts to add
+            metadatas: Optional metadata, one per text
+            ids: Optional IDs (random UUIDs when omitted)
+        
+        Returns:
+            IDs of the added texts
+        """
+        texts = list(texts)
+        ids = list(ids) if ids else [uuid.uuid4().hex for _ in texts]
+        self.upsert(ids, self.embedding.embed_documents(texts), metadatas, texts)
+        return ids
+    
+    @staticmethod
+    def _to_document(metadata: Optional[Dict[str, Any]]) -> Document:
+        """Split stored metadata into chunk text and document metadata."""
+        metadata = dict(metadata or {})
+        text = metadata.pop(TEXT_KEY, "")
+        return Document(page_content=text, metadata=metadata)
+    
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Search by vector, returning documents with similarity scores."""
+        matches = self.client.query(list(embedding), min(k, MAX_TOP_K), self.namespace, filter)
+        return [(self._to_document(match.get("metadata")), match.get("score", 0.0)) for match in matches]
+    
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Search with similarity scores (higher is more similar)."""
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k, filter)
+    
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        """Search for the documents most similar to a query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+    
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        """Search for the documents most similar to a query vector."""
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, filter)]
+    
+    def fetch(self, ids: List[str]) -> Dict[str, Document]:
+        """Fetch chunks by ID.
+        
+        Args:
+            ids: Chunk IDs
+        
+        Returns:
+            Mapping of found IDs to documents
+        """
+        found = {}
+        for batch in _fetch_batches(ids):
+            vectors = self.client.fetch(batch, self.namespace)
+            for vector_id, vector in vectors.items():
+                found[vector_id] = self._to_document(vector.get("metadata"))
+        return found
+    
+    def get_document_chunks(self, document_id: str, filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Fetch all chunks of a document in chunk order.
+        
+        Args:
+            document_id: Document ID
+            filter: Optional metadata equality filter applied to the chunks
+        
+        Returns:
+            The document's chunks
+        """
+        ids = list(self.client.list_ids(self.namespace, prefix=f"{document_id}:"))
+        documents = list(self.fetch(ids).values())
+        if filter:
+            documents = [
+                doc for doc in documents
+                if all(doc.metadata.get(key) == value for key, value in filter.items())
+            ]
+        return sorted(documents, key=lambda doc: doc.metadata.get("chunk_index", 0))
+    
+    def list_ids(self) -> List[str]:
+        """List every chunk ID in the namespace."""
+        return list(self.client.list_ids(self.namespace))
+    
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete chunks by ID.
+        
+        Args:
+            ids: Chunk IDs
+        
+        Returns:
+            True if a delete request was sent
+        """
+        if not ids:
+            return False
+        for start in range(0, len(ids), MAX_UPSERT_BATCH):
+            self.client.delete(self.namespace, ids=ids[start:start + MAX_UPSERT_BATCH])
+        return True
+    
+    def delete_document(self, document_id: str) -> int:
+        """Delete all chunks of a document.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Number of chunks deleted
+        """
+        ids = list(self.client.list_ids(self.namespace, prefix=f"{document_id}:"))
+        self.delete(ids)
+        return len(ids)
+    
+    def count(self) -> int:
+        """Number of vectors in the namespace."""
+        namespaces = self.client.describe_index_stats().get("namespaces", {})
+        return namespaces.get(self.namespace, {}).get("vectorCount", 0)
+    
+    def delete_collection(self):
+        """Delete every vector in the namespace."""
+        self.client.delete(self.namespace, delete_all=True)
+    
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        namespace: str = "default",
+        **kwargs: Any
+    ) -> "RemoteVectorStore":
+        """Create a store and add texts to it."""
+        store = cls(embedding, namespace, client=kwargs.get("client"))
+        store.add_texts(texts, metadatas, ids=kwargs.get("ids"))
+        return store
+
+def _fetch_batches(ids: List[str]) -> Iterator[List[str]]:
+    """Split IDs into fetch requests bounded by count and encoded query length."""
+    batch: List[str] = []
+    size = 0
+    for vector_id in ids:
+        param_size = len("&ids=") + len(quote(vector_id, safe=""))
+        if batch and (len(batch) >= MAX_FETCH_BATCH or size + param_size > MAX_FETCH_QUERY_BYTES):
+            yield batch
+            batch, size = [], 0
+        batch.append(vector_id)
+        size += param_size
+    if batch:
+        yield batch
\ No newline at end of file
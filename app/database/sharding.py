@@ -0,0 +1,405 @@
+import re
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from langchain_core.documents import Document
+
+from app.core.config import settings
+from app.database.bm25 import reciprocal_rank_fusion
+from app.database.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Chunk metadata field that holds the shard key for each sharding mode
+SHARD_FIELDS = {
+    "document_type": "document_type",
+    "month": "ingest_month",
+}
+
+_search_pool: Optional[ThreadPoolExecutor] = None
+_search_pool_lock = threading.Lock()
+
+def get_search_pool() -> ThreadPoolExecutor:
+    """Get the shared thread pool used to fan searches out to shards."""
+    global _search_pool
+    with _search_pool_lock:
+        if _search_pool is None:
+            _search_pool = ThreadPoolExecutor(
+                max_workers=settings.SHARD_SEARCH_WORKERS,
+                thread_name_prefix="shard-search"
+            )
+        return _search_pool
+
+def create_vector_store(collection_name: str) -> Union[VectorStore, "ShardedVectorStore"]:
+    """Create the vector store for a collection.
+    
+    The contracts collection is sharded when CONTRACT_SHARD_BY is set;
+    every other collection is a single VectorStore.
+    
+    Args:
+        collection_name: Name of the collection
+    
+    Returns:
+        Vector store for the collection
+    """
+    if collection_name == "contracts" and settings.CONTRACT_SHARD_BY:
+        return ShardedVectorStore(collection_name, settings.CONTRACT_SHARD_BY)
+    return VectorStore(collection_name)
+
+class ShardedVectorStore:
+    """A collection split across several vector stores by a metadata key.
+    
+    Each shard is an ordinary VectorStore named ``<collection>__<key>``, so
+    every backend (Chroma, NumPy, Pinecone namespaces) and the per-shard BM25
+    index work unchanged. Writes go to the shard named by the chunk's shard
+    field; searches go only to the shards a filter pins down, or fan out to
+    all shards in parallel, and the per-shard top-k lists are merged.
+    
+    Chunks written before sharding was enabled stay in the unsharded
+    collection, which is searched alongside the shards but never written.
+    """
+    
+    def __init__(self, collection_name: str, shard_by: str):
+        """Initialize the sharded store.
+        
+        Args:
+            collection_name: Name of the logical collection
+            shard_by: Sharding mode (document_type or month)
+        """
+        if shard_by not in SHARD_FIELDS:
+            raise ValueError(f"Unknown shard mode {shard_by}, expected one of {sorted(SHARD_FIELDS)}")
+        
+        self.collection_name = collection_name
+        self.shard_by = shard_by
+        self.shard_field = SHARD_FIELDS[shard_by]
+        self.persistent_dir = settings.EMBEDDINGS_DIR / collection_name
+        self._lock = threading.Lock()
+        self.shards: Dict[str, VectorStore] = {}
+        
+        self._discover()
+        logger.info(f"Loaded {len(self.shards)} shards of {collection_name} (sharded by {shard_by})")
+    
+    def _discover(self):
+        """Open shards on disk that this instance hasn't seen yet.
+        
+        Other instances of the collection (one per router) may have created
+        shards since this one was loaded, so this runs before every search.
+        The unsharded legacy collection is opened too if it exists.
+        """
+        names = [path.name for path in settings.EMBEDDINGS_DIR.glob(f"{self.collection_name}__*") if path.is_dir()]
+        if self.persistent_dir.exists():
+            names.append(self.collection_name)
+        
+        with self._lock:
+            for name in sorted(names):
+                if name not in self.shards:
+                    self.shards[name] = VectorStore(name)
+    
+    @property
+    def embeddings(self):
+        """Embedding model shared by all shards."""
+        return next(iter(self.shards.values())).embeddings if self.shards else None
+    
+    def shard_key(self, metadata: Dict[str, Any]) -> str:
+        """Get the shard key for a chunk, recording it in the metadata.
+        
+        Args:
+            metadata: Chunk metadata
+        
+        Returns:
+            Shard key
+        """
+        if self.shard_by == "month" and not metadata.get(self.shard_field):
+            ingested_at = metadata.get("ingested_at") or time.time()
+            metadata[self.shard_field] = datetime.fromtimestamp(float(ingested_at), timezone.utc).strftime("%Y-%m")
+        value = metadata.get(self.shard_field) or "default"
+        metadata.setdefault(self.shard_field, value)
+        return str(value)
+    
+    def _shard_name(self, key: Any) -> str:
+        """Collection name for a shard key, restricted to characters every backend accepts."""
+        slug = re.sub(r"[^a-z0-9_-]+", "-", str(key).lower()).strip("-_") or "default"
+        return f"{self.collection_name}__{slug}"
+    
+    def _shard(self, key: Any) -> VectorStore:
+        """Get the shard for a key, creating it on first write."""
+        name = self._shard_name(key)
+        with self._lock:
+            if name not in self.shards:
+                logger.info(f"Creating shard {name}")
+                self.shards[name] = VectorStore(name)
+            return self.shards[name]
+    
+    def _pinned_keys(self, filter: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """Get the shard keys a filter restricts results to, or None if it doesn't."""
+        if not filter:
+            return None
+        for key, condition in filter.items():
+            if key == "$and":
+                for clause in condition:
+                    keys = self._pinned_keys(clause)
+                    if keys is not None:
+                        return keys
+            elif key == self.shard_field:
+                if not isinstance(condition, dict):
+                    return {condition}
+                if "$eq" in condition:
+                    return {condition["$eq"]}
+                if "$in" in condition:
+                    return set(condition["$in"])
+        return None
+    
+    def _shards_for(self, filter: Optional[Dict[str, Any]]) -> List[VectorStore]:
+        """Get the shards a search with this filter has to visit."""
+        self._discover()
+        with self._lock:
+            shards = dict(self.shards)
+        keys = self._pinned_keys(filter)
+        if keys is None:
+            return list(shards.values())
+        
+        # Pinned shards plus the legacy collection, which may hold any key
+        names = {self._shard_name(key) for key in keys} | {self.collection_name}
+        return [shard for name, shard in shards.items() if name in names]
+    
+    def _fan_out(self, shards: List[VectorStore], search: Callable[[VectorStore], Any]) -> List[Any]:
+        """Run a search on each shard in parallel."""
+        if len(shards) <= 1:
+            return [search(shard) for shard in shards]
+        return list(get_search_pool().map(search, shards))
+    
+    @staticmethod
+    def _merge(results: Iterable[List[Tuple[Document, float]]], k: int) -> List[Tuple[Document, float]]:
+        """Merge per-shard results into a global top-k by score."""
+        merged = [result for shard_results in results for result in shard_results]
+        merged.sort(key=lambda result: result[1], reverse=True)
+        return merged[:k]
+    
+    def add_documents(self, documents: List[Document]) -> List[str]:
+        """Add documents, routing each chunk to its shard.
+        
+        Args:
+            documents: List of documents to add
+        
+        Returns:
+            List of document IDs
+        """
+        groups: Dict[str, List[Document]] = {}
+        for doc in documents:
+            groups.setdefault(self.shard_key(doc.metadata), []).append(doc)
+        
+        ids = []
+        for key, docs in groups.items():
+            ids.extend(self._shard(key).add_documents(docs))
+        return ids
+    
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Search the relevant shards in parallel and merge their top-k.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter: Optional metadata filter
+        
+        Returns:
+            Documents with scores, higher is more similar
+        """
+        results = self._fan_out(
+            self._shards_for(filter),
+            lambda shard: shard.similarity_search_with_score(query, k=k, filter=filter)
+        )
+        return self._merge(results, k)
+    
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """Search for similar documents across shards.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter: Optional metadata filter
+        
+        Returns:
+            List of similar documents
+        """
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+    
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        fetch_k: Optional[int] = None
+    ) -> List[Document]:
+        """Run hybrid search on each shard and fuse the shard rankings.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter: Optional metadata filter
+            fetch_k: Candidates per retriever (defaults to HYBRID_FETCH_K)
+        
+        Returns:
+            List of documents, best first
+        """
+        results = self._fan_out(
+            self._shards_for(filter),
+            lambda shard: shard.hybrid_search(query, k=k, filter=filter, fetch_k=fetch_k)
+        )
+        documents = {}
+        rankings = []
+        for shard_results in results:
+            ranking = []
+            for doc in shard_results:
+                chunk_id = VectorStore._chunk_id(doc)
+                documents.setdefault(chunk_id, doc)
+                ranking.append(chunk_id)
+            rankings.append(ranking)
+        
+        fused = reciprocal_rank_fusion(rankings, k=settings.RRF_K)[:k]
+        return [documents[chunk_id] for chunk_id, _ in fused]
+    
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """Search for similar documents for several queries at once.
+        
+        Args:
+            queries: Search queries
+            k: Number of results per query
+            filter: Optional metadata filter
+        
+        Returns:
+            Results for each query, in query order
+        """
+        return [self.similarity_search(query, k=k, filter=filter) for query in queries]
+    
+    def delete_document(self, document_id: str) -> int:
+        """Delete all chunks of a document from whichever shard holds them.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Number of chunks deleted
+        """
+        return sum(self._fan_out(self._shards_for(None), lambda shard: shard.delete_document(document_id)))
+    
+    def list_document_ids(self) -> Dict[str, float]:
+        """List the documents that have chunks in any shard.
+        
+        Returns:
+            Mapping of document ID to its latest ``ingested_at`` timestamp
+        """
+        documents: Dict[str, float] = {}
+        for shard_documents in self._fan_out(self._shards_for(None), lambda shard: shard.list_document_ids()):
+            for document_id, ingested_at in shard_documents.items():
+                documents[document_id] = max(documents.get(document_id, 0.0), ingested_at)
+        return documents
+    
+    def count(self) -> int:
+        """Number of chunks across all shards."""
+        return sum(shard.count() for shard in self._shards_for(None))
+    
+    def stats(self, latency_samples: int = 20) -> Dict[str, Any]:
+        """Measure size per shard and the latency of a fanned-out search.
+        
+        Args:
+            latency_samples: Number of timed searches
+        
+        Returns:
+            Total chunk count, bytes on disk, fan-out search latency in ms
+            and the stats of each shard
+        """
+        shards = self._shards_for(None)
+        shard_stats = {shard.collection_name: shard.stats(latency_samples) for shard in shards}
+        
+        latencies = []
+        if shards:
+            query_vector = self.embeddings.embed_query("termination liability payment confidentiality")
+            for _ in range(latency_samples):
+                start = time.perf_counter()
+                self._fan_out(shards, lambda shard: shard.vector_store.similarity_search_by_vector(query_vector, k=4))
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+        
+        return {
+            "chunks": sum(stats["chunks"] for stats in shard_stats.values()),
+            "disk_bytes": sum(stats["disk_bytes"] for stats in shard_stats.values()),
+            "search_ms_p50": round(latencies[len(latencies) // 2], 3) if latencies else 0.0,
+            "search_ms_max": round(latencies[-1], 3) if latencies else 0.0,
+            "shards": shard_stats
+        }
+    
+    def compact(self) -> Dict[str, Any]:
+        """Compact every shard.
+        
+        Returns:
+            Before/after stats of each shard
+        """
+        return {
+            "collection": self.collection_name,
+            "shards": [shard.compact() for shard in self._shards_for(None)]
+        }
+    
+    def get_document_by_id(self, document_id: str) -> Optional[Document]:
+        """Get a document by its ID.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Document if found, None otherwise
+        """
+        for shard in self._shards_for(None):
+            doc = shard.get_document_by_id(document_id)
+            if doc is not None:
+                return doc
+        return None
+    
+    def get_document_chunks(self, document_id: str) -> List[Document]:
+        """Get every chunk of a document in chunk order.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Document chunks, empty if the document is unknown
+        """
+        for chunks in self._fan_out(self._shards_for(None), lambda shard: shard.get_document_chunks(document_id)):
+            if chunks:
+                return chunks
+        return []
+    
+    def get_all_documents(self) -> List[Document]:
+        """Get all documents in every shard.
+        
+        Returns:
+            List of all documents
+        """
+        return [doc for shard in self._shards_for(None) for doc in shard.get_all_documents()]
+    
+    def delete_collection(self) -> bool:
+        """Delete every shard.
+        
+        Returns:
+            True if all shards were deleted
+        """
+        return all([shard.delete_collection() for shard in self._shards_for(None)])
+    
+    chunk_document = staticmethod(VectorStore.chunk_document)
\ No newline at end of file
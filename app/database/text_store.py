@@ -0,0 +1,116 @@
+import os
+import gzip
+import json
+import uuid
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from langchain_core.documents import Document
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Chunk metadata kept alongside the text to locate chunks in it
+SPAN_FIELDS = ("chunk_index", "start_offset", "end_offset", "section", "section_title", "page", "page_end")
+
+class DocumentTextStore:
+    """Canonical extracted text of each document, keyed by document ID.
+    
+    Each document is one gzip-compressed JSON file holding the text that
+    was chunked and the span of every chunk in it, so the full text is a
+    single file read instead of a search over chunks. Files are written to
+    a temporary name and renamed into place.
+    """
+    
+    def __init__(self, root: Optional[Path] = None):
+        """Initialize the store.
+        
+        Args:
+            root: Directory holding the text files (defaults to TEXT_STORE_DIR)
+        """
+        self.root = Path(root or settings.TEXT_STORE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, document_id: str) -> Path:
+        """File holding a document's text."""
+        if not document_id or "/" in document_id or "\\" in document_id or document_id.startswith("."):
+            raise ValueError(f"Invalid document ID: {document_id}")
+        return self.root / f"{document_id}.json.gz"
+    
+    def put(self, document_id: str, text: str, chunks: Optional[List[Document]] = None):
+        """Store a document's text and chunk spans.
+        
+        Args:
+            document_id: Document ID
+            text: Text the chunks were cut from
+            chunks: Chunks of the text, with offset metadata
+        """
+        spans = [
+            {field: chunk.metadata[field] for field in SPAN_FIELDS if field in chunk.metadata}
+            for chunk in chunks or []
+        ]
+        path = self._path(document_id)
+        part_path = self.root / f".{uuid.uuid4().hex}.part"
+        try:
+            with gzip.open(part_path, "wt", encoding="utf-8", compresslevel=settings.TEXT_STORE_COMPRESSION_LEVEL) as f:
+                json.dump({"document_id": document_id, "text": text, "chunks": spans}, f, default=str)
+            os.replace(part_path, path)
+        finally:
+            if part_path.exists():
+                part_path.unlink()
+    
+    def _read(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Read a document's stored record."""
+        try:
+            with gzip.open(self._path(document_id), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def get(self, document_id: str) -> Optional[str]:
+        """Get a document's full text.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Text if stored, None otherwise
+        """
+        record = self._read(document_id)
+        return record["text"] if record else None
+    
+    def get_chunks(self, document_id: str) -> List[Dict[str, Any]]:
+        """Get the spans of a document's chunks in document order.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Chunk index, character offsets, section and page of each chunk
+        """
+        record = self._read(document_id)
+        return record["chunks"] if record else []
+    
+    def exists(self, document_id: str) -> bool:
+        """Whether a document's text is stored."""
+        return self._path(document_id).exists()
+    
+    def delete(self, document_id: str) -> bool:
+        """Delete a document's text.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            True if the text was stored
+        """
+        try:
+            self._path(document_id).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def list_document_ids(self) -> List[str]:
+        """IDs of all stored documents."""
+        return [path.name[:-len(".json.gz")] for path in self.root.glob("*.json.gz")]
\ No newline at end of file
@@ -1,19 +1,23 @@
 import os
+import time
+import sqlite3
 import chromadb
 import logging
 import numpy as np
-import pinecone
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 from langchain_core.documents import Document
 from langchain_chroma import Chroma
 from chromadb.config import Settings
-from langchain_pinecone import PineconeVectorStore
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
 
 from app.core.config import settings
+from app.database.bm25 import BM25Index, reciprocal_rank_fusion
+from app.database.chunking import get_chunker
+from app.database.embeddings import EmbeddingWriter, get_embeddings
+from app.database.numpy_index import NumpyVectorIndex, get_index
+from app.database.remote_store import RemoteVectorStore
 
 logger = logging.getLogger(__name__)
 
@@ -27,15 +31,39 @@ class VectorStore:
             collection_name: Name of the collection
         """
         self.collection_name = collection_name
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=settings.EMBEDDING_MODEL
-        )
+        self.embeddings = get_embeddings()
         self.persistent_dir = settings.EMBEDDINGS_DIR / collection_name
         self.persistent_dir.mkdir(exist_ok=True, parents=True)
         
+        if settings.VECTOR_DB_TYPE == "numpy":
+            # Exact search over a memory-mapped matrix, no SQLite or HNSW
+            self.vector_store = get_index(
+                self.embeddings,
+                self.persistent_dir / "numpy",
+                dtype=settings.NUMPY_INDEX_DTYPE,
+                pq_subspaces=settings.NUMPY_PQ_SUBSPACES,
+                rerank_k=settings.NUMPY_PQ_RERANK_K,
+                pq_min_train_rows=settings.NUMPY_PQ_MIN_TRAIN_ROWS
+            )
+            self.writer = EmbeddingWriter(self.embeddings, self.vector_store)
+            logger.info(f"Loaded NumPy index: {collection_name}")
+        elif settings.VECTOR_DB_TYPE == "pinecone":
+            self._init_pinecone()
+        else:
+            self._init_chroma()
+        
+        # Keyword index kept in step with the vector collection
+        self.bm25: Optional[BM25Index] = None
+        if settings.HYBRID_SEARCH_ENABLED:
+            self.bm25 = BM25Index(self.persistent_dir / "bm25.sqlite3")
+            if self.bm25.count() == 0:
+                self._backfill_bm25()
+    
+    def _init_chroma(self):
+        """Initialize the Chroma store and its batched writer."""
         # Initialize Chroma store with HuggingFace embeddings
         self.vector_store = Chroma(
-            collection_name=collection_name,
+            collection_name=self.collection_name,
             persist_directory=str(settings.VECTOR_STORE_DIR),
             embedding_function=self.embeddings,
             client_settings=Settings(
@@ -43,41 +71,28 @@ class VectorStore:
             )
         )
         
-        logger.info(f"Loaded ChromaDB collection: {collection_name}")
+        logger.info(f"Loaded ChromaDB collection: {self.collection_name}")
         
-        # Initialize based on the selected vector store type
-        if settings.VECTOR_DB_TYPE == "pinecone":
-            self._init_pinecone()
+        # Batched embedding and bulk upserts for the Chroma collection
+        self.writer = EmbeddingWriter(self.embeddings, self.vector_store._collection)
     
     def _init_pinecone(self):
-        """Initialize Pinecone vector store."""
-        if not settings.PINECONE_API_KEY:
-            raise ValueError("PINECONE_API_KEY environment variable not set")
-        
-        pinecone.init(
-            api_key=settings.PINECONE_API_KEY,
-            environment=settings.PINECONE_ENV
-        )
-        
-        # Create index if it doesn't exist
-        if self.collection_name not in pinecone.list_indexes():
-            pinecone.create_index(
-                name=self.collection_name,
-                dimension=768,  # Dimensions for sentence-transformers embeddings
-                metric="cosine"
-            )
+        """Initialize the Pinecone-compatible remote store.
         
-        self.vector_store = PineconeVectorStore(
-            index_name=self.collection_name,
-            embedding=self.embeddings
-        )
+        All collections share the index at PINECONE_INDEX_HOST, which must
+        exist with the embedding dimension and cosine metric; each
+        collection uses its own namespace.
+        """
+        self.vector_store = RemoteVectorStore(self.embeddings, namespace=self.collection_name)
+        self.writer = EmbeddingWriter(self.embeddings, self.vector_store)
+        logger.info(f"Using remote index namespace: {self.vector_store.namespace}")
     
     def add_documents(self, documents: List[Document]) -> List[str]:
         """Add documents to the vector store.
         
         Args:
             documents: List of documents to add
-            
+        
         Returns:
             List of document IDs
         """
@@ -89,8 +104,26 @@ class VectorStore:
                 if "document_id" not in doc.metadata:
                     doc.metadata["document_id"] = f"{self.collection_name}_{i}"
             
+            # Number chunks within each document so chunk IDs are stable
+            # and re-writing a document upserts instead of duplicating
+            chunk_counts = {}
+            ids = []
+            for doc in documents:
+                document_id = doc.metadata["document_id"]
+                if "chunk_index" not in doc.metadata:
+                    doc.metadata["chunk_index"] = chunk_counts.get(document_id, 0)
+                chunk_counts[document_id] = doc.metadata["chunk_index"] + 1
+                ids.append(f"{document_id}:{doc.metadata['chunk_index']}")
+            
             # Add documents to vector store
-            ids = self.vector_store.add_documents(documents)
+            self.writer.write(documents, ids)
+            
+            if self.bm25 is not None:
+                self.bm25.add(
+                    ids,
+                    [doc.page_content for doc in documents],
+                    [doc.metadata for doc in documents]
+                )
             
             # Persist changes
             if hasattr(self.vector_store, "_persist"):
@@ -113,7 +146,7 @@ class VectorStore:
             query: Search query
             k: Number of results to return
             filter: Optional metadata filter
-            
+        
         Returns:
             List of similar documents
         """
@@ -127,12 +160,259 @@ class VectorStore:
             logger.error(f"Error in similarity search: {str(e)}")
             return []
     
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Search for similar documents with scores comparable across collections.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter: Optional metadata filter
+        
+        Returns:
+            Documents with scores, higher is more similar
+        """
+        try:
+            if isinstance(self.vector_store, (NumpyVectorIndex, RemoteVectorStore)):
+                return self.vector_store.similarity_search_with_score(query, k=k, filter=filter)
+            # Chroma scores are distances; relevance scores are higher-is-better
+            return self.vector_store.similarity_search_with_relevance_scores(query, k=k, filter=filter)
+        except Exception as e:
+            logger.error(f"Error in similarity search: {str(e)}")
+            return []
+    
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        fetch_k: Optional[int] = None
+    ) -> List[Document]:
+        """Search with dense vectors and BM25, fused by reciprocal rank.
+        
+        Dense retrieval finds paraphrases while BM25 catches exact terms
+        such as "indemnify", statute names and dollar caps. Each retriever
+        returns ``fetch_k`` candidates and the fused top ``k`` are kept.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter: Optional metadata filter
+            fetch_k: Candidates per retriever (defaults to HYBRID_FETCH_K)
+        
+        Returns:
+            List of documents, best first
+        """
+        if self.bm25 is None:
+            return self.similarity_search(query, k=k, filter=filter)
+        
+        fetch_k = max(fetch_k or settings.HYBRID_FETCH_K, k)
+        try:
+            dense_results = self.vector_store.similarity_search(query, k=fetch_k, filter=filter)
+            sparse_results = self.bm25.search(query, k=fetch_k, filter=filter)
+        except Exception as e:
+            logger.error(f"Error in hybrid search: {str(e)}")
+            return []
+        
+        documents = {self._chunk_id(doc): doc for doc in dense_results}
+        fused = reciprocal_rank_fusion(
+            [list(documents), [chunk_id for chunk_id, _ in sparse_results]],
+            k=settings.RRF_K
+        )[:k]
+        
+        missing = [chunk_id for chunk_id, _ in fused if chunk_id not in documents]
+        documents.update(self.bm25.get(missing))
+        return [documents[chunk_id] for chunk_id, _ in fused if chunk_id in documents]
+    
+    @staticmethod
+    def _chunk_id(doc: Document) -> str:
+        """Rebuild the chunk ID assigned in add_documents from chunk metadata."""
+        return f"{doc.metadata.get('document_id')}:{doc.metadata.get('chunk_index')}"
+    
+    def _backfill_bm25(self):
+        """Index chunks already in the vector collection into an empty BM25 index."""
+        if isinstance(self.vector_store, NumpyVectorIndex):
+            documents = self.vector_store.get()
+        elif settings.VECTOR_DB_TYPE == "chroma":
+            data = self.vector_store._collection.get(include=["documents", "metadatas"])
+            documents = [
+                Document(page_content=text or "", metadata=metadata or {})
+                for text, metadata in zip(data["documents"], data["metadatas"])
+            ]
+        else:
+            return
+        
+        if documents:
+            logger.info(f"Building BM25 index for {len(documents)} chunks in {self.collection_name}")
+            self.bm25.add(
+                [self._chunk_id(doc) for doc in documents],
+                [doc.page_content for doc in documents],
+                [doc.metadata for doc in documents]
+            )
+    
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """Search for similar documents for several queries at once.
+        
+        Args:
+            queries: Search queries
+            k: Number of results per query
+            filter: Optional metadata filter
+        
+        Returns:
+            Results for each query, in query order
+        """
+        try:
+            if isinstance(self.vector_store, NumpyVectorIndex):
+                return self.vector_store.similarity_search_batch(queries, k=k, filter=filter)
+            return [
+                self.vector_store.similarity_search(query, k=k, filter=filter)
+                for query in queries
+            ]
+        except Exception as e:
+            logger.error(f"Error in batch similarity search: {str(e)}")
+            return [[] for _ in queries]
+    
+    def delete_document(self, document_id: str) -> int:
+        """Delete all chunks of a document.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Number of chunks deleted
+        """
+        try:
+            if isinstance(self.vector_store, NumpyVectorIndex):
+                deleted = self.vector_store.delete_where({"document_id": document_id})
+            elif isinstance(self.vector_store, RemoteVectorStore):
+                deleted = self.vector_store.delete_document(document_id)
+            else:
+                collection = self.vector_store._collection
+                ids = collection.get(where={"document_id": document_id}, include=[])["ids"]
+                if ids:
+                    collection.delete(ids=ids)
+                deleted = len(ids)
+            
+            if self.bm25 is not None:
+                self.bm25.delete_document(document_id)
+            
+            logger.info(f"Deleted {deleted} chunks of {document_id} from {self.collection_name}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting document {document_id}: {str(e)}")
+            raise
+    
+    def list_document_ids(self) -> Dict[str, float]:
+        """List the documents that have chunks in the collection.
+        
+        Returns:
+            Mapping of document ID to its latest ``ingested_at`` timestamp
+            (0.0 for chunks written before timestamps were recorded)
+        """
+        if isinstance(self.vector_store, NumpyVectorIndex):
+            metadatas = [doc.metadata for doc in self.vector_store.get()]
+        elif settings.VECTOR_DB_TYPE == "chroma":
+            metadatas = self.vector_store._collection.get(include=["metadatas"])["metadatas"]
+        elif isinstance(self.vector_store, RemoteVectorStore):
+            # Chunk IDs carry the document ID; the first chunk has the timestamp
+            document_ids = {chunk_id.rsplit(":", 1)[0] for chunk_id in self.vector_store.list_ids()}
+            first_chunks = self.vector_store.fetch([f"{document_id}:0" for document_id in document_ids])
+            metadatas = [
+                {"document_id": document_id, **getattr(first_chunks.get(f"{document_id}:0"), "metadata", {})}
+                for document_id in document_ids
+            ]
+        else:
+            raise NotImplementedError(f"Listing documents is not supported for {settings.VECTOR_DB_TYPE}")
+        
+        documents: Dict[str, float] = {}
+        for metadata in metadatas:
+            document_id = (metadata or {}).get("document_id")
+            if document_id:
+                ingested_at = float(metadata.get("ingested_at") or 0.0)
+                documents[document_id] = max(documents.get(document_id, 0.0), ingested_at)
+        return documents
+    
+    def count(self) -> int:
+        """Number of chunks in the collection."""
+        if isinstance(self.vector_store, (NumpyVectorIndex, RemoteVectorStore)):
+            return self.vector_store.count()
+        if settings.VECTOR_DB_TYPE == "chroma":
+            return self.vector_store._collection.count()
+        raise NotImplementedError(f"Counting chunks is not supported for {settings.VECTOR_DB_TYPE}")
+    
+    def stats(self, latency_samples: int = 20) -> Dict[str, Any]:
+        """Measure collection size and search latency.
+        
+        Args:
+            latency_samples: Number of timed searches
+        
+        Returns:
+            Chunk count, bytes on disk and median/max search latency in ms
+        """
+        if isinstance(self.vector_store, NumpyVectorIndex):
+            paths = [self.vector_store.persist_directory]
+        elif isinstance(self.vector_store, RemoteVectorStore):
+            paths = []
+        else:
+            # Chroma keeps every collection in one persist directory
+            paths = [Path(settings.VECTOR_STORE_DIR)]
+        if self.bm25 is not None:
+            paths.append(self.bm25.db_path)
+        
+        # Time the index lookup alone; the query is embedded once up front
+        query_vector = self.embeddings.embed_query("termination liability payment confidentiality")
+        latencies = []
+        for _ in range(latency_samples):
+            start = time.perf_counter()
+            self.vector_store.similarity_search_by_vector(query_vector, k=4)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        
+        return {
+            "chunks": self.count(),
+            "disk_bytes": sum(_disk_usage(path) for path in paths),
+            "search_ms_p50": round(latencies[len(latencies) // 2], 3) if latencies else 0.0,
+            "search_ms_max": round(latencies[-1], 3) if latencies else 0.0
+        }
+    
+    def compact(self) -> Dict[str, Any]:
+        """Reclaim space left by deleted chunks.
+        
+        The BM25 index, which opens a connection per call, is vacuumed. The
+        NumPy index is rewritten on every change and needs no compaction.
+        Chroma's files are held open by every live client in the process,
+        so they are left alone here.
+        
+        Returns:
+            Collection stats before and after compaction
+        """
+        before = self.stats()
+        
+        if self.bm25 is not None:
+            _vacuum(self.bm25.db_path)
+        
+        after = self.stats()
+        logger.info(
+            f"Compacted {self.collection_name}: {before['disk_bytes']} -> {after['disk_bytes']} bytes, "
+            f"search p50 {before['search_ms_p50']} -> {after['search_ms_p50']} ms"
+        )
+        return {"collection": self.collection_name, "before": before, "after": after}
+    
     def get_document_by_id(self, document_id: str) -> Optional[Document]:
         """Get a document by its ID.
         
         Args:
             document_id: Document ID
-            
+        
         Returns:
             Document if found, None otherwise
         """
@@ -149,6 +429,34 @@ class VectorStore:
             logger.error(f"Error getting document by ID: {str(e)}")
             return None
     
+    def get_document_chunks(self, document_id: str) -> List[Document]:
+        """Get every chunk of a document in chunk order.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Document chunks, empty if the document is unknown
+        """
+        try:
+            if isinstance(self.vector_store, NumpyVectorIndex):
+                chunks = self.vector_store.get({"document_id": document_id})
+            elif isinstance(self.vector_store, RemoteVectorStore):
+                chunks = self.vector_store.get_document_chunks(document_id)
+            else:
+                data = self.vector_store._collection.get(
+                    where={"document_id": document_id},
+                    include=["documents", "metadatas"]
+                )
+                chunks = [
+                    Document(page_content=text or "", metadata=metadata or {})
+                    for text, metadata in zip(data["documents"], data["metadatas"])
+                ]
+            return sorted(chunks, key=lambda chunk: chunk.metadata.get("chunk_index", 0))
+        except Exception as e:
+            logger.error(f"Error getting chunks of {document_id}: {str(e)}")
+            return []
+    
     def get_all_documents(self) -> List[Document]:
         """Get all documents in the collection.
         
@@ -167,7 +475,7 @@ class VectorStore:
         except Exception as e:
             logger.error(f"Error getting all documents: {str(e)}")
             return []
-
+    
     def delete_collection(self) -> bool:
         """Delete the collection.
         
@@ -175,10 +483,9 @@ class VectorStore:
             True if successful
         """
         try:
-            if settings.VECTOR_DB_TYPE == "pinecone":
-                pinecone.delete_index(self.collection_name)
-            else:
-                self.vector_store.delete_collection()
+            self.vector_store.delete_collection()
+            if self.bm25 is not None:
+                self.bm25.clear()
             return True
         except Exception as e:
             logger.error(f"Error deleting collection: {str(e)}")
@@ -188,13 +495,18 @@ class VectorStore:
     def chunk_document(text: str, metadata: Dict[str, Any] = None) -> List[Document]:
         """Split a document into chunks.
         
+        Uses the section-aware chunker unless CHUNKER is "recursive".
+        
         Args:
             text: Document text
             metadata: Optional metadata
-            
+        
         Returns:
             List of document chunks
         """
+        if settings.CHUNKER == "section":
+            return get_chunker().split(text, metadata)
+        
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.CHUNK_SIZE,
             chunk_overlap=settings.CHUNK_OVERLAP,
@@ -203,32 +515,24 @@ class VectorStore:
         )
         
         docs = text_splitter.create_documents([text], [metadata or {}])
-        return docs
+        return docs 
 
-    def similarity_search(self, query: str, k: int = 3) -> List[Document]:
-        """Search for similar documents using semantic similarity.
-        
-        Args:
-            query: The search query
-            k: Number of results to return
-            
-        Returns:
-            List of similar documents
-        """
-        try:
-            # For Chroma, use similarity search
-            if settings.VECTOR_DB_TYPE == "chroma":
-                return self.vector_store.similarity_search(
-                    query=query,
-                    k=k
-                )
-            # For Pinecone, use similarity search
-            else:
-                return self.vector_store.similarity_search(
-                    query=query,
-                    k=k
-                )
-            
-        except Exception as e:
-            logger.error(f"Error in similarity search: {str(e)}")
-            return [] 
\ No newline at end of file
+def _disk_usage(path: Path) -> int:
+    """Total size in bytes of a file (with SQLite side files) or directory tree."""
+    path = Path(path)
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return sum(
+        p.stat().st_size
+        for p in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm"))
+        if p.exists()
+    )
+
+def _vacuum(db_path: Path):
+    """Checkpoint the WAL and rebuild a SQLite database file."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
\ No newline at end of file
@@ -56,6 +56,33 @@ def upload_contract(file, document_type):
     response = requests.post(f"{API_URL}/api/contracts/upload", files=files, data=data)
     return response.json()
 
+def stream_contract_analysis(file, document_type):
+    """Upload a contract and yield (event, data) pairs as the API streams analysis progress."""
+    files = {
+        "file": (
+            file.name,
+            file.getvalue(),
+            file.type if hasattr(file, 'type') else "application/octet-stream"
+        )
+    }
+    data = {"document_type": document_type.value}
+    with requests.post(
+        f"{API_URL}/api/contracts/upload/stream",
+        files=files,
+        data=data,
+        stream=True
+    ) as response:
+        response.raise_for_status()
+        event = "message"
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                yield event, json.loads(line[len("data:"):].strip())
+                event = "message"
+
 def upload_policy(file):
     """Upload a policy document to the API."""
     files = {"file": file}
@@ -95,66 +122,69 @@ if page == "Upload Contract":
         submit_button = st.form_submit_button("Upload")
         
         if submit_button and uploaded_file is not None:
-            with st.spinner("Uploading contract..."):
+            if analyze_now:
+                # Stream analysis so results appear as each stage finishes
+                status = st.empty()
+                metrics = st.empty()
+                clause_table = st.empty()
+                summary_box = st.empty()
+                status.info("Uploading contract...")
+                
                 try:
-                    # Upload contract
-                    response = upload_contract(uploaded_file, document_type)
-                    st.success(f"Contract uploaded successfully! File ID: {response['file_id']}")
-                    
-                    # Analyze contract if requested
-                    if analyze_now:
-                        with st.spinner("Analyzing contract... This may take a minute."):
-                            try:
-                                analysis = analyze_contract(response['file_id'], document_type)
-                                
-                                # Display analysis
-                                st.subheader("Contract Analysis")
-                                
-                                # Basic info
-                                col1, col2, col3 = st.columns(3)
-                                col1.metric("Overall Risk Level", format_risk_level(analysis['overall_risk_level']))
-                                col2.metric("Risk Score", f"{analysis['overall_risk_score']:.2f}")
-                                col3.metric("Clauses Analyzed", len(analysis['clauses']))
-                                
-                                # Summary
-                                st.subheader("Executive Summary")
-                                st.write(analysis['summary'])
-                                
-                                # Recommendations
-                                st.subheader("Recommendations")
-                                for rec in analysis['recommendations']:
-                                    st.write(f"• {rec}")
-                                
-                                # Risk assessments
-                                st.subheader("Clause Risk Assessment")
-                                
-                                # Create a DataFrame for the clauses
-                                clause_data = []
-                                for clause in analysis['clauses']:
-                                    # Find corresponding risk assessment
-                                    risk = next((r for r in analysis['risk_assessments'] 
-                                                if r['clause_id'] == clause['clause_id']), None)
-                                    
-                                    if risk:
-                                        clause_data.append({
-                                            "Type": clause['clause_type'].capitalize(),
-                                            "Risk Level": risk['risk_level'].upper(),
-                                            "Risk Score": f"{risk['risk_score']:.2f}",
-                                            "Text": clause['text'][:100] + "..." if len(clause['text']) > 100 else clause['text']
-                                        })
-                                
-                                # Display as a table
-                                if clause_data:
-                                    df = pd.DataFrame(clause_data)
-                                    st.dataframe(df)
-                                else:
-                                    st.info("No clauses found in the contract.")
-                                
-                            except Exception as e:
-                                st.error(f"Error analyzing contract: {str(e)}")
+                    clause_types = {}
+                    clause_texts = {}
+                    clause_data = []
+                    summary_text = ""
                     
+                    for event, data in stream_contract_analysis(uploaded_file, document_type):
+                        if event == "ingested":
+                            st.success(f"Contract uploaded successfully! File ID: {data['contract_id']}")
+                            status.info("Extracting clauses...")
+                        elif event == "clauses":
+                            for clause in data['clauses']:
+                                clause_types[clause['clause_id']] = clause['clause_type']
+                                clause_texts[clause['clause_id']] = clause['text']
+                            status.info(f"Found {len(data['clauses'])} clauses. Checking policies...")
+                        elif event == "risk":
+                            text = clause_texts.get(data['clause_id'], "")
+                            clause_data.append({
+                                "Type": clause_types.get(data['clause_id'], data['clause_type']).capitalize(),
+                                "Risk Level": data['risk_level'].upper(),
+                                "Risk Score": f"{data['risk_score']:.2f}",
+                                "Text": text[:100] + "..." if len(text) > 100 else text
+                            })
+                            clause_table.dataframe(pd.DataFrame(clause_data))
+                            status.info(f"Assessed {len(clause_data)} of {len(clause_types)} clauses...")
+                        elif event == "overall_risk":
+                            col1, col2, col3 = metrics.columns(3)
+                            col1.metric("Overall Risk Level", format_risk_level(data['overall_risk_level']))
+                            col2.metric("Risk Score", f"{data['overall_risk_score']:.2f}")
+                            col3.metric("Clauses Analyzed", len(clause_types))
+                            status.info("Suggesting amendments...")
+                        elif event == "amendments":
+                            status.info("Writing executive summary...")
+                        elif event == "summary_token":
+                            summary_text += data['text']
+                            summary_box.markdown(f"### Executive Summary\n\n{summary_text}")
+                        elif event == "complete":
+                            status.empty()
+                            if not clause_data:
+                                clause_table.info("No clauses found in the contract.")
+                            st.subheader("Recommendations")
+                            for rec in data['recommendations']:
+                                st.write(f"• {rec}")
+                        elif event == "error":
+                            status.error(f"Error analyzing contract: {data['detail']}")
+                
                 except Exception as e:
-                    st.error(f"Error uploading contract: {str(e)}")
+                    status.error(f"Error analyzing contract: {str(e)}")
+            else:
+                with st.spinner("Uploading contract..."):
+                    try:
+                        response = upload_contract(uploaded_file, document_type)
+                        st.success(f"Contract uploaded successfully! File ID: {response['file_id']}")
+                    except Exception as e:
+                        st.error(f"Error uploading contract: {str(e)}")
 
 elif page == "Upload Policy":
     st.title("Upload Policy Document")
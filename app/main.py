@@ -5,7 +5,9 @@ from pathlib import Path
 import logging
 import os
 
-from app.api import contracts, policies, analysis
+from app.api import contracts, policies, analysis, ingest, maintenance
+from app.core.llm import get_llm_call_stats
+from app.database.embeddings import get_embedding_cache_stats
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +45,18 @@ app.mount("/static", StaticFiles(directory="public"), name="static")
 app.include_router(contracts.router, prefix="/api/contracts", tags=["contracts"])
 app.include_router(policies.router, prefix="/api/policies", tags=["policies"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["analysis"])
+app.include_router(ingest.router, prefix="/api/ingest", tags=["ingest"])
+app.include_router(maintenance.router, prefix="/api/maintenance", tags=["maintenance"])
+
+@app.on_event("startup")
+async def start_background_tasks():
+    """Start the vector store garbage collector."""
+    maintenance.maintenance.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    """Stop the vector store garbage collector."""
+    maintenance.maintenance.stop()
 
 @app.get("/", tags=["root"])
 async def read_root():
@@ -54,6 +68,16 @@ async def read_root():
         "status": "operational"
     }
 
+@app.get("/metrics/embeddings", tags=["root"])
+async def embedding_metrics():
+    """Embedding cache hit rates for the loaded models."""
+    return {"models": get_embedding_cache_stats()}
+
+@app.get("/metrics/llm", tags=["root"])
+async def llm_metrics():
+    """LLM retries, hedges, latencies and rate limiter state per model."""
+    return {"models": get_llm_call_stats()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
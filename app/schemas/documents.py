@@ -143,6 +143,30 @@ class UploadResponse(BaseModel):
     message: str = "File uploaded successfully"
 
 
+class BatchIngestRequest(BaseModel):
+    """Request to ingest every document under a server-side path.
+    
+    The path is relative to INGEST_ROOT and must resolve inside it.
+    """
+    path: str
+    document_type: DocumentType = DocumentType.CONTRACT
+    force: bool = False
+
+
+class BatchIngestReport(BaseModel):
+    """Outcome and throughput of a batch ingestion run."""
+    total_files: int = 0
+    ingested: int = 0
+    skipped: int = 0
+    failed: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    docs_per_second: float = 0.0
+    chunks_per_second: float = 0.0
+    document_ids: List[str] = []
+    errors: List[str] = []
+
+
 class ErrorResponse(BaseModel):
     """Standard error response model."""
     status: str = "error"
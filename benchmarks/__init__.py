@@ -0,0 +1 @@
+"""Benchmarks for ContractIQ."""
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""Benchmark streaming DOCX extraction against PDF extraction of the same content.
+
+Usage:
+    python -m benchmarks.docx_extraction --pages 50 300 800 --repeat 3
+
+Generates a synthetic contract of the requested number of pages as both a
+DOCX (numbered clause headings, one page break per page) and a PDF, then
+reports for each format the best wall time, the peak Python allocation
+during extraction and how many numbered sections the section chunker
+found in the extracted text.
+"""
+import zipfile
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from app.core.extraction import extract_from_docx, extract_from_pdf
+from app.database.chunking import SECTION_HEADING
+from benchmarks.pdf_extraction import CLAUSE, best_of, build_pdf
+
+BODY = CLAUSE.split(". ", 1)[1]
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>"""
+
+RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+STYLES = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles {W_NS}>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/>
+<w:pPr><w:numPr><w:numId w:val="1"/></w:numPr></w:pPr></w:style>
+</w:styles>"""
+
+NUMBERING = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:numbering {W_NS}>
+<w:abstractNum w:abstractNumId="0">
+<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1."/><w:pStyle w:val="Heading1"/></w:lvl>
+</w:abstractNum>
+<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>
+</w:numbering>"""
+
+def build_docx(path: Path, pages: int):
+    """Write a synthetic DOCX with ten numbered clauses per page."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", RELS)
+        archive.writestr("word/styles.xml", STYLES)
+        archive.writestr("word/numbering.xml", NUMBERING)
+        
+        paragraphs = []
+        for page_num in range(pages):
+            for i in range(10):
+                heading, body = BODY.split(". ", 1)
+                paragraphs.append(
+                    f'<w:p><w:pPr><w:pStyle w:val="Heading1"/></w:pPr><w:r><w:t>{escape(heading)}.</w:t></w:r>'
+                    f'<w:r><w:t xml:space="preserve"> {escape(body)}</w:t></w:r></w:p>'
+                )
+            if page_num < pages - 1:
+                paragraphs.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        archive.writestr(
+            "word/document.xml",
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document {W_NS}><w:body>{"".join(paragraphs)}</w:body></w:document>'
+        )
+
+def peak_allocation(fn) -> int:
+    """Peak bytes allocated by Python while fn runs."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="DOCX vs. PDF extraction benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 300, 800])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            docx_path = Path(tmp) / f"contract_{pages}.docx"
+            pdf_path = Path(tmp) / f"contract_{pages}.pdf"
+            build_docx(docx_path, pages)
+            build_pdf(pdf_path, pages)
+            
+            print(f"{pages} pages:")
+            for name, fn in (
+                ("docx", lambda: extract_from_docx(str(docx_path))),
+                ("pdf", lambda: extract_from_pdf(str(pdf_path), parallel=False)),
+            ):
+                text, metadata = fn()
+                sections = len(SECTION_HEADING.findall(text))
+                seconds = best_of(fn, args.repeat)
+                peak = peak_allocation(fn)
+                print(f"  {name:<5} {seconds * 1000:8.1f} ms, peak {peak / 1e6:7.2f} MB, "
+                      f"{metadata['page_count']:4d} pages, {sections:5d} sections detected")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
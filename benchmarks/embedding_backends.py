@@ -0,0 +1,99 @@
+"""Compare embedding backends on throughput, memory and retrieval agreement.
+
+Usage:
+    python -m benchmarks.embedding_backends --backends torch int8 onnx onnx-int8 --k 5
+
+Each backend runs in its own process so peak RSS is measured in isolation.
+Chunks of ``example_docs`` are embedded with every backend; the first
+backend is the reference. For the others the benchmark reports the mean and
+minimum cosine similarity to the reference vectors and, for one query per
+clause type, the overlap of the top-k chunks retrieved.
+"""
+import time
+import resource
+import argparse
+import multiprocessing
+import numpy as np
+
+from app.core.config import settings, BASE_DIR
+from app.database.vector_store import VectorStore
+
+def load_chunks():
+    """Chunk the example documents with the configured chunker."""
+    texts = []
+    for path in sorted((BASE_DIR / "example_docs").glob("*.txt")):
+        chunks = VectorStore.chunk_document(path.read_text(encoding="utf-8"), {"source": path.name})
+        texts.extend(chunk.page_content for chunk in chunks)
+    if not texts:
+        raise SystemExit("No example documents found")
+    return texts
+
+def run_backend(model_spec, texts, queries, repeats):
+    """Load one backend and embed the texts; runs in a child process."""
+    from app.database.embeddings import _load_embeddings
+    
+    start = time.perf_counter()
+    embeddings = _load_embeddings(model_spec)
+    load_seconds = time.perf_counter() - start
+    
+    embeddings.embed_documents(texts[:8])  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        vectors = embeddings.embed_documents(texts)
+    embed_seconds = (time.perf_counter() - start) / repeats
+    
+    query_vectors = embeddings.embed_documents(queries)
+    return {
+        "load_seconds": load_seconds,
+        "chunks_per_second": len(texts) / embed_seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "vectors": np.asarray(vectors, dtype=np.float32),
+        "query_vectors": np.asarray(query_vectors, dtype=np.float32),
+    }
+
+def unit(matrix):
+    """L2-normalize the rows of a matrix."""
+    return matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+
+def top_k(query_vectors, vectors, k):
+    """Indices of the k most similar chunks for each query."""
+    scores = unit(query_vectors) @ unit(vectors).T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding backend comparison")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx", "onnx-int8"])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    
+    texts = load_chunks()
+    queries = [f"{clause_type.replace('_', ' ')} clause" for clause_type in settings.CLAUSE_TYPES]
+    context = multiprocessing.get_context("spawn")
+    
+    results = {}
+    for backend in args.backends:
+        model_spec = args.model if backend == "torch" else f"{backend}:{args.model}"
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(run_backend, (model_spec, texts, queries, args.repeats))
+    
+    reference_name = args.backends[0]
+    reference = results[reference_name]
+    reference_top = top_k(reference["query_vectors"], reference["vectors"], args.k)
+    
+    print(f"Model: {args.model}, {len(texts)} chunks, {len(queries)} queries, reference: {reference_name}")
+    print(f"{'backend':<10} {'dim':>5} {'load s':>7} {'chunks/s':>9} {'peak MB':>8} "
+          f"{'cos mean':>9} {'cos min':>8} {f'top-{args.k}':>6}")
+    for backend, result in results.items():
+        cosine = (unit(result["vectors"]) * unit(reference["vectors"])).sum(axis=1)
+        backend_top = top_k(result["query_vectors"], result["vectors"], args.k)
+        overlap = np.mean([
+            len(set(a) & set(b)) / args.k for a, b in zip(backend_top, reference_top)
+        ])
+        print(f"{backend:<10} {result['vectors'].shape[1]:>5} {result['load_seconds']:>7.2f} "
+              f"{result['chunks_per_second']:>9.1f} {result['peak_rss_mb']:>8.0f} "
+              f"{cosine.mean():>9.4f} {cosine.min():>8.4f} {overlap:>6.2f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
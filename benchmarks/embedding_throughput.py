@@ -0,0 +1,53 @@
+"""Benchmark embedding throughput (chunks/sec) on CPU.
+
+Usage:
+    python -m benchmarks.embedding_throughput --chunks 512 --batch-sizes 16 32 64 128 --threads 1 4
+
+Chunks ``example_docs`` with the configured chunker, repeats them up to
+``--chunks`` texts and encodes them with each batch size and thread count,
+reporting chunks/sec for the embedding step alone.
+"""
+import os
+import time
+import argparse
+
+from app.core.config import settings, BASE_DIR
+from app.database.vector_store import VectorStore
+
+def load_chunks(count: int):
+    """Chunk the example documents and repeat them to the requested count."""
+    texts = []
+    for path in sorted((BASE_DIR / "example_docs").glob("*.txt")):
+        chunks = VectorStore.chunk_document(path.read_text(encoding="utf-8"), {"source": path.name})
+        texts.extend(chunk.page_content for chunk in chunks)
+    if not texts:
+        raise SystemExit("No example documents found")
+    return (texts * (count // len(texts) + 1))[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding throughput benchmark")
+    parser.add_argument("--chunks", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--threads", type=int, nargs="+", default=[os.cpu_count() or 1])
+    parser.add_argument("--normalize", action="store_true")
+    args = parser.parse_args()
+    
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
+    texts = load_chunks(args.chunks)
+    model = SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu")
+    model.encode(texts[:8])  # warm up
+    
+    print(f"Model: {settings.EMBEDDING_MODEL}, {len(texts)} chunks, CPU count {os.cpu_count()}")
+    for threads in args.threads:
+        torch.set_num_threads(threads)
+        for batch_size in args.batch_sizes:
+            start = time.perf_counter()
+            model.encode(texts, batch_size=batch_size, normalize_embeddings=args.normalize)
+            elapsed = time.perf_counter() - start
+            print(f"threads={threads:2d} batch_size={batch_size:4d}: "
+                  f"{len(texts) / elapsed:8.1f} chunks/sec ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
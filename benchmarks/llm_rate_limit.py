@@ -0,0 +1,125 @@
+"""Benchmark the client-side LLM rate limiter against a simulated quota.
+
+Usage:
+    python -m benchmarks.llm_rate_limit --rpm 600 --tpm 120000 --workers 32 --seconds 10
+
+Simulates a provider that enforces per-minute request and token quotas
+over a sliding window and answers with 429 when a call would exceed them.
+A pool of workers (concurrent contract analyses) sends calls as fast as it
+can, first unthrottled, where a 429 becomes an error fallback as in the
+agents, then through RateLimiter with the same retry-on-429 loop as
+GroqChatModel.complete. The quota window is shortened to the run length.
+Reports completed calls per minute against the quota ceiling, the 429s,
+the error fallbacks and the final concurrency limit.
+"""
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.rate_limit import RateLimiter
+
+class RateLimitError(Exception):
+    """429 from the simulated provider."""
+    
+    status_code = 429
+
+class SimulatedProvider:
+    """Provider enforcing request and token quotas over a sliding minute."""
+    
+    def __init__(self, rpm: int, tpm: int, latency: float, window: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.latency = latency
+        self.window = window
+        self.calls = deque()
+        self.lock = threading.Lock()
+    
+    def complete(self, tokens: int):
+        now = time.monotonic()
+        with self.lock:
+            while self.calls and self.calls[0][0] < now - self.window:
+                self.calls.popleft()
+            used = sum(call_tokens for _, call_tokens in self.calls)
+            if len(self.calls) + 1 > self.rpm or used + tokens > self.tpm:
+                raise RateLimitError()
+            self.calls.append((now, tokens))
+        time.sleep(self.latency * random.uniform(0.5, 1.5))
+
+def run(provider: SimulatedProvider, limiter, workers: int, seconds: float, tokens: int):
+    """Send calls from every worker until the time is up, counting calls that finish in time."""
+    counts = {"completed": 0, "throttled": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+    
+    def worker():
+        while time.monotonic() < deadline:
+            attempt = 0
+            while time.monotonic() < deadline:
+                started = limiter.acquire(tokens) if limiter else 0.0
+                try:
+                    provider.complete(tokens)
+                except RateLimitError:
+                    with lock:
+                        counts["throttled"] += 1
+                    if limiter:
+                        limiter.release(started, tokens, throttled=True)
+                        if attempt < 5:
+                            attempt += 1
+                            continue
+                    with lock:
+                        counts["errors"] += 1
+                    break
+                if limiter:
+                    limiter.release(started, tokens, used_tokens=tokens)
+                if time.monotonic() < deadline:
+                    with lock:
+                        counts["completed"] += 1
+                break
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in range(workers):
+            pool.submit(worker)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpm", type=int, default=600, help="Requests per minute quota")
+    parser.add_argument("--tpm", type=int, default=120000, help="Tokens per minute quota")
+    parser.add_argument("--tokens", type=int, default=300, help="Tokens per call")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean seconds per call")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    
+    # A one-minute window would need minutes per run; scale the quota to a window of --seconds
+    scale = args.seconds / 60.0
+    rpm = max(1, int(args.rpm * scale))
+    tpm = max(args.tokens, int(args.tpm * scale))
+    ceiling = min(args.rpm, args.tpm / args.tokens)
+    
+    print(f"{'mode':<12} {'calls/min':>10} {'of quota':>9} {'429s':>9} {'errors':>7} {'limit':>6}")
+    for mode in ("unthrottled", "limited"):
+        provider = SimulatedProvider(rpm, tpm, args.latency, args.seconds)
+        limiter = None
+        if mode == "limited":
+            limiter = RateLimiter(
+                args.rpm,
+                args.tpm,
+                max_concurrency=args.workers,
+                latency_target=args.latency * 4,
+                burst_seconds=10 * scale
+            )
+        random.seed(0)
+        counts = run(provider, limiter, args.workers, args.seconds, args.tokens)
+        per_minute = counts["completed"] / scale
+        limit = int(limiter.concurrency.limit) if limiter else "-"
+        print(
+            f"{mode:<12} {per_minute:>10.0f} {per_minute / ceiling:>8.0%} "
+            f"{counts['throttled']:>9} {counts['errors']:>7} {limit:>6}"
+        )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
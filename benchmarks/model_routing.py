@@ -0,0 +1,159 @@
+"""Evaluate per-task model routing on the recorded analysis results.
+
+Usage:
+    python -m benchmarks.model_routing --results results --tasks refinement risk
+
+Replays the clauses recorded under ``results/run*/clauses`` through clause
+refinement, and the same clauses through risk assessment, with three
+configurations:
+
+- large: every call on the large model (LLM_ESCALATION_MODEL)
+- small: every call on the small model, never escalated
+- routed: the small model, escalated to the large one by the agents' rules
+  (rejections and ungrounded refinements; risk answers without a level)
+
+For each configuration it reports mean and p95 latency per clause, tokens
+spent, escalations and agreement with the large model: the same
+valid/NOT_VALID verdict and the mean text similarity for refinement, the
+same risk level for risk assessment. Risk levels are also compared with the
+level recorded in ``results/run*/risks``. Runs outside the serving path but
+calls Groq, so GROQ_API_KEY must be set. The recorded results carry no
+policy text, so risk assessment runs without policy references.
+"""
+import json
+import time
+import argparse
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings, BASE_DIR
+from app.core.llm import GroqChatModel, get_llm_call_stats
+from app.core.routing import task_model
+from app.schemas.documents import ClauseType, ExtractedClause
+
+def load_cases(results_dir: Path) -> List[Dict[str, Any]]:
+    """Collect distinct recorded clauses with the risk level recorded for their type."""
+    cases = {}
+    for clauses_file in sorted(results_dir.glob("run*/clauses/*_clauses.json")):
+        label = clauses_file.stem[:-len("_clauses")]
+        risks_file = clauses_file.parent.parent / "risks" / f"{label}_risks.json"
+        try:
+            clauses = json.loads(clauses_file.read_text()).get("clauses", [])
+            risks = json.loads(risks_file.read_text()).get("risk_assessments", []) if risks_file.exists() else []
+        except ValueError:
+            continue
+        
+        levels = {risk["clause_type"]: risk["risk_level"] for risk in risks}
+        for clause in clauses:
+            cases.setdefault((clause["clause_type"], clause["text"]), {
+                "clause_type": clause["clause_type"],
+                "text": clause["text"],
+                "risk_level": levels.get(clause["clause_type"])
+            })
+    return list(cases.values())
+
+def model(name: str) -> GroqChatModel:
+    """Model with the agents' extraction and assessment parameters."""
+    return GroqChatModel(model_name=name, temperature=0.0, max_tokens=8192, top_p=0.9)
+
+def token_totals() -> Dict[str, int]:
+    """Tokens spent so far per model."""
+    return {
+        model_name: stats["prompt_tokens"] + stats["completion_tokens"]
+        for model_name, stats in get_llm_call_stats().items()
+    }
+
+def call_counts() -> Dict[str, int]:
+    """Calls so far per model."""
+    return {model_name: stats["calls"] for model_name, stats in get_llm_call_stats().items()}
+
+def run(agent: Any, cases: List[Dict[str, Any]], task: str, escalation_model: str) -> Dict[str, Any]:
+    """Run one task over every case, measuring latency, tokens and escalations."""
+    tokens_before = token_totals()
+    calls_before = call_counts().get(escalation_model, 0)
+    latencies = []
+    outputs = []
+    for case in cases:
+        clause_type = ClauseType(case["clause_type"])
+        start = time.perf_counter()
+        if task == "refinement":
+            outputs.append(agent._refine_clause_text(case["text"], clause_type))
+        else:
+            clause = ExtractedClause(
+                clause_id="eval",
+                clause_type=clause_type,
+                text=case["text"],
+                start_index=0,
+                end_index=len(case["text"])
+            )
+            outputs.append(agent.assess_clause_risk(clause=clause, policy_references=[]).risk_level.value)
+        latencies.append(time.perf_counter() - start)
+    
+    tokens_after = token_totals()
+    latencies.sort()
+    return {
+        "outputs": outputs,
+        "mean_latency": sum(latencies) / len(latencies),
+        "p95_latency": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "tokens": sum(tokens_after.values()) - sum(tokens_before.values()),
+        "escalation_calls": call_counts().get(escalation_model, 0) - calls_before
+    }
+
+def agreement(task: str, outputs: List[Optional[str]], reference: List[Optional[str]]) -> str:
+    """Agreement of one configuration's outputs with the reference outputs."""
+    if task == "risk":
+        same = sum(output == expected for output, expected in zip(outputs, reference))
+        return f"{same}/{len(reference)} levels"
+    
+    verdicts = sum((output is None) == (expected is None) for output, expected in zip(outputs, reference))
+    ratios = [
+        SequenceMatcher(None, " ".join(output.split()), " ".join(expected.split())).ratio()
+        for output, expected in zip(outputs, reference)
+        if output is not None and expected is not None
+    ]
+    similarity = sum(ratios) / len(ratios) if ratios else 0.0
+    return f"{verdicts}/{len(reference)} verdicts, {similarity:.2f} text"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=Path, default=BASE_DIR / "results", help="Directory of recorded runs")
+    parser.add_argument("--tasks", nargs="+", choices=["refinement", "risk"], default=["refinement", "risk"])
+    parser.add_argument("--small-model", default=task_model("clause_refinement"))
+    parser.add_argument("--large-model", default=settings.LLM_ESCALATION_MODEL)
+    parser.add_argument("--limit", type=int, default=None, help="Evaluate at most this many clauses")
+    args = parser.parse_args()
+    
+    cases = load_cases(args.results)[:args.limit]
+    if not cases:
+        raise SystemExit(f"No recorded clauses found under {args.results}")
+    print(f"{len(cases)} recorded clauses; small={args.small_model}, large={args.large_model}")
+    
+    # Agents are imported late: loading them pulls in spaCy and the vector stores
+    from app.agents.clause_extraction_agent import ClauseExtractionAgent
+    from app.agents.risk_assessment_agent import RiskAssessmentAgent
+    
+    for task in args.tasks:
+        agent = ClauseExtractionAgent() if task == "refinement" else RiskAssessmentAgent()
+        agent.cache = None
+        results = {}
+        for config in ("large", "small", "routed"):
+            agent.llm = model(args.large_model if config == "large" else args.small_model)
+            agent.escalation_llm = model(args.large_model) if config == "routed" else None
+            results[config] = run(agent, cases, task, args.large_model)
+        
+        print(f"\n{task}")
+        print(f"{'config':<8} {'mean s':>7} {'p95 s':>7} {'tokens':>8} {'escalated':>10}  agreement with large")
+        for config, result in results.items():
+            escalated = result["escalation_calls"] if config == "routed" else "-"
+            line = (
+                f"{config:<8} {result['mean_latency']:>7.2f} {result['p95_latency']:>7.2f} "
+                f"{result['tokens']:>8} {escalated:>10}  {agreement(task, result['outputs'], results['large']['outputs'])}"
+            )
+            if task == "risk":
+                recorded = [case["risk_level"] for case in cases]
+                line += f"; recorded: {agreement(task, result['outputs'], recorded)}"
+            print(line)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""Benchmark serial vs. process-pool PDF text extraction.
+
+Usage:
+    python -m benchmarks.pdf_extraction --pages 300 400 800 --repeat 3
+
+Generates synthetic contract PDFs of the requested sizes, extracts each with
+the serial and parallel paths and reports the best wall time of each.
+"""
+import time
+import argparse
+import tempfile
+import fitz  # PyMuPDF
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.extraction import extract_from_pdf, get_process_pool
+
+CLAUSE = (
+    "{n}. Limitation of Liability. In no event shall either party be liable for any "
+    "indirect, incidental, special or consequential damages arising out of this Agreement, "
+    "and the aggregate liability of either party shall not exceed the fees paid in the "
+    "twelve months preceding the claim. "
+)
+
+def build_pdf(path: Path, pages: int):
+    """Write a synthetic PDF with dense clause text on every page."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        text = "".join(CLAUSE.format(n=page_num * 10 + i) for i in range(10))
+        page.insert_textbox(fitz.Rect(40, 40, 560, 800), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+def best_of(fn, repeat: int) -> float:
+    """Run fn repeat times and return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF extraction benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 300, 800])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"Workers: {settings.PDF_EXTRACT_WORKERS}, "
+          f"parallel threshold: {settings.PDF_PARALLEL_MIN_PAGES} pages")
+    
+    # Warm the pool so worker start-up isn't charged to the first run
+    pool = get_process_pool()
+    list(pool.map(abs, range(settings.PDF_EXTRACT_WORKERS)))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = Path(tmp) / f"contract_{pages}.pdf"
+            build_pdf(path, pages)
+            
+            serial_text, _ = extract_from_pdf(str(path), parallel=False)
+            parallel_text, _ = extract_from_pdf(str(path), parallel=True)
+            assert serial_text == parallel_text, "Parallel output differs from serial output"
+            
+            serial = best_of(lambda: extract_from_pdf(str(path), parallel=False), args.repeat)
+            parallel = best_of(lambda: extract_from_pdf(str(path), parallel=True), args.repeat)
+            print(f"{pages:5d} pages: serial {serial * 1000:8.1f} ms, "
+                  f"parallel {parallel * 1000:8.1f} ms, speedup {serial / parallel:4.2f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Measure size and recall of compressed NumPy index storage.
+
+Usage:
+    python -m benchmarks.vector_compression --k 5 --rerank 5 20 100
+    python -m benchmarks.vector_compression --vectors data/embeddings/contracts/numpy/vectors.npy
+
+Builds float32, float16 and product-quantized ("pq") indexes from the same
+vectors and reports bytes on disk, bytes scanned in memory per search,
+single-query latency and recall@k against exact float32 search. PQ is
+measured at several re-rank depths; a depth equal to k is the raw
+quantized ranking.
+
+By default the vectors are embeddings of overlapping passages from the
+corpus (``example_docs``, ``data/contracts`` and ``data/policies``) with
+the configured embedding model, and a sample of passages serve as
+queries. ``--vectors`` benchmarks an existing matrix instead, such as a
+collection's ``vectors.npy``.
+"""
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from pathlib import Path
+
+from app.core.config import settings, BASE_DIR
+from app.database.numpy_index import NumpyVectorIndex
+
+CORPUS_DIRS = [BASE_DIR / "example_docs", settings.CONTRACTS_DIR, settings.POLICIES_DIR]
+
+def load_passages(words_per_passage, stride):
+    """Split corpus documents into overlapping word windows."""
+    from app.core.extraction import extract_text_and_metadata
+    
+    passages = []
+    for directory in CORPUS_DIRS:
+        for path in sorted(Path(directory).glob("*")):
+            if path.suffix.lower() not in (".txt", ".pdf", ".docx"):
+                continue
+            if path.suffix.lower() == ".txt":
+                text = path.read_text(encoding="utf-8", errors="ignore")
+            else:
+                text, _ = extract_text_and_metadata(str(path))
+            words = text.split()
+            for start in range(0, max(len(words) - words_per_passage, 0) + 1, stride):
+                passages.append(" ".join(words[start:start + words_per_passage]))
+    if not passages:
+        raise SystemExit("No corpus documents found")
+    return passages
+
+def embed_corpus(args):
+    """Embed corpus passages with the configured model."""
+    from app.database.embeddings import _load_embeddings
+    
+    passages = load_passages(args.passage_words, args.passage_words // 2)
+    print(f"Embedding {len(passages)} passages with {args.model}")
+    return np.asarray(_load_embeddings(args.model).embed_documents(passages), dtype=np.float32)
+
+def disk_bytes(directory):
+    """Total size of the index files."""
+    return sum(path.stat().st_size for path in Path(directory).iterdir() if path.is_file())
+
+def main():
+    parser = argparse.ArgumentParser(description="Compressed vector storage benchmark")
+    parser.add_argument("--vectors", help="Benchmark an existing .npy matrix instead of embedding the corpus")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--passage-words", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rerank", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--subspaces", type=int, default=settings.NUMPY_PQ_SUBSPACES)
+    args = parser.parse_args()
+    
+    vectors = np.load(args.vectors).astype(np.float32) if args.vectors else embed_corpus(args)
+    vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    rng = np.random.default_rng(42)
+    queries = vectors[rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)]
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :args.k]
+    ids = [str(i) for i in range(len(vectors))]
+    
+    configs = [("float32", None), ("float16", None)] + [("pq", rerank_k) for rerank_k in args.rerank]
+    workdir = Path(tempfile.mkdtemp(prefix="compression-bench-"))
+    try:
+        print(f"{len(vectors)} vectors x {vectors.shape[1]} dims, {len(queries)} queries")
+        print(f"{'index':<12} {'disk MB':>8} {'scan MB':>8} {'p50 ms':>8} {f'recall@{args.k}':>9}")
+        for dtype, rerank_k in configs:
+            directory = workdir / f"{dtype}-{rerank_k}"
+            index = NumpyVectorIndex(
+                None,
+                directory,
+                dtype=dtype,
+                pq_subspaces=args.subspaces,
+                rerank_k=rerank_k or args.k,
+                pq_min_train_rows=min(len(vectors), settings.NUMPY_PQ_MIN_TRAIN_ROWS)
+            )
+            index.upsert(ids, vectors, [{} for _ in ids], ["" for _ in ids])
+            
+            found, latencies = [], []
+            for query in queries:
+                start = time.perf_counter()
+                found.append([row for row, _ in index.search_vectors(query[None], args.k)[0]])
+                latencies.append((time.perf_counter() - start) * 1000)
+            recall = np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)])
+            
+            name = dtype if rerank_k is None else f"pq@{rerank_k}"
+            print(f"{name:<12} {disk_bytes(directory) / 1e6:>8.2f} {index.memory_bytes() / 1e6:>8.2f} "
+                  f"{np.percentile(latencies, 50):>8.2f} {recall:>9.3f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Compare NumPy index and Chroma search latency and recall.
+
+Usage:
+    python -m benchmarks.vector_index --sizes 1000 10000 50000 --queries 200 --k 5
+
+Builds both indexes from the same synthetic unit vectors (768 dimensions,
+clustered so neighbours are meaningful) and measures single-query latency
+(p50/p95), batched NumPy throughput and recall@k against exact
+brute-force search.
+"""
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from pathlib import Path
+
+from app.database.numpy_index import NumpyVectorIndex
+
+def make_vectors(count, dim, clusters, rng):
+    """Generate clustered unit vectors."""
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, count)] + 0.5 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def recall(found, truth):
+    """Mean fraction of the exact top-k found."""
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+def timed(search, queries):
+    """Run one search per query and return results and per-query latencies in ms."""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, np.asarray(latencies)
+
+def bench_size(size, args, rng, workdir):
+    vectors = make_vectors(size, args.dim, max(10, size // 100), rng)
+    queries = make_vectors(args.queries, args.dim, max(10, size // 100), rng)
+    ids = [str(i) for i in range(size)]
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :args.k]
+    
+    rows = []
+    for dtype in ("float32", "float16"):
+        index = NumpyVectorIndex(None, workdir / f"numpy-{dtype}-{size}", dtype=dtype)
+        start = time.perf_counter()
+        index.upsert(ids, vectors, [{"n": i} for i in range(size)], ["" for _ in ids])
+        build_seconds = time.perf_counter() - start
+        
+        found, latencies = timed(lambda q: [row for row, _ in index.search_vectors(q[None], args.k)[0]], queries)
+        start = time.perf_counter()
+        index.search_vectors(queries, args.k)
+        batch_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        rows.append((f"numpy-{dtype}", build_seconds, latencies, batch_ms, recall(found, truth)))
+    
+    try:
+        import chromadb
+        from chromadb.config import Settings
+    except ImportError:
+        print("chromadb not installed, skipping Chroma")
+    else:
+        client = chromadb.PersistentClient(
+            path=str(workdir / f"chroma-{size}"),
+            settings=Settings(anonymized_telemetry=False)
+        )
+        collection = client.create_collection(f"bench_{size}", metadata={"hnsw:space": "cosine"})
+        batch_size = getattr(client, "max_batch_size", 5000) or 5000
+        start = time.perf_counter()
+        for offset in range(0, size, batch_size):
+            collection.add(
+                ids=ids[offset:offset + batch_size],
+                embeddings=vectors[offset:offset + batch_size].tolist(),
+                metadatas=[{"n": i} for i in range(offset, min(offset + batch_size, size))]
+            )
+        build_seconds = time.perf_counter() - start
+        
+        found, latencies = timed(
+            lambda q: [int(i) for i in collection.query(query_embeddings=[q.tolist()], n_results=args.k)["ids"][0]],
+            queries
+        )
+        start = time.perf_counter()
+        collection.query(query_embeddings=queries.tolist(), n_results=args.k)
+        batch_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        rows.append(("chroma-hnsw", build_seconds, latencies, batch_ms, recall(found, truth)))
+    
+    for name, build_seconds, latencies, batch_ms, recall_at_k in rows:
+        print(f"{size:>7} {name:<15} {build_seconds:>8.2f} {np.percentile(latencies, 50):>8.2f} "
+              f"{np.percentile(latencies, 95):>8.2f} {batch_ms:>10.3f} {recall_at_k:>9.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector index benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(42)
+    workdir = Path(tempfile.mkdtemp(prefix="vector-bench-"))
+    try:
+        print(f"{'size':>7} {'index':<15} {'build s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'batch ms/q':>10} {f'recall@{args.k}':>9}")
+        for size in args.sizes:
+            bench_size(size, args, rng, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
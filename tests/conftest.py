@@ -0,0 +1,30 @@
+import pytest
+
+from app.core.config import settings
+
+@pytest.fixture
+def isolated_settings(tmp_path, monkeypatch):
+    """Point every store at tmp_path and use the numpy backend with fake embeddings."""
+    for name, value in {
+        "EMBEDDINGS_DIR": tmp_path / "embeddings",
+        "CATALOG_PATH": tmp_path / "catalog.sqlite3",
+        "TEXT_STORE_DIR": tmp_path / "texts",
+        "ANALYSIS_CACHE_PATH": tmp_path / "analysis_cache.sqlite3",
+        "POLICY_DEPENDENCY_PATH": tmp_path / "policy_dependencies.sqlite3",
+        "POLICY_TOPIC_INDEX_PATH": tmp_path / "policy_topics.sqlite3",
+        "CONTRACTS_DIR": tmp_path / "contracts",
+        "POLICIES_DIR": tmp_path / "policies",
+        "INGEST_ROOT": tmp_path / "ingest",
+        "VECTOR_DB_TYPE": "numpy",
+        "CONTRACT_SHARD_BY": "",
+        "EMBEDDING_CACHE_ENABLED": False,
+        "QUERY_EMBEDDING_CACHE_SIZE": 0
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    for name in ("EMBEDDINGS_DIR", "CONTRACTS_DIR", "POLICIES_DIR", "INGEST_ROOT"):
+        getattr(settings, name).mkdir(parents=True)
+    
+    embeddings = pytest.importorskip("app.database.embeddings")
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    monkeypatch.setitem(embeddings._embeddings_cache, settings.EMBEDDING_MODEL, DeterministicFakeEmbedding(size=32))
+    return settings
\ No newline at end of file
@@ -0,0 +1,40 @@
+import pytest
+
+from app.database.bm25 import BM25Index, reciprocal_rank_fusion, tokenize
+
+@pytest.fixture
+def index(tmp_path):
+    """BM25 index with a few policy chunks."""
+    index = BM25Index(tmp_path / "bm25.sqlite3")
+    index.add(
+        ["p1:0", "p1:1", "p2:0"],
+        [
+            "The vendor shall indemnify the customer against third-party claims.",
+            "Liability is capped at $1,000,000 in aggregate.",
+            "Either party may terminate this agreement with 30 days notice.",
+        ],
+        [{"document_id": "p1"}, {"document_id": "p1"}, {"document_id": "p2"}]
+    )
+    return index
+
+def test_tokenize_keeps_amounts():
+    """Test that dollar caps survive tokenization as single terms."""
+    assert "$1,000,000" in tokenize("Liability is capped at $1,000,000.")
+    assert "the" not in tokenize("The vendor")
+
+def test_search_exact_terms(index):
+    """Test that exact legal terms rank the matching chunk first."""
+    assert index.search("indemnify", k=1)[0][0] == "p1:0"
+    assert index.search("cap of $1,000,000", k=1)[0][0] == "p1:1"
+    assert index.search("indemnify", filter={"document_id": "p2"}) == []
+
+def test_incremental_delete(index):
+    """Test that deleted documents drop out of the index."""
+    assert index.delete_document("p1") == 2
+    assert index.count() == 1
+    assert index.search("indemnify") == []
+
+def test_reciprocal_rank_fusion():
+    """Test that items ranked by both retrievers come first."""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b", "d"]])
+    assert {item for item, _ in fused[:2]} == {"b", "c"}
\ No newline at end of file
@@ -0,0 +1,47 @@
+from app.database.chunking import SectionChunker
+
+def make_contract(sections, paragraph_words=40):
+    parts = []
+    for number in range(1, sections + 1):
+        parts.append(f"{number}. SECTION {number} TITLE\n")
+        for sub in range(1, 4):
+            parts.append(f"{number}.{sub} Clause {number}.{sub}: " + "term " * paragraph_words + "\n")
+        parts.append("\n")
+    return "".join(parts)
+
+def test_sections_are_not_split():
+    """Test that short sections are packed whole and never cut mid-section."""
+    text = make_contract(10)
+    chunks = SectionChunker(chunk_size=1000, chunk_overlap=200).split(text, {"document_id": "d1"})
+    
+    assert all(len(chunk.page_content) <= 1000 for chunk in chunks)
+    assert all(chunk.page_content.split(".")[0].isdigit() for chunk in chunks)
+    assert all(chunk.metadata["document_id"] == "d1" for chunk in chunks)
+    assert "".join(text[c.metadata["start_offset"]:c.metadata["end_offset"]] for c in chunks) == text
+    assert chunks[1].metadata["section"] == chunks[1].page_content.split(".")[0]
+
+def test_long_sections_split_at_subsections():
+    """Test that an over-long section is cut at its subsection headings."""
+    text = make_contract(2, paragraph_words=120)
+    chunks = SectionChunker(chunk_size=1000, chunk_overlap=200).split(text)
+    
+    assert len(chunks) > 2
+    assert all(chunk.page_content.split(" ")[0][0].isdigit() for chunk in chunks)
+    assert chunks[1].metadata["section"] == "1.2"
+
+def test_page_metadata_and_markers():
+    """Test that page markers set page metadata and are removed from chunk text."""
+    text = "".join(f"\n\n--- Page {page} ---\n\n" + "word " * 150 + "\n\n" for page in range(1, 4))
+    chunks = SectionChunker(chunk_size=1000, chunk_overlap=200).split(text)
+    
+    assert [chunk.metadata["page"] for chunk in chunks] == [1, 2, 3]
+    assert all("--- Page" not in chunk.page_content for chunk in chunks)
+
+def test_overlap_only_within_long_paragraphs():
+    """Test that unstructured text falls back to overlapping windows."""
+    chunks = SectionChunker(chunk_size=1000, chunk_overlap=200).split("word " * 1000)
+    
+    spans = [(chunk.metadata["start_offset"], chunk.metadata["end_offset"]) for chunk in chunks]
+    assert all(end - start <= 1000 for start, end in spans)
+    assert all(next_start < end for (_, end), (next_start, _) in zip(spans, spans[1:]))
+    assert spans[-1][1] == 5000
\ No newline at end of file
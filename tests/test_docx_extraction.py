@@ -0,0 +1,85 @@
+import zipfile
+
+from app.core.extraction import collect_document_files, extract_text_and_metadata
+from app.database.chunking import SectionChunker
+
+W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+NUMBERING = f"""<w:numbering {W_NS}>
+<w:abstractNum w:abstractNumId="0">
+<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1."/></w:lvl>
+<w:lvl w:ilvl="1"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1.%2"/></w:lvl>
+<w:lvl w:ilvl="2"><w:start w:val="1"/><w:numFmt w:val="lowerLetter"/><w:lvlText w:val="(%3)"/></w:lvl>
+</w:abstractNum>
+<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>
+</w:numbering>"""
+
+STYLES = f"""<w:styles {W_NS}>
+<w:style w:styleId="Heading1"><w:name w:val="heading 1"/></w:style>
+</w:styles>"""
+
+CORE = """<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties"
+ xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>Services Agreement</dc:title><dc:creator>Acme</dc:creator></cp:coreProperties>"""
+
+def paragraph(text, level=None, style=None, page_break=False):
+    """A w:p element, optionally numbered, styled or followed by a page break."""
+    properties = ""
+    if style:
+        properties += f'<w:pStyle w:val="{style}"/>'
+    if level is not None:
+        properties += f'<w:numPr><w:ilvl w:val="{level}"/><w:numId w:val="1"/></w:numPr>'
+    brk = '<w:r><w:br w:type="page"/></w:r>' if page_break else ""
+    return f"<w:p><w:pPr>{properties}</w:pPr><w:r><w:t>{text}</w:t></w:r>{brk}</w:p>"
+
+def build_docx(path, paragraphs):
+    """Write a minimal DOCX with numbering, styles and properties."""
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/numbering.xml", NUMBERING)
+        archive.writestr("word/styles.xml", STYLES)
+        archive.writestr("docProps/core.xml", CORE)
+        archive.writestr("word/document.xml", f"<w:document {W_NS}><w:body>{''.join(paragraphs)}</w:body></w:document>")
+
+def test_docx_numbering_and_pages(tmp_path):
+    """Test that list numbering, page breaks and properties are extracted."""
+    path = tmp_path / "agreement.docx"
+    build_docx(path, [
+        paragraph("DEFINITIONS", level=0, style="Heading1"),
+        paragraph("Terms have these meanings.", level=1),
+        paragraph("Affiliate means a controlled entity.", level=2),
+        paragraph("Party means a signatory.", level=2, page_break=True),
+        paragraph("PAYMENT", level=0, style="Heading1"),
+        paragraph("Fees are due in 30 days.", level=1),
+    ])
+    text, metadata = extract_text_and_metadata(str(path))
+    
+    assert text == (
+        "\n\n--- Page 1 ---\n\n"
+        "1. DEFINITIONS\n\n1.1 Terms have these meanings.\n\n"
+        "(a) Affiliate means a controlled entity.\n\n(b) Party means a signatory."
+        "\n\n--- Page 2 ---\n\n"
+        "2. PAYMENT\n\n2.1 Fees are due in 30 days."
+    )
+    assert metadata == {
+        "title": "Services Agreement",
+        "author": "Acme",
+        "page_count": 2,
+        "paragraph_count": 6,
+        "heading_count": 2,
+    }
+    
+    chunks = SectionChunker(chunk_size=60, chunk_overlap=10).split(text)
+    assert chunks[0].metadata["section"] == "1"
+    assert chunks[-1].metadata["section"] == "2" and chunks[-1].metadata["page"] == 2
+
+def test_single_docx_is_collected_not_unpacked(tmp_path):
+    """Test that a .docx source is collected as a document although it is a zip file."""
+    path = tmp_path / "agreement.docx"
+    build_docx(path, [paragraph("Fees are due in 30 days.")])
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    assert collect_document_files(path, workdir) == [path]
+    
+    archive_path = tmp_path / "batch.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.write(path, "contracts/agreement.docx")
+    assert collect_document_files(archive_path, workdir) == [workdir / "contracts" / "agreement.docx"]
\ No newline at end of file
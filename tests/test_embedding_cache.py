@@ -0,0 +1,58 @@
+import numpy as np
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.database.embedding_cache import CachedEmbeddings, EmbeddingCache, QueryEmbeddingCache
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that record every text sent to the model."""
+    
+    calls: list = []
+    
+    def embed_documents(self, texts):
+        self.calls.extend(texts)
+        return super().embed_documents(texts)
+    
+    def embed_query(self, text):
+        self.calls.append(text)
+        return super().embed_query(text)
+
+def counting(size=8):
+    """A fresh counting model."""
+    return CountingEmbeddings(size=size, calls=[])
+
+def test_document_cache_hit_skips_model(tmp_path):
+    """Test that cached texts are not re-encoded, even by a new wrapper over the same file."""
+    model = counting()
+    embeddings = CachedEmbeddings(model, "model-a", cache=EmbeddingCache(tmp_path / "cache.sqlite3"))
+    first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+    assert model.calls == ["alpha", "beta"]
+    
+    restarted = CachedEmbeddings(model, "model-a", cache=EmbeddingCache(tmp_path / "cache.sqlite3"))
+    assert np.allclose(restarted.embed_documents(["beta", "alpha", "gamma"])[:2], [first[1], first[0]])
+    assert model.calls == ["alpha", "beta", "gamma"]
+    assert restarted.cache.stats()["hits"] == 2
+
+def test_namespace_separates_models(tmp_path):
+    """Test that the same text embedded under another namespace misses the cache."""
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    small, large = counting(8), counting(16)
+    assert len(CachedEmbeddings(small, "small", cache=cache).embed_documents(["alpha"])[0]) == 8
+    assert len(CachedEmbeddings(large, "large", cache=cache).embed_documents(["alpha"])[0]) == 16
+    assert (small.calls, large.calls) == (["alpha"], ["alpha"])
+    assert EmbeddingCache.make_key("small", "alpha") != EmbeddingCache.make_key("large", "alpha")
+
+def test_query_cache_lru_and_whitespace(tmp_path):
+    """Test that whitespace variants share a query entry and the LRU evicts at capacity."""
+    model = counting()
+    embeddings = CachedEmbeddings(model, "model-a", query_cache=QueryEmbeddingCache(max_size=2))
+    vector = embeddings.embed_query("limitation of  liability")
+    assert embeddings.embed_query(" limitation of\nliability ") == vector
+    assert model.calls == ["limitation of liability"]
+    
+    embeddings.embed_query("termination")
+    embeddings.embed_query("limitation of liability")  # most recently used again
+    embeddings.embed_query("indemnity")  # evicts termination
+    assert embeddings.query_cache.stats()["entries"] == 2
+    embeddings.embed_query("limitation of liability")
+    embeddings.embed_query("termination")
+    assert model.calls == ["limitation of liability", "termination", "indemnity", "termination"]
\ No newline at end of file
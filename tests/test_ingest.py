@@ -0,0 +1,84 @@
+import os
+import zipfile
+
+import pytest
+
+from app.core.extraction import collect_document_files, resolve_ingest_path
+from app.schemas.documents import DocumentType
+
+def test_ingest_path_stays_in_root(tmp_path):
+    """Test that paths escaping the ingest root by .. or a symlink are rejected."""
+    root = tmp_path / "ingest"
+    (root / "policies").mkdir(parents=True)
+    (tmp_path / "private").mkdir()
+    os.symlink(tmp_path / "private", root / "link")
+    
+    assert resolve_ingest_path("policies", root) == (root / "policies").resolve()
+    assert resolve_ingest_path(str(root / "policies"), root) == (root / "policies").resolve()
+    for path in ("../private", "policies/../../private", "link", str(tmp_path / "private"), "/etc"):
+        with pytest.raises(PermissionError):
+            resolve_ingest_path(path, root)
+
+def test_archive_limits_checked_before_unpacking(tmp_path, monkeypatch):
+    """Test that archives over the member or decompressed size limit are not unpacked."""
+    from app.core.config import settings
+    archive_path = tmp_path / "bomb.zip"
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for n in range(3):
+            archive.writestr(f"doc{n}.txt", "0" * (1024 * 1024))
+    
+    monkeypatch.setattr(settings, "MAX_ARCHIVE_UNPACKED_MB", 2)
+    with pytest.raises(ValueError, match="unpacks to"):
+        collect_document_files(archive_path, tmp_path / "out")
+    assert not (tmp_path / "out").exists() or not any((tmp_path / "out").iterdir())
+    
+    monkeypatch.setattr(settings, "MAX_ARCHIVE_UNPACKED_MB", 4)
+    monkeypatch.setattr(settings, "MAX_ARCHIVE_MEMBERS", 2)
+    with pytest.raises(ValueError, match="files"):
+        collect_document_files(archive_path, tmp_path / "out")
+    
+    monkeypatch.setattr(settings, "MAX_ARCHIVE_MEMBERS", 3)
+    assert len(collect_document_files(archive_path, tmp_path / "out")) == 3
+
+def test_directory_ingest(isolated_settings):
+    """Test that a directory batch ingests each new file once and skips it on a rerun."""
+    from app.agents.doc_ingest_agent import DocIngestAgent
+    source = isolated_settings.INGEST_ROOT / "policies"
+    (source / "nested").mkdir(parents=True)
+    (source / "retention.txt").write_text("1. RETENTION\nRecords are kept for seven years. " * 5)
+    (source / "nested" / "privacy.md").write_text("# Privacy\nPersonal data is encrypted at rest. " * 5)
+    (source / "nested" / "copy.md").write_text("# Privacy\nPersonal data is encrypted at rest. " * 5)
+    (source / "notes.bin").write_bytes(b"\x00\x01")
+    
+    agent = DocIngestAgent()
+    file_paths = collect_document_files(resolve_ingest_path("policies"), isolated_settings.TEMP_DIR)
+    report = agent.ingest_batch(file_paths, document_type=DocumentType.POLICY)
+    assert (report.total_files, report.ingested, report.skipped, report.failed) == (3, 2, 1, 0)
+    assert report.chunks > 0
+    assert len(agent.catalog.list_documents("policies")) == 2
+    assert sorted(agent.policy_store.list_document_ids()) == sorted(report.document_ids)
+    
+    rerun = agent.ingest_batch(file_paths, document_type=DocumentType.POLICY)
+    assert (rerun.ingested, rerun.skipped) == (0, 3)
+
+def test_repeated_upload_is_deduplicated(isolated_settings):
+    """Test that an identical upload returns the existing ID and force replaces its entry and chunks."""
+    from app.agents.doc_ingest_agent import DocIngestAgent
+    path = isolated_settings.CONTRACTS_DIR / "msa.txt"
+    path.write_text("1. LIABILITY\nLiability is capped at the fees paid in the prior year. " * 5)
+    agent = DocIngestAgent()
+    
+    document_id, _ = agent.ingest_document(str(path), DocumentType.CONTRACT)
+    chunk_count = len(agent.contract_store.get_document_chunks(document_id))
+    assert chunk_count > 0
+    
+    repeated_id, metadata = agent.ingest_document(str(path), DocumentType.CONTRACT)
+    assert repeated_id == document_id == metadata.document_id
+    assert len(agent.catalog.list_documents("contracts")) == 1
+    
+    forced_id, _ = agent.ingest_document(str(path), DocumentType.CONTRACT, force=True)
+    assert forced_id != document_id
+    assert [record["document_id"] for record in agent.catalog.list_documents("contracts")] == [forced_id]
+    assert agent.contract_store.get_document_chunks(document_id) == []
+    assert len(agent.contract_store.get_document_chunks(forced_id)) == chunk_count
+    assert set(agent.contract_store.list_document_ids()) == {forced_id}
\ No newline at end of file
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+from langchain_core.documents import Document
+
+from app.database.catalog import DocumentCatalog
+from app.database.maintenance import VectorStoreMaintenance
+from app.database.text_store import DocumentTextStore
+
+class ChunkCounts:
+    """Stand-in for a VectorStore holding chunk counts and timestamps per document."""
+    
+    def __init__(self, documents):
+        self.documents = dict(documents)
+    
+    def list_document_ids(self):
+        return {document_id: ingested_at for document_id, (_, ingested_at) in self.documents.items()}
+    
+    def delete_document(self, document_id):
+        return self.documents.pop(document_id)[0]
+
+def chunks(document_id, count, ingested_at=None):
+    """Chunks of one document, written long enough ago to be collectable."""
+    ingested_at = ingested_at or time.time() - 3600
+    return [
+        Document(page_content=f"Clause {n} of {document_id}.", metadata={"document_id": document_id, "ingested_at": ingested_at})
+        for n in range(count)
+    ]
+
+def test_delete_document_removes_its_chunks(isolated_settings):
+    """Test that deleting a document leaves no chunks with its ID and keeps the others."""
+    store = pytest.importorskip("app.database.vector_store").VectorStore("contracts")
+    store.add_documents(chunks("doc-a", 3) + chunks("doc-b", 2))
+    
+    assert store.delete_document("doc-a") == 3
+    assert len(store.vector_store.get({"document_id": "doc-a"})) == 0
+    assert set(store.list_document_ids()) == {"doc-b"}
+    assert store.count() == 2
+    assert store.delete_document("doc-a") == 0
+
+def test_gc_removes_chunks_missing_from_catalog(isolated_settings, monkeypatch):
+    """Test that GC deletes orphaned chunks and texts but keeps catalogued and fresh documents."""
+    monkeypatch.setattr(isolated_settings, "VECTOR_GC_GRACE_SECONDS", 60)
+    
+    store = pytest.importorskip("app.database.vector_store").VectorStore("contracts")
+    store.add_documents(chunks("kept", 2) + chunks("orphan", 3) + chunks("in-flight", 1, ingested_at=time.time()))
+    catalog = DocumentCatalog()
+    catalog.register(
+        document_id="kept",
+        content_hash="hash-kept",
+        collection="contracts",
+        document_type="contract",
+        filename="kept.pdf",
+        title="MSA",
+        file_path="",
+        chunk_count=2
+    )
+    text_store = DocumentTextStore()
+    text_store.put("orphan", "Orphaned contract text.")
+    
+    results = VectorStoreMaintenance({"contracts": store}, catalog, text_store).collect_garbage()
+    assert results["contracts"] == {"documents": ["orphan"], "chunks": 3}
+    assert set(store.list_document_ids()) == {"kept", "in-flight"}
+    assert not text_store.exists("orphan")
+
+def test_gc_keeps_chunks_without_timestamps(tmp_path, monkeypatch):
+    """Test that chunks written before ingest timestamps existed are never collected."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "VECTOR_GC_GRACE_SECONDS", 60)
+    store = ChunkCounts({"legacy": (4, 0.0), "orphan": (2, time.time() - 3600)})
+    
+    maintenance = VectorStoreMaintenance({"policies": store}, DocumentCatalog(tmp_path / "catalog.sqlite3"), DocumentTextStore(tmp_path / "texts"))
+    assert maintenance.collect_garbage()["policies"] == {"documents": ["orphan"], "chunks": 2}
+    assert set(store.documents) == {"legacy"}
\ No newline at end of file
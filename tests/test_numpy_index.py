@@ -0,0 +1,69 @@
+import numpy as np
+
+from app.database.numpy_index import NumpyVectorIndex
+
+def make_vectors(count, dim=64, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(20, dim))
+    vectors = centers[rng.integers(0, 20, count)] + 0.3 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def make_index(path, rerank_k=50):
+    return NumpyVectorIndex(None, path, dtype="pq", pq_subspaces=16, rerank_k=rerank_k, pq_min_train_rows=500)
+
+def test_quantized_search_reranks_to_exact_results(tmp_path):
+    """Test that re-ranked PQ search finds the exact top-k and respects filters."""
+    vectors = make_vectors(1000)
+    index = make_index(tmp_path)
+    index.upsert([str(i) for i in range(1000)], vectors, [{"group": i % 2} for i in range(1000)])
+    assert index._state.codes.shape == (16, 1000)
+    assert index.memory_bytes() < vectors.nbytes / 2
+    
+    queries = vectors[:20]
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :5]
+    found = [[row for row, _ in results] for results in index.search_vectors(queries, k=5)]
+    recall = np.mean([len(set(f) & set(t)) / 5 for f, t in zip(found, truth)])
+    assert recall >= 0.9
+    
+    results = index.search_vectors(queries[:1], k=5, filter={"group": 1})[0]
+    assert results and all(int(index._state.ids[row]) % 2 == 1 for row, _ in results)
+
+def test_quantization_codes_follow_writes(tmp_path):
+    """Test that codes stay aligned through upserts, deletes and reloads."""
+    vectors = make_vectors(800)
+    index = make_index(tmp_path)
+    index.upsert([str(i) for i in range(400)], vectors[:400])
+    assert index._state.codes is None
+    
+    index.upsert([str(i) for i in range(800)], vectors)
+    index.delete([str(i) for i in range(100)])
+    assert index._state.codes.shape == (16, 700)
+    
+    reloaded = make_index(tmp_path)
+    assert reloaded._state.codes.shape == (16, 700)
+    row, score = reloaded.search_vectors(vectors[500:501], k=1)[0][0]
+    assert reloaded._state.ids[row] == "500"
+    assert score > 0.99
+
+def test_search_sees_consistent_state_during_writes(tmp_path):
+    """Test that searches racing with writes never pair a row with another row's text."""
+    import threading
+    vectors = make_vectors(200)
+    index = NumpyVectorIndex(None, tmp_path)
+    ids = [str(i) for i in range(200)]
+    index.upsert(ids, vectors, documents=ids)
+    
+    done = threading.Event()
+    def churn():
+        while not done.is_set():
+            index.delete(ids[:20])
+            index.upsert(ids[:20], vectors[:20], documents=ids[:20])
+    
+    writer = threading.Thread(target=churn)
+    writer.start()
+    try:
+        for _ in range(300):
+            assert index.similarity_search_by_vector(vectors[150].tolist(), k=1)[0].page_content == "150"
+    finally:
+        done.set()
+        writer.join()
\ No newline at end of file
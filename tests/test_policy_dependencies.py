@@ -0,0 +1,31 @@
+from app.database.policy_dependencies import PolicyDependencyStore
+
+def test_policy_change_outdates_recorded_clauses(tmp_path):
+    """Test that a corpus bump outdates records until they are re-checked."""
+    store = PolicyDependencyStore(tmp_path / "dependencies.sqlite3")
+    store.record("c1", "liability", "Liability is capped.", ["p1:2", "p1:0"])
+    store.record("c1", "termination", "Either party may terminate.", ["p2:0"])
+    store.record("c2", "liability", "Liability is capped.", ["p1:0", "p1:2"])
+    assert store.outdated() == []
+    
+    version = store.bump_corpus_version()
+    assert version == 2
+    outdated = store.outdated()
+    assert len(outdated) == 3
+    assert outdated[0]["policy_chunk_ids"] == ["p1:0", "p1:2"]
+    
+    # Unchanged retrieval keeps the result; a changed one marks the clause stale
+    termination = next(record for record in outdated if record["clause_type"] == "termination")
+    store.mark_stale(termination["contract_id"], termination["clause_key"])
+    for record in outdated:
+        if record is not termination:
+            store.mark_current(record["contract_id"], record["clause_key"], version)
+    
+    assert store.outdated() == []
+    assert [record["clause_text"] for record in store.stale()] == ["Either party may terminate."]
+    assert store.stats() == {"corpus_version": 2, "clauses": 3, "outdated": 0, "stale": 1, "contracts": 2}
+    
+    # Re-analysis records the new policy set and clears the flag
+    store.record("c1", "termination", "Either party may terminate.", ["p3:1"])
+    assert store.stale() == []
+    assert store.delete_contract("c1") == 2
\ No newline at end of file
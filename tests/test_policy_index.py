@@ -0,0 +1,30 @@
+from langchain_core.documents import Document
+
+from app.database.policy_index import PolicyTopicIndex
+
+def test_policy_chunks_indexed_by_clause_type(tmp_path):
+    """Test that policy chunks are indexed by heading or keyword clause type."""
+    index = PolicyTopicIndex(tmp_path / "topics.sqlite3")
+    chunks = [
+        Document(
+            page_content="Vendors may end the agreement on 30 days notice.",
+            metadata={"chunk_index": 0, "section_title": "Termination"}
+        ),
+        Document(
+            page_content="Liability must be capped. No liability for indirect loss; warranties limited.",
+            metadata={"chunk_index": 1, "section_title": "General"}
+        ),
+        Document(
+            page_content="Liability is mentioned once here.",
+            metadata={"chunk_index": 2}
+        ),
+    ]
+    assert index.add("p1", chunks) == 2
+    
+    topics = index.load()
+    assert set(topics) == {"termination", "liability"}
+    assert topics["liability"][0].metadata["chunk_index"] == 1
+    assert topics["termination"][0].metadata["document_id"] == "p1"
+    
+    assert index.delete_document("p1") == 2
+    assert index.count() == 0
\ No newline at end of file
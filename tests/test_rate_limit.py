@@ -0,0 +1,79 @@
+import time
+
+from app.core.rate_limit import AdaptiveConcurrency, LimitedStream, RateLimiter, TokenBucket
+
+def test_token_bucket_waits_for_refill():
+    """Test that an empty bucket waits for tokens and settles usage debt."""
+    bucket = TokenBucket(per_minute=600, capacity=2)  # 10 tokens per second
+    assert bucket.acquire(2) < 0.01
+    assert 0.05 < bucket.acquire(1) < 0.5
+    
+    bucket.adjust(1)
+    assert bucket.available < 0
+
+def test_concurrency_limit_is_aimd():
+    """Test that successes grow the limit additively and a throttled burst halves it once."""
+    concurrency = AdaptiveConcurrency(initial=4, minimum=1, maximum=8, latency_target=10.0)
+    burst = []
+    for _ in range(4):
+        concurrency.acquire()
+        burst.append(time.monotonic())
+    for started in burst:
+        concurrency.release(started, throttled=True)
+    assert concurrency.limit == 2
+    
+    for _ in range(2):
+        concurrency.acquire()
+        concurrency.release(time.monotonic())
+    assert 2.5 < concurrency.limit < 3
+    
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=0, max_concurrency=2)
+    started = limiter.acquire(100)
+    limiter.release(started, 100, throttled=True, retry_after=0.2)
+    assert limiter.requests.available < 0
+    assert limiter.stats()["throttled"] == 1
+
+def test_large_call_is_charged_in_full():
+    """Test that a call larger than the burst capacity is charged its full usage."""
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=6000, max_concurrency=8)
+    capacity = limiter.tokens.capacity
+    started = limiter.acquire(5000)
+    limiter.release(started, 5000, used_tokens=5200)
+    assert abs(limiter.tokens.available - (capacity - 5200)) < 5
+
+def test_stream_releases_slot_once():
+    """Test that a stream frees its slot when read to the end, closed unread or dropped."""
+    from types import SimpleNamespace
+    chunk = lambda text: SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0, max_concurrency=4)
+    
+    stream = LimitedStream(iter([chunk("Hello "), chunk("world")]), limiter, limiter.acquire(10), 10)
+    assert [c.choices[0].delta.content for c in stream] == ["Hello ", "world"]
+    assert limiter.concurrency.in_flight == 0
+    
+    stream = LimitedStream(iter([chunk("unread")]), limiter, limiter.acquire(10), 10)
+    assert limiter.concurrency.in_flight == 1
+    stream.close()
+    stream.close()
+    assert limiter.concurrency.in_flight == 0
+    assert list(stream) == []
+    
+    LimitedStream(iter([chunk("dropped")]), limiter, limiter.acquire(10), 10)
+    assert limiter.concurrency.in_flight == 0
+
+def test_limiters_use_per_model_quotas(monkeypatch):
+    """Test that models get their own quotas and a token burst that fits one full call."""
+    from app.core import rate_limit
+    from app.core.config import settings
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    monkeypatch.setattr(settings, "LLM_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(settings, "LLM_TOKENS_PER_MINUTE", 0)
+    monkeypatch.setattr(settings, "LLM_MODEL_QUOTAS", {"small": (30, 30000)})
+    monkeypatch.setattr(settings, "LLM_MAX_REQUEST_TOKENS", 8192)
+    
+    small = rate_limit.get_rate_limiter("small")
+    assert small.requests.rate == 0.5
+    assert small.tokens.capacity == 8192
+    large = rate_limit.get_rate_limiter("large")
+    assert large.requests is None and large.tokens is None
+    assert RateLimiter(0, 6000, 8, max_request_tokens=8192).tokens.capacity == 6000
\ No newline at end of file
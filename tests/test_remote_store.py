@@ -0,0 +1,165 @@
+import json
+import math
+import pytest
+import httpx
+from typing import List
+from langchain_core.embeddings import Embeddings
+
+from app.database.remote_store import PineconeRestClient, RemoteVectorStore, RemoteVectorStoreError
+
+class FakePinecone:
+    """In-process stand-in for the Pinecone data plane API."""
+    
+    def __init__(self, page_size: int = 2):
+        self.namespaces = {}
+        self.page_size = page_size
+        self.upsert_calls = 0
+        self.fetch_urls = []
+    
+    def _matches(self, metadata, filter):
+        for key, condition in (filter or {}).items():
+            if key == "$and":
+                if not all(self._matches(metadata, clause) for clause in condition):
+                    return False
+                continue
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for operator, value in condition.items():
+                if operator == "$eq" and metadata.get(key) != value:
+                    return False
+                if operator == "$in" and metadata.get(key) not in value:
+                    return False
+        return True
+    
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.headers.get("Api-Key") != "test-key":
+            return httpx.Response(401, json={"message": "Invalid API key"})
+        
+        path = request.url.path
+        params = request.url.params
+        body = json.loads(request.content) if request.content else {}
+        namespace = self.namespaces.setdefault(body.get("namespace", params.get("namespace", "")), {})
+        
+        if path == "/vectors/upsert":
+            self.upsert_calls += 1
+            for vector in body["vectors"]:
+                namespace[vector["id"]] = vector
+            return httpx.Response(200, json={"upsertedCount": len(body["vectors"])})
+        
+        if path == "/query":
+            def cosine(values):
+                dot = sum(a * b for a, b in zip(values, body["vector"]))
+                norm = math.sqrt(sum(a * a for a in values)) * math.sqrt(sum(b * b for b in body["vector"]))
+                return dot / norm if norm else 0.0
+            matches = [
+                {"id": vector["id"], "score": cosine(vector["values"]), "metadata": vector["metadata"]}
+                for vector in namespace.values()
+                if self._matches(vector["metadata"], body.get("filter"))
+            ]
+            matches.sort(key=lambda match: match["score"], reverse=True)
+            return httpx.Response(200, json={"matches": matches[:body["topK"]]})
+        
+        if path == "/vectors/fetch":
+            self.fetch_urls.append(str(request.url))
+            ids = params.get_list("ids")
+            return httpx.Response(200, json={"vectors": {i: namespace[i] for i in ids if i in namespace}})
+        
+        if path == "/vectors/list":
+            ids = sorted(i for i in namespace if i.startswith(params.get("prefix", "")))
+            start = int(params.get("paginationToken", 0))
+            page = ids[start:start + self.page_size]
+            result = {"vectors": [{"id": i} for i in page]}
+            if start + self.page_size < len(ids):
+                result["pagination"] = {"next": str(start + self.page_size)}
+            return httpx.Response(200, json=result)
+        
+        if path == "/vectors/delete":
+            if body.get("deleteAll"):
+                namespace.clear()
+            for vector_id in body.get("ids", []):
+                namespace.pop(vector_id, None)
+            return httpx.Response(200, json={})
+        
+        if path == "/describe_index_stats":
+            return httpx.Response(200, json={
+                "dimension": 3,
+                "namespaces": {name: {"vectorCount": len(vectors)} for name, vectors in self.namespaces.items()}
+            })
+        
+        return httpx.Response(404, json={"message": f"Unknown path {path}"})
+
+class KeywordEmbeddings(Embeddings):
+    """Deterministic 3-d embeddings keyed on a few words."""
+    
+    def embed_query(self, text: str) -> List[float]:
+        text = text.lower()
+        return [float("terminat" in text), float("pay" in text), float("confidential" in text) + 0.01]
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+@pytest.fixture
+def server():
+    return FakePinecone()
+
+def make_store(server, namespace):
+    client = PineconeRestClient("https://index.test", "test-key", transport=httpx.MockTransport(server.handler))
+    return RemoteVectorStore(KeywordEmbeddings(), namespace, client=client, upsert_batch_size=2)
+
+@pytest.fixture
+def store(server):
+    store = make_store(server, "contracts")
+    texts = ["Either party may terminate.", "Payment is due in 30 days.", "Confidential information."]
+    store.add_texts(
+        texts,
+        [{"document_id": "c1", "chunk_index": i, "clause": None} for i in range(3)],
+        ids=[f"c1:{i}" for i in range(3)]
+    )
+    store.add_texts(["Late payment fees apply."], [{"document_id": "c2", "chunk_index": 0}], ids=["c2:0"])
+    return store
+
+def test_batched_upsert_and_search(server, store):
+    """Test that upserts are batched and queries return text and metadata."""
+    assert server.upsert_calls == 3
+    results = store.similarity_search("termination rights", k=1)
+    assert results[0].page_content == "Either party may terminate."
+    assert results[0].metadata["document_id"] == "c1"
+    assert "clause" not in results[0].metadata
+
+def test_metadata_filtered_queries(store):
+    """Test that metadata filters restrict query results."""
+    results = store.similarity_search("payment", k=5, filter={"document_id": "c2"})
+    assert [doc.page_content for doc in results] == ["Late payment fees apply."]
+
+def test_fetch_document_chunks(store):
+    """Test fetching a document's chunks by ID prefix across pages."""
+    chunks = store.get_document_chunks("c1")
+    assert [doc.metadata["chunk_index"] for doc in chunks] == [0, 1, 2]
+
+def test_fetch_keeps_urls_short(server, store):
+    """Test that fetching many long IDs is split into requests with bounded URLs."""
+    ids = [f"contract-{n:04d}-3f6c2a9e-8b1d-4c7e-9a5f-0d2e4b6c8a1f:0" for n in range(250)]
+    store.add_texts(["Renewal is automatic."] * len(ids), [{"document_id": i.split(":")[0]} for i in ids], ids=ids)
+    
+    assert set(store.fetch(ids)) == set(ids)
+    assert len(server.fetch_urls) >= 3
+    assert max(len(url) for url in server.fetch_urls) < 8192
+
+def test_namespaces_are_isolated(server, store):
+    """Test that collections in different namespaces don't see each other."""
+    policies = make_store(server, "policies")
+    assert policies.similarity_search("payment", k=5) == []
+    assert policies.count() == 0
+    assert store.count() == 4
+
+def test_delete_document(store):
+    """Test deleting all chunks of a document."""
+    assert store.delete_document("c1") == 3
+    assert store.count() == 1
+    assert store.get_document_chunks("c1") == []
+
+def test_errors_are_raised(server):
+    """Test that rejected requests raise an error."""
+    client = PineconeRestClient("https://index.test", "wrong-key", transport=httpx.MockTransport(server.handler))
+    with pytest.raises(RemoteVectorStoreError):
+        client.describe_index_stats()
\ No newline at end of file
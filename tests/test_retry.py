@@ -0,0 +1,50 @@
+import time
+
+from app.core.retry import call_with_retries, classify_error, hedged
+
+class StatusError(Exception):
+    """API error with an HTTP status."""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+def test_retries_only_retryable_errors():
+    """Test that 5xx, 429 and timeouts are retried and other errors raised at once."""
+    assert classify_error(StatusError(503)) == "server"
+    assert classify_error(StatusError(429)) == "rate_limit"
+    assert classify_error(TimeoutError()) == "timeout"
+    assert classify_error(StatusError(400)) is None
+    
+    outcomes = [StatusError(502), TimeoutError(), "ok"]
+    errors = []
+    
+    def call(remaining):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    
+    result, retries = call_with_retries(call, 10.0, max_retries=3, base_delay=0.01, max_delay=0.01, on_error=errors.append)
+    assert (result, retries) == ("ok", 2)
+    assert errors == ["server", "timeout"]
+    
+    calls = []
+    try:
+        call_with_retries(lambda remaining: calls.append(1) or int("x"), 10.0, max_retries=3, base_delay=0.01, max_delay=0.01)
+    except ValueError:
+        pass
+    assert len(calls) == 1
+
+def test_hedged_call_returns_first_response():
+    """Test that a slow call is hedged and the faster duplicate wins."""
+    delays = [0.5, 0.01]
+    
+    def call():
+        time.sleep(delays.pop(0))
+        return "done"
+    
+    started = time.monotonic()
+    assert hedged(call, hedge_after=0.05) == ("done", True, True)
+    assert time.monotonic() - started < 0.3
+    assert hedged(lambda: "fast", hedge_after=0.05) == ("fast", False, False)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from app.core.config import settings
+from app.core.routing import escalation_model, refinement_needs_escalation, task_model
+
+def test_small_model_refinements_escalate_when_doubtful():
+    """Test task routing and the escalation rules for clause refinement."""
+    assert task_model("clause_refinement") == settings.LLM_TASK_MODELS["clause_refinement"]
+    assert task_model("unknown_task") == settings.LLM_MODEL
+    assert escalation_model("risk_assessment") is None
+    
+    source = "12. Termination. Either party may terminate this Agreement on thirty days written notice."
+    assert not refinement_needs_escalation(source, "Either party may terminate this Agreement on thirty days written notice.")
+    assert refinement_needs_escalation(source, None)
+    assert refinement_needs_escalation(source, "This clause lets both sides exit the contract after a month's warning.")
\ No newline at end of file
@@ -0,0 +1,56 @@
+import pytest
+from langchain_core.documents import Document
+
+sharding = pytest.importorskip("app.database.sharding")
+
+def chunk(document_id, document_type, text):
+    """A contract chunk of one document type."""
+    return Document(page_content=text, metadata={"document_id": document_id, "document_type": document_type})
+
+def test_pinned_filter_searches_only_its_shard(isolated_settings, monkeypatch):
+    """Test that a document type filter searches that type's shard and the legacy collection only."""
+    from app.database.vector_store import VectorStore
+    VectorStore("contracts").add_documents([chunk("legacy", "nda", "Confidential information is not disclosed.")])
+    
+    store = sharding.ShardedVectorStore("contracts", "document_type")
+    store.add_documents([
+        chunk("nda-1", "nda", "Confidential information is kept for five years."),
+        chunk("msa-1", "Master Services", "Liability is uncapped for data breaches.")
+    ])
+    assert set(store.shards) == {"contracts", "contracts__nda", "contracts__master-services"}
+    
+    searched = []
+    for name, shard in store.shards.items():
+        search = shard.similarity_search_with_score
+        monkeypatch.setattr(shard, "similarity_search_with_score", lambda *args, _name=name, _search=search, **kwargs: searched.append(_name) or _search(*args, **kwargs))
+    
+    results = store.similarity_search_with_score("confidential information", k=5, filter={"document_type": "nda"})
+    assert sorted(searched) == ["contracts", "contracts__nda"]
+    assert {doc.metadata["document_id"] for doc, _ in results} == {"legacy", "nda-1"}
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+    
+    searched.clear()
+    assert len(store.similarity_search_with_score("confidential information", k=5)) == 3
+    assert sorted(searched) == ["contracts", "contracts__master-services", "contracts__nda"]
+
+def test_pinned_keys_slug_and_merge(isolated_settings):
+    """Test shard key extraction from filters, shard name slugs and the top-k merge."""
+    store = sharding.ShardedVectorStore("contracts", "document_type")
+    assert store._pinned_keys({"document_type": "nda"}) == {"nda"}
+    assert store._pinned_keys({"document_type": {"$eq": "nda"}}) == {"nda"}
+    assert store._pinned_keys({"document_type": {"$in": ["nda", "msa"]}}) == {"nda", "msa"}
+    assert store._pinned_keys({"$and": [{"document_id": "nda-1"}, {"document_type": "nda"}]}) == {"nda"}
+    assert store._pinned_keys({"$or": [{"document_type": "nda"}, {"document_type": "msa"}]}) is None
+    assert store._pinned_keys({"document_type": {"$ne": "nda"}}) is None
+    assert store._pinned_keys({"document_id": "nda-1"}) is None
+    assert store._pinned_keys(None) is None
+    
+    assert store._shard_name("Master Services/EU") == "contracts__master-services-eu"
+    assert store._shard_name("../..") == "contracts__default"
+    assert sharding.ShardedVectorStore("contracts", "month").shard_key({"ingested_at": 0}) == "1970-01"
+    with pytest.raises(ValueError):
+        sharding.ShardedVectorStore("contracts", "tenant")
+    
+    docs = [Document(page_content=str(n)) for n in range(3)]
+    merged = store._merge([[(docs[0], 0.2), (docs[1], 0.9)], [(docs[2], 0.5)]], k=2)
+    assert [(doc.page_content, score) for doc, score in merged] == [("1", 0.9), ("2", 0.5)]
\ No newline at end of file
@@ -0,0 +1,31 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.single_flight import SingleFlight, request_key
+
+def test_concurrent_identical_calls_share_one():
+    """Test that identical in-flight calls run once and later calls run again."""
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+    
+    def call():
+        calls.append(1)
+        release.wait(1)
+        return "result"
+    
+    key = request_key({"model": "m", "messages": [{"role": "user", "content": "hi"}]})
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, key, call) for _ in range(4)]
+        while flight.in_flight == 0:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+    
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(result == "result" for result, _ in results)
+    assert flight.do(key, call) == ("result", False)
+    assert key != request_key({"model": "m", "messages": [{"role": "user", "content": "bye"}]})
\ No newline at end of file
@@ -0,0 +1,67 @@
+import io
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.core.storage import UploadTooLargeError, save_upload
+
+class FailingFile(io.BytesIO):
+    """A client stream that breaks after its first chunk."""
+    
+    def read(self, size=-1):
+        if self.tell():
+            raise ConnectionError("client disconnected")
+        return super().read(size)
+
+@pytest.fixture
+def upload_settings(tmp_path, monkeypatch):
+    """Small chunks and a private temp directory."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "TEMP_DIR", tmp_path / "tmp")
+    monkeypatch.setattr(settings, "CONTRACTS_DIR", tmp_path / "contracts")
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 4)
+    return settings
+
+def upload(data, filename="Contract.PDF", size=None, file=None):
+    """An UploadFile as FastAPI builds it from a multipart request."""
+    return UploadFile(file=file or io.BytesIO(data), filename=filename, size=size)
+
+def test_upload_is_content_addressed(upload_settings, tmp_path):
+    """Test that uploads are named by their SHA-256 and identical content shares one file."""
+    data = b"Master services agreement"
+    path, size, content_hash = asyncio.run(save_upload(upload(data), tmp_path / "store"))
+    assert content_hash == hashlib.sha256(data).hexdigest()
+    assert path == tmp_path / "store" / f"{content_hash}.pdf"
+    assert (path.read_bytes(), size) == (data, len(data))
+    
+    again, _, _ = asyncio.run(save_upload(upload(data, filename="copy.pdf"), tmp_path / "store"))
+    assert again == path
+    assert list((tmp_path / "store").iterdir()) == [path]
+    assert list(upload_settings.TEMP_DIR.iterdir()) == []
+
+def test_oversized_upload_is_rejected(upload_settings, tmp_path):
+    """Test that uploads over the limit fail whether or not the size was declared, leaving no files."""
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(save_upload(upload(b"x" * 20, size=20), tmp_path / "store", max_bytes=10))
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(save_upload(upload(b"x" * 20), tmp_path / "store", max_bytes=10))
+    assert list((tmp_path / "store").iterdir()) == []
+    assert list(upload_settings.TEMP_DIR.iterdir()) == []
+
+def test_part_file_removed_on_failure(upload_settings, tmp_path):
+    """Test that a broken upload leaves neither a .part file nor a stored file."""
+    with pytest.raises(ConnectionError):
+        asyncio.run(save_upload(upload(b"", file=FailingFile(b"partial upload")), tmp_path / "store"))
+    assert list(upload_settings.TEMP_DIR.iterdir()) == []
+    assert list((tmp_path / "store").iterdir()) == []
+
+def test_contract_upload_over_limit_is_413(upload_settings, monkeypatch):
+    """Test that the contract upload helper maps an oversized file to HTTP 413."""
+    contracts = pytest.importorskip("app.api.contracts")
+    monkeypatch.setattr(upload_settings, "MAX_UPLOAD_SIZE_MB", 0)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(contracts._save_contract_upload(upload(b"x" * 20)))
+    assert error.value.status_code == 413
+    assert not any(upload_settings.CONTRACTS_DIR.glob("*"))
\ No newline at end of file
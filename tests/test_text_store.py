@@ -0,0 +1,37 @@
+import pytest
+from langchain_core.documents import Document
+
+from app.database.chunking import SectionChunker, reassemble_chunks
+from app.database.text_store import DocumentTextStore
+
+def test_text_round_trip(tmp_path):
+    """Test storing, reading and deleting a document's text and chunk spans."""
+    store = DocumentTextStore(tmp_path)
+    text = "1. TERM\nThe term is one year.\n\n2. PAYMENT\nNet 30 days.\n"
+    chunks = SectionChunker(chunk_size=40, chunk_overlap=5).split(text)
+    for index, chunk in enumerate(chunks):
+        chunk.metadata["chunk_index"] = index
+    store.put("doc-1", text, chunks)
+    
+    assert store.get("doc-1") == text
+    spans = store.get_chunks("doc-1")
+    assert [span["section"] for span in spans] == ["1", "2"]
+    assert text[spans[1]["start_offset"]:spans[1]["end_offset"]].startswith("2. PAYMENT")
+    assert store.list_document_ids() == ["doc-1"]
+    
+    assert store.delete("doc-1")
+    assert store.get("doc-1") is None
+    assert not store.delete("doc-1")
+
+def test_rejects_path_like_ids(tmp_path):
+    """Test that document IDs cannot escape the store directory."""
+    with pytest.raises(ValueError):
+        DocumentTextStore(tmp_path).put("../evil", "text")
+
+def test_reassemble_orders_chunks_and_drops_overlap():
+    """Test rebuilding text from unordered, overlapping legacy chunks."""
+    chunks = [
+        Document(page_content="gamma delta epsilon", metadata={"chunk_index": 1}),
+        Document(page_content="alpha beta gamma", metadata={"chunk_index": 0}),
+    ]
+    assert reassemble_chunks(chunks, max_overlap=10) == "alpha beta gamma\n\ndelta epsilon"
\ No newline at end of file
@@ -0,0 +1,78 @@
+from app.database.analysis_cache import AnalysisCache
+from app.database.catalog import DocumentCatalog
+from app.database.chunking import SectionChunker, diff_chunks
+
+def register(catalog, document_id, content_hash, previous_version_id=None, version=1):
+    """Register a contract version with placeholder fields."""
+    catalog.register(
+        document_id=document_id,
+        content_hash=content_hash,
+        collection="contracts",
+        document_type="contract",
+        filename=f"{document_id}.pdf",
+        title="MSA",
+        file_path="",
+        chunk_count=1,
+        previous_version_id=previous_version_id,
+        version=version
+    )
+
+def test_catalog_links_versions(tmp_path):
+    """Test that every version resolves to the whole lineage in order."""
+    catalog = DocumentCatalog(tmp_path / "catalog.sqlite3")
+    register(catalog, "v1", "hash-1")
+    register(catalog, "v2", "hash-2", previous_version_id="v1", version=2)
+    register(catalog, "v3", "hash-3", previous_version_id="v2", version=3)
+    register(catalog, "other", "hash-4")
+    
+    for document_id in ("v1", "v2", "v3"):
+        versions = catalog.get_versions(document_id)
+        assert [record["document_id"] for record in versions] == ["v1", "v2", "v3"]
+        assert [record["version"] for record in versions] == [1, 2, 3]
+    assert [record["document_id"] for record in catalog.get_versions("other")] == ["other"]
+    assert catalog.get_versions("missing") == []
+
+def test_redline_only_changes_edited_section():
+    """Test that an edit to one section leaves the other sections' chunks unchanged."""
+    sections = [f"{n}. CLAUSE {n}\n" + f"Clause {n} text. " * 20 for n in range(1, 6)]
+    edited = list(sections)
+    edited[2] = edited[2].replace("Clause 3 text.", "Clause 3 amended text.", 1)
+    
+    chunker = SectionChunker(chunk_size=400, chunk_overlap=50)
+    previous = [chunk.page_content for chunk in chunker.split("\n\n".join(sections))]
+    current = chunker.split("\n\n".join(edited))
+    
+    changed, removed = diff_chunks(previous, [chunk.page_content for chunk in current])
+    assert [current[index].metadata["section"] for index in changed] == ["3"]
+    assert len(removed) == 1
+
+def test_analysis_cache_round_trip(tmp_path):
+    """Test that results are found by their inputs and can be cleared per stage."""
+    cache = AnalysisCache(tmp_path / "analysis.sqlite3")
+    key = cache.make_key("model", 0.0, "liability", "Liability is capped.", "Policy text")
+    assert cache.get("risk", key) is None
+    
+    cache.put("risk", key, {"risk_level": "high", "risk_score": 0.8})
+    assert cache.get("risk", key) == {"risk_level": "high", "risk_score": 0.8}
+    assert cache.get("risk", cache.make_key("model", 0.0, "liability", "Liability is uncapped.", "Policy text")) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    
+    assert cache.clear("risk") == 1
+    assert cache.get("risk", key) is None
+
+def test_analysis_cache_is_bounded(tmp_path):
+    """Test that the oldest results beyond the row cap and expired results are dropped."""
+    cache = AnalysisCache(tmp_path / "capped.sqlite3", max_rows=3, ttl_seconds=0)
+    for n in range(5):
+        cache.put("risk", f"key-{n}", {"n": n})
+    assert cache.prune() == 2
+    assert [cache.get("risk", f"key-{n}") for n in range(5)] == [None, None, {"n": 2}, {"n": 3}, {"n": 4}]
+    
+    cache = AnalysisCache(tmp_path / "expiring.sqlite3", max_rows=0, ttl_seconds=3600)
+    cache.put("risk", "old", {"n": 0})
+    cache.put("risk", "new", {"n": 1})
+    with cache._connect() as conn:
+        conn.execute("UPDATE results SET created_at = created_at - 7200 WHERE key = 'old'")
+    assert cache.get("risk", "old") is None
+    assert cache.prune() == 1
+    assert cache.get("risk", "new") == {"n": 1}
\ No newline at end of file